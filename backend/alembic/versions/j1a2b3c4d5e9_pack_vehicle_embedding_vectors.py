@@ -0,0 +1,87 @@
+"""Store vehicle embeddings and bounding boxes as packed binary
+
+Revision ID: j1a2b3c4d5e9
+Revises: bbf6282d9919
+Create Date: 2026-10-16 12:00:00.000000
+
+Vehicle embeddings were stored as JSON text (~7KB per 512-dim vector) and
+parsed with json.loads on every read. They are now stored as 512
+little-endian float32 values (2048 bytes), and bounding boxes as four
+little-endian int32 values.
+
+Existing rows are re-encoded in place.
+"""
+import json
+import struct
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'j1a2b3c4d5e9'
+down_revision = 'bbf6282d9919'
+branch_labels = None
+depends_on = None
+
+BOUNDING_BOX_FORMAT = "<4i"
+
+
+def _swap_columns(embedding_type, bounding_box_type, convert_row) -> None:
+    """Rewrite embedding/bounding_box into columns of the given types."""
+    with op.batch_alter_table('vehicle_embeddings') as batch_op:
+        batch_op.add_column(sa.Column('embedding_new', embedding_type, nullable=True))
+        batch_op.add_column(sa.Column('bounding_box_new', bounding_box_type, nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, embedding, bounding_box FROM vehicle_embeddings"
+    )).fetchall()
+    for row in rows:
+        embedding, bounding_box = convert_row(row.embedding, row.bounding_box)
+        connection.execute(
+            sa.text(
+                "UPDATE vehicle_embeddings SET embedding_new = :embedding, "
+                "bounding_box_new = :bounding_box WHERE id = :id"
+            ),
+            {"embedding": embedding, "bounding_box": bounding_box, "id": row.id},
+        )
+
+    with op.batch_alter_table('vehicle_embeddings') as batch_op:
+        batch_op.drop_column('embedding')
+        batch_op.drop_column('bounding_box')
+        batch_op.alter_column(
+            'embedding_new', new_column_name='embedding',
+            existing_type=embedding_type, nullable=False,
+        )
+        batch_op.alter_column(
+            'bounding_box_new', new_column_name='bounding_box',
+            existing_type=bounding_box_type, nullable=False,
+        )
+
+
+def _pack_row(embedding, bounding_box):
+    bbox = json.loads(bounding_box)
+    return (
+        np.asarray(json.loads(embedding), dtype="<f4").tobytes(),
+        struct.pack(BOUNDING_BOX_FORMAT, bbox["x"], bbox["y"], bbox["width"], bbox["height"]),
+    )
+
+
+def _unpack_row(embedding, bounding_box):
+    x, y, width, height = struct.unpack(BOUNDING_BOX_FORMAT, bounding_box)
+    return (
+        json.dumps(np.frombuffer(embedding, dtype="<f4").tolist()),
+        json.dumps({"x": x, "y": y, "width": width, "height": height}),
+    )
+
+
+def upgrade() -> None:
+    """Re-encode vehicle embeddings and bounding boxes as packed binary."""
+    _swap_columns(sa.LargeBinary(), sa.LargeBinary(), _pack_row)
+
+
+def downgrade() -> None:
+    """Restore JSON text vehicle embeddings and bounding boxes."""
+    _swap_columns(sa.Text(), sa.Text(), _unpack_row)
@@ -0,0 +1,65 @@
+"""Quantize vehicle embeddings to int8 with a per-row scale
+
+Revision ID: k1a2b3c4d5f0
+Revises: j1a2b3c4d5e9
+Create Date: 2026-10-16 13:00:00.000000
+
+Vehicle embeddings change from 512 float32 values (2048 bytes) to 512
+int8 values (512 bytes). A new embedding_scale column holds each row's
+scale. The float vector is recovered as int8 * embedding_scale.
+
+Existing rows are re-encoded in place.
+"""
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'k1a2b3c4d5f0'
+down_revision = 'j1a2b3c4d5e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add embedding_scale and re-encode embeddings as int8."""
+    with op.batch_alter_table('vehicle_embeddings') as batch_op:
+        batch_op.add_column(sa.Column('embedding_scale', sa.Float(), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, embedding FROM vehicle_embeddings"
+    )).fetchall()
+    for row in rows:
+        values = np.frombuffer(row.embedding, dtype="<f4")
+        max_abs = float(np.max(np.abs(values))) if values.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        quantized = np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+        connection.execute(
+            sa.text(
+                "UPDATE vehicle_embeddings SET embedding = :embedding, "
+                "embedding_scale = :scale WHERE id = :id"
+            ),
+            {"embedding": quantized.tobytes(), "scale": scale, "id": row.id},
+        )
+
+    with op.batch_alter_table('vehicle_embeddings') as batch_op:
+        batch_op.alter_column('embedding_scale', existing_type=sa.Float(), nullable=False)
+
+
+def downgrade() -> None:
+    """Expand embeddings back to float32 and drop embedding_scale."""
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        "SELECT id, embedding, embedding_scale FROM vehicle_embeddings"
+    )).fetchall()
+    for row in rows:
+        values = np.frombuffer(row.embedding, dtype=np.int8).astype("<f4") * row.embedding_scale
+        connection.execute(
+            sa.text("UPDATE vehicle_embeddings SET embedding = :embedding WHERE id = :id"),
+            {"embedding": values.astype("<f4").tobytes(), "id": row.id},
+        )
+
+    with op.batch_alter_table('vehicle_embeddings') as batch_op:
+        batch_op.drop_column('embedding_scale')
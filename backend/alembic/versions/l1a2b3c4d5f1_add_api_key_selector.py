@@ -0,0 +1,34 @@
+"""Add selector lookup digest to api_keys
+
+Revision ID: l1a2b3c4d5f1
+Revises: k1a2b3c4d5f0
+Create Date: 2026-10-16 14:00:00.000000
+
+New API keys store a SHA-256 digest of the full key in an indexed
+selector column. verify_key filters on it so only the matching row is
+bcrypt-checked. Existing keys keep a NULL selector and are still matched
+by prefix alone; their plaintext is not stored, so it can't be backfilled.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'l1a2b3c4d5f1'
+down_revision = 'k1a2b3c4d5f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add the selector column and its index."""
+    with op.batch_alter_table('api_keys') as batch_op:
+        batch_op.add_column(sa.Column('selector', sa.String(32), nullable=True))
+        batch_op.create_index('ix_api_keys_selector', ['selector'])
+
+
+def downgrade() -> None:
+    """Drop the selector column and its index."""
+    with op.batch_alter_table('api_keys') as batch_op:
+        batch_op.drop_index('ix_api_keys_selector')
+        batch_op.drop_column('selector')
@@ -0,0 +1,32 @@
+"""Add (is_active, created_at) index to api_keys
+
+Revision ID: m1a2b3c4d5f2
+Revises: l1a2b3c4d5f1
+Create Date: 2026-10-16 15:00:00.000000
+
+list_keys filters on is_active and orders by created_at. The composite
+index lets the default (active-only) listing walk the index in order
+instead of sorting every active row.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'm1a2b3c4d5f2'
+down_revision = 'l1a2b3c4d5f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create the active/created_at index."""
+    op.create_index(
+        'ix_api_keys_active_created',
+        'api_keys',
+        ['is_active', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the active/created_at index."""
+    op.drop_index('ix_api_keys_active_created', table_name='api_keys')
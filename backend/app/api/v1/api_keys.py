@@ -10,8 +10,9 @@ Provides endpoints for:
 - Revoking API keys
 - Getting usage statistics
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from typing import Optional
 import logging
 
 from app.core.database import get_db
@@ -108,12 +109,16 @@ async def create_api_key(
 )
 async def list_api_keys(
     include_revoked: bool = False,
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Maximum keys to return"),
+    offset: int = Query(default=0, ge=0, description="Pagination offset"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """List all API keys (without exposing the key itself)."""
     service = get_api_key_service()
-    keys = service.list_keys(db, include_revoked=include_revoked)
+    keys = service.list_keys(
+        db, include_revoked=include_revoked, limit=limit, offset=offset
+    )
 
     return [
         APIKeyListResponse(
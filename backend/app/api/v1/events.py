@@ -41,6 +41,7 @@ from app.schemas.system import CleanupResponse
 from app.services.cleanup_service import get_cleanup_service
 from app.models.event_feedback import EventFeedback
 from app.schemas.feedback import FeedbackCreate, FeedbackUpdate, FeedbackResponse
+from app.services.mcp_context import get_mcp_context_provider
 
 logger = logging.getLogger(__name__)
 audit_logger = logging.getLogger(f"{__name__}.audit")  # Dedicated audit logger for compliance
@@ -1167,9 +1168,15 @@ async def bulk_delete_events(
             deleted_count += 1
 
         # Delete events from database
+        camera_ids = {e.camera_id for e in events}
         db.query(Event).filter(Event.id.in_([e.id for e in events])).delete(synchronize_session=False)
         db.commit()
 
+        # Feedback for the deleted events went with them (cascade)
+        provider = get_mcp_context_provider()
+        for camera_id in camera_ids:
+            provider.invalidate_feedback_window(camera_id)
+
         space_freed_mb = round(space_freed_bytes / (1024 * 1024), 2)
 
         logger.info(
@@ -1460,9 +1467,13 @@ async def delete_event(
                 logger.warning(f"Failed to delete frames for event {event_id}: {e}")
 
         # Delete event from database
+        camera_id = event.camera_id
         db.delete(event)
         db.commit()
 
+        # The event's feedback went with it (cascade)
+        get_mcp_context_provider().invalidate_feedback_window(camera_id)
+
         logger.info(f"Deleted event {event_id}")
 
         # Return 204 No Content (no response body)
@@ -2464,6 +2475,11 @@ async def create_feedback(
         db.commit()
         db.refresh(feedback)
 
+        # Keep MCP context's per-camera feedback state current
+        get_mcp_context_provider().record_feedback(
+            event.camera_id, feedback.rating, feedback.correction
+        )
+
         logger.info(
             f"Created feedback for event {event_id}: rating={feedback_data.rating}, camera_id={event.camera_id}",
             extra={"event_id": event_id, "camera_id": event.camera_id, "rating": feedback_data.rating}
@@ -2584,6 +2600,9 @@ async def update_feedback(
         db.commit()
         db.refresh(feedback)
 
+        # Edits can't be applied incrementally; rebuild MCP feedback state on next read
+        get_mcp_context_provider().invalidate_feedback_window(feedback.camera_id)
+
         logger.info(
             f"Updated feedback for event {event_id}",
             extra={"event_id": event_id, "rating": feedback.rating}
@@ -2640,9 +2659,13 @@ async def delete_feedback(
                 detail=f"No feedback found for event {event_id}"
             )
 
+        camera_id = feedback.camera_id
         db.delete(feedback)
         db.commit()
 
+        # Rebuild MCP feedback state for this camera on next read
+        get_mcp_context_provider().invalidate_feedback_window(camera_id)
+
         logger.info(f"Deleted feedback for event {event_id}")
 
         return None
@@ -330,6 +330,10 @@ async def update_mqtt_config(
     db.commit()
     db.refresh(config)
 
+    # Discovery caches prefixes and the enabled flag; drop the stale copy
+    from app.services.mqtt_discovery_service import get_discovery_service
+    get_discovery_service().invalidate_config_cache()
+
     logger.info(
         "MQTT configuration updated",
         extra={
@@ -453,7 +457,7 @@ async def publish_discovery(db: Session = Depends(get_db)):
 
     # Publish discovery for all cameras
     discovery_service = get_discovery_service()
-    cameras_published = await discovery_service.publish_all_discovery_configs()
+    cameras_published = await discovery_service.publish_all_discovery_configs(force=True)
 
     logger.info(
         "Manual discovery publish completed",
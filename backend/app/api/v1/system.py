@@ -1887,6 +1887,10 @@ async def delete_all_data(db: Session = Depends(get_db)):
 
         db.commit()
 
+        # Feedback is gone; stop MCP context relying on its stale camera set
+        from app.services.mcp_context import get_mcp_context_provider
+        get_mcp_context_provider().invalidate_feedback_camera_ids()
+
         # Clean up thumbnail and frame files
         import shutil
         thumbnails_dir = Path("data/thumbnails")
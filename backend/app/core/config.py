@@ -53,6 +53,9 @@ class Settings(BaseSettings):
     STREAM_FRAME_BUFFER_SIZE: int = 5  # Frames to buffer for new clients
     STREAM_CONNECTION_TIMEOUT: int = 30  # Seconds before idle stream disconnects
 
+    # Vehicle Recognition
+    VEHICLE_MAX_PER_EVENT: int = 5  # Highest-confidence vehicles embedded per event
+
     # HomeKit Integration (Story P4-6.1, P4-6.2)
     HOMEKIT_ENABLED: bool = False
     HOMEKIT_PORT: int = 51826
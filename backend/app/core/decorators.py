@@ -13,6 +13,10 @@ import threading
 
 T = TypeVar('T')
 
+# Shared by every @singleton class; only held while creating or resetting an
+# instance. Reentrant so a cleanup() may reset another singleton.
+_SINGLETON_LOCK = threading.RLock()
+
 
 def singleton(cls: type[T]) -> type[T]:
     """
@@ -58,9 +62,8 @@ def singleton(cls: type[T]) -> type[T]:
     # Store original __init__
     original_init = cls.__init__
 
-    # Track instance and lock at class level
+    # Track instance at class level
     cls._singleton_instance: Optional[Any] = None
-    cls._singleton_lock = threading.Lock()
     cls._singleton_initialized = False
 
     @wraps(original_init)
@@ -73,20 +76,24 @@ def singleton(cls: type[T]) -> type[T]:
     original_new = cls.__new__ if hasattr(cls, '__new__') else object.__new__
 
     def new_new(klass, *args, **kwargs):
-        if klass._singleton_instance is None:
-            with klass._singleton_lock:
-                if klass._singleton_instance is None:
+        # Fast path reads the instance once and never touches the lock
+        instance = klass._singleton_instance
+        if instance is None:
+            with _SINGLETON_LOCK:
+                instance = klass._singleton_instance
+                if instance is None:
                     # Create instance without passing args to object.__new__
                     if original_new is object.__new__:
-                        klass._singleton_instance = original_new(klass)
+                        instance = original_new(klass)
                     else:
-                        klass._singleton_instance = original_new(klass, *args, **kwargs)
-        return klass._singleton_instance
+                        instance = original_new(klass, *args, **kwargs)
+                    klass._singleton_instance = instance
+        return instance
 
     @classmethod
     def reset_instance(klass) -> None:
         """Reset the singleton instance (for testing)."""
-        with klass._singleton_lock:
+        with _SINGLETON_LOCK:
             if klass._singleton_instance is not None:
                 # Clean up if instance has cleanup method
                 if hasattr(klass._singleton_instance, 'cleanup'):
@@ -133,12 +140,15 @@ class SingletonMeta(type):
     _lock: threading.Lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
+        # Fast path is a single dict lookup without taking the lock
+        instance = cls._instances.get(cls)
+        if instance is None:
             with cls._lock:
-                if cls not in cls._instances:
+                instance = cls._instances.get(cls)
+                if instance is None:
                     instance = super().__call__(*args, **kwargs)
                     cls._instances[cls] = instance
-        return cls._instances[cls]
+        return instance
 
     def _reset_instance(cls) -> None:
         """Reset the singleton instance (for testing)."""
@@ -74,7 +74,7 @@ class APIKeyAuth:
 
         # Verify the key
         service = get_api_key_service()
-        api_key = service.verify_key(db, api_key_header)
+        api_key = await service.averify_key(db, api_key_header)
 
         if not api_key:
             logger.warning(
@@ -246,7 +246,7 @@ async def get_optional_api_key(
         return None
 
     service = get_api_key_service()
-    api_key = service.verify_key(db, api_key_header)
+    api_key = await service.averify_key(db, api_key_header)
 
     if api_key:
         # Store in request state
@@ -244,7 +244,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         with get_db_session() as db:
             service = get_api_key_service()
-            api_key = service.verify_key(db, api_key_header)
+            api_key = await service.averify_key(db, api_key_header)
 
             if api_key:
                 # Store API key in request state for downstream use
@@ -14,7 +14,7 @@ Security:
 - Prefix (first 8 chars) stored separately for identification
 - Key displayed once at creation only
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 import uuid
@@ -33,6 +33,7 @@ class APIKey(Base):
         name: Descriptive name for the key
         prefix: First 8 characters of key (after 'argus_') for identification
         key_hash: bcrypt hash of full key (never store plaintext)
+        selector: SHA-256 lookup digest of full key (NULL for older keys)
         scopes: JSON array of permissions
         is_active: Whether key is currently valid
         expires_at: Optional expiration timestamp
@@ -52,6 +53,8 @@ class APIKey(Base):
     name = Column(String(255), nullable=False)
     prefix = Column(String(8), nullable=False, index=True)
     key_hash = Column(String(255), nullable=False)  # bcrypt hash
+    # SHA-256 lookup digest of the full key; NULL for keys created before it
+    selector = Column(String(32), nullable=True, index=True)
 
     # Scopes: ["read:events", "read:cameras", "write:cameras", "admin"]
     scopes = Column(JSON, nullable=False, default=list)
@@ -74,6 +77,11 @@ class APIKey(Base):
     revoked_at = Column(DateTime(timezone=True), nullable=True)
     revoked_by = Column(String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
 
+    __table_args__ = (
+        # Serves list_keys: active keys, newest first
+        Index('ix_api_keys_active_created', 'is_active', 'created_at'),
+    )
+
     def is_expired(self) -> bool:
         """Check if API key has expired."""
         if not self.expires_at:
@@ -7,8 +7,9 @@ Attributes:
     id: UUID primary key
     event_id: Foreign key to events table (CASCADE delete)
     entity_id: Optional foreign key to recognized_entities (SET NULL on delete)
-    embedding: JSON array of 512 floats (stored as Text for SQLite compatibility)
-    bounding_box: JSON object with x, y, width, height
+    embedding: 512 int8 values (512-byte BLOB), symmetric-quantized
+    embedding_scale: Per-row scale; embedding * scale recovers the float vector
+    bounding_box: x, y, width, height packed as four little-endian int32
     confidence: Detection confidence score (0.0-1.0)
     vehicle_type: Detected vehicle type (car, truck, motorcycle, bus)
     model_version: Version string for the embedding model
@@ -19,15 +20,58 @@ Privacy:
     - Users can delete individual or all vehicle embeddings
     - CASCADE delete ensures cleanup when events are deleted
 """
+import struct
 from datetime import datetime, timezone
 
 import uuid
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String, Text
+import numpy as np
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, LargeBinary, String
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
 
+_BOUNDING_BOX_FORMAT = "<4i"
+
+
+def quantize_embedding(vector) -> tuple[bytes, float]:
+    """
+    Quantize an embedding vector to int8 with a per-vector scale.
+
+    CLIP embeddings have a small dynamic range, so symmetric int8
+    quantization keeps cosine similarity essentially unchanged at a
+    quarter of the float32 size.
+
+    Args:
+        vector: Embedding values
+
+    Returns:
+        Tuple of (int8 bytes for the embedding column, embedding_scale)
+    """
+    values = np.asarray(vector, dtype=np.float32)
+    max_abs = float(np.max(np.abs(values))) if values.size else 0.0
+    scale = max_abs / 127.0 if max_abs > 0 else 1.0
+    quantized = np.clip(np.rint(values / scale), -127, 127).astype(np.int8)
+    return quantized.tobytes(), scale
+
+
+def dequantize_embedding(data: bytes, scale: float) -> list[float]:
+    """Recover an embedding vector from its int8 bytes and scale."""
+    return (np.frombuffer(data, dtype=np.int8).astype(np.float32) * scale).tolist()
+
+
+def pack_bounding_box(bbox: dict) -> bytes:
+    """Pack a {x, y, width, height} dict for the bounding_box column."""
+    return struct.pack(
+        _BOUNDING_BOX_FORMAT, bbox["x"], bbox["y"], bbox["width"], bbox["height"]
+    )
+
+
+def unpack_bounding_box(data: bytes) -> dict:
+    """Unpack a bounding_box column value into a {x, y, width, height} dict."""
+    x, y, width, height = struct.unpack(_BOUNDING_BOX_FORMAT, data)
+    return {"x": x, "y": y, "width": width, "height": height}
+
 
 class VehicleEmbedding(Base):
     """
@@ -65,14 +109,19 @@ class VehicleEmbedding(Base):
         doc="Optional foreign key to recognized_entities for linking to known vehicles"
     )
     embedding = Column(
-        Text,
+        LargeBinary,
+        nullable=False,
+        doc="512 int8 values (see quantize_embedding/dequantize_embedding)"
+    )
+    embedding_scale = Column(
+        Float,
         nullable=False,
-        doc="JSON array of 512 floats representing the vehicle embedding"
+        doc="Scale multiplying the int8 embedding values back to floats"
     )
     bounding_box = Column(
-        Text,
+        LargeBinary,
         nullable=False,
-        doc="JSON object with x, y, width, height coordinates"
+        doc="x, y, width, height as little-endian int32 (see pack_bounding_box)"
     )
     confidence = Column(
         Float,
@@ -10,7 +10,7 @@ from typing import Optional
 
 
 # Valid scopes for API keys
-VALID_SCOPES = {"read:events", "read:cameras", "write:cameras", "admin"}
+VALID_SCOPES = frozenset({"read:events", "read:cameras", "write:cameras", "admin"})
 
 
 class APIKeyCreateRequest(BaseModel):
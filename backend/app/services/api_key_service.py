@@ -9,30 +9,54 @@ This service provides:
 - Key validation and authentication
 - CRUD operations for API keys
 """
+import asyncio
+import hashlib
+import hmac
 import secrets
+import threading
+import time
 import bcrypt
 import logging
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, or_
 
+from app.core.decorators import singleton
 from app.models.api_key import APIKey
 from app.schemas.api_key import VALID_SCOPES
 
 logger = logging.getLogger(__name__)
 
 
+@singleton
 class APIKeyService:
     """
     Service for API key management operations.
 
     Key format: argus_<32-char-random>
     Storage: Only bcrypt hash is stored, never the plaintext key
+
+    Successful verifications are remembered for VERIFY_CACHE_TTL seconds,
+    keyed by a keyed BLAKE2b digest of the plaintext, so repeat requests
+    with the same key skip bcrypt. Hits still reload the key row and
+    re-check is_active/expiry, so revocation takes effect immediately.
     """
 
     KEY_PREFIX = "argus_"
+    _KEY_PREFIX_BYTES = KEY_PREFIX.encode("utf-8")
     KEY_LENGTH = 32  # Characters after prefix
+    BCRYPT_ROUNDS = 12  # Work factor for new key hashes
+    VERIFY_CACHE_SIZE = 4096  # Max remembered successful verifications
+    VERIFY_CACHE_TTL = 60.0  # Seconds a successful verification is reused
+
+    def __init__(self):
+        # digest -> (api_key_id, monotonic expiry)
+        self._verify_cache: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+        self._verify_cache_lock = threading.Lock()
+        # Per-process key, so cached digests are useless outside this process
+        self._verify_cache_key = secrets.token_bytes(32)
 
     def generate_api_key(
         self,
@@ -66,23 +90,25 @@ class APIKeyService:
         if invalid_scopes:
             raise ValueError(f"Invalid scopes: {invalid_scopes}")
 
-        # Generate cryptographically secure random key
-        random_part = secrets.token_urlsafe(self.KEY_LENGTH)[:self.KEY_LENGTH]
+        # Generate cryptographically secure random key; base64 yields
+        # 4 chars per 3 bytes, so this draws exactly KEY_LENGTH chars
+        random_part = secrets.token_urlsafe(self.KEY_LENGTH * 3 // 4)
         plaintext_key = f"{self.KEY_PREFIX}{random_part}"
 
         # Extract prefix for identification (first 8 chars of random part)
         prefix = random_part[:8]
 
-        # Hash the full key with bcrypt (12 rounds)
+        # Hash the full key with bcrypt
         key_hash = bcrypt.hashpw(
             plaintext_key.encode('utf-8'),
-            bcrypt.gensalt(rounds=12)
+            bcrypt.gensalt(rounds=self.BCRYPT_ROUNDS)
         ).decode('utf-8')
 
         api_key = APIKey(
             name=name,
             prefix=prefix,
             key_hash=key_hash,
+            selector=self._selector(plaintext_key),
             scopes=scopes,
             created_by=created_by,
             expires_at=expires_at,
@@ -118,28 +144,103 @@ class APIKeyService:
         Returns:
             APIKey model if valid, None otherwise
         """
-        # Check key format
-        if not plaintext_key.startswith(self.KEY_PREFIX):
-            return None
+        cached_key, digest, candidates = self._find_candidates(db, plaintext_key)
+        if cached_key is not None:
+            return cached_key
 
-        # Extract prefix for lookup
-        random_part = plaintext_key[len(self.KEY_PREFIX):]
-        if len(random_part) < 8:
+        return self._compare_candidates(plaintext_key, digest, candidates)
+
+    async def averify_key(self, db: Session, plaintext_key: str) -> Optional[APIKey]:
+        """
+        Verify an API key without blocking the event loop.
+
+        Same result as verify_key, but the bcrypt comparison runs in a worker
+        thread. The database lookup stays on the calling thread because the
+        session is not thread-safe.
+
+        Args:
+            db: Database session
+            plaintext_key: The full API key to verify
+
+        Returns:
+            APIKey model if valid, None otherwise
+        """
+        cached_key, digest, candidates = self._find_candidates(db, plaintext_key)
+        if cached_key is not None:
+            return cached_key
+        if not candidates:
             return None
 
-        prefix = random_part[:8]
+        return await asyncio.to_thread(
+            self._compare_candidates, plaintext_key, digest, candidates
+        )
 
-        # Find potential matches by prefix (active keys only)
+    def _find_candidates(
+        self,
+        db: Session,
+        plaintext_key: str,
+    ) -> tuple[Optional[APIKey], bytes, list[APIKey]]:
+        """
+        Resolve a key from the verification cache or load rows to check.
+
+        Returns:
+            Tuple of (cached APIKey or None, cache digest, candidate rows).
+            Malformed keys yield no candidates.
+        """
+        # Check key format: length first, then a constant-time prefix compare
+        prefix_length = len(self.KEY_PREFIX)
+        if len(plaintext_key) < prefix_length + 8:
+            return None, b"", []
+        if not hmac.compare_digest(
+            plaintext_key[:prefix_length].encode('utf-8'),
+            self._KEY_PREFIX_BYTES,
+        ):
+            return None, b"", []
+
+        # Extract prefix for lookup
+        prefix = plaintext_key[prefix_length:prefix_length + 8]
+
+        digest = hashlib.blake2b(
+            plaintext_key.encode('utf-8'),
+            key=self._verify_cache_key,
+            digest_size=16,
+        ).digest()
+        cached_id = self._get_cached_verification(digest)
+        if cached_id is not None:
+            api_key = db.get(APIKey, cached_id)
+            if api_key is not None and api_key.is_active and not api_key.is_expired():
+                return api_key, digest, []
+            # Revoked, expired or deleted since it was cached; re-verify in full
+            self._forget_verification(digest)
+
+        # Find potential matches by prefix and selector (active keys only).
+        # Keys created before selectors existed have none and are matched
+        # on prefix alone.
+        selector = self._selector(plaintext_key)
         potential_keys = db.query(APIKey).filter(
             APIKey.prefix == prefix,
+            or_(APIKey.selector == selector, APIKey.selector.is_(None)),
             APIKey.is_active == True,
         ).all()
 
-        # Verify hash against each potential match
-        for api_key in potential_keys:
+        candidates = [
+            api_key for api_key in potential_keys
+            if api_key.selector is None or api_key.selector == selector
+        ]
+        return None, digest, candidates
+
+    def _compare_candidates(
+        self,
+        plaintext_key: str,
+        digest: bytes,
+        candidates: list[APIKey],
+    ) -> Optional[APIKey]:
+        """Bcrypt-check candidate rows and return the matching unexpired key."""
+        plaintext_bytes = plaintext_key.encode('utf-8')
+        for api_key in candidates:
             try:
                 if bcrypt.checkpw(
-                    plaintext_key.encode('utf-8'),
+                    plaintext_bytes,
                     api_key.key_hash.encode('utf-8')
                 ):
                     # Check expiration
@@ -153,6 +254,7 @@ class APIKeyService:
                         )
                         return None
 
+                    self._remember_verification(digest, api_key.id)
                     return api_key
             except Exception as e:
                 logger.error(f"Error verifying API key: {e}")
@@ -160,17 +262,57 @@ class APIKeyService:
 
         return None
 
+    @staticmethod
+    def _selector(plaintext_key: str) -> str:
+        """
+        Lookup digest for a key.
+
+        Keys carry 192 random bits, so an unsalted digest is safe to store
+        and lets verify_key find the one row to bcrypt-check.
+        """
+        return hashlib.sha256(plaintext_key.encode('utf-8')).hexdigest()[:32]
+
+    def _get_cached_verification(self, digest: bytes) -> Optional[str]:
+        """Return the cached API key ID for digest if it hasn't expired."""
+        with self._verify_cache_lock:
+            entry = self._verify_cache.get(digest)
+            if entry is None:
+                return None
+            api_key_id, expires = entry
+            if expires <= time.monotonic():
+                del self._verify_cache[digest]
+                return None
+            self._verify_cache.move_to_end(digest)
+            return api_key_id
+
+    def _remember_verification(self, digest: bytes, api_key_id: str) -> None:
+        """Cache a successful verification, evicting the oldest if full."""
+        with self._verify_cache_lock:
+            self._verify_cache[digest] = (api_key_id, time.monotonic() + self.VERIFY_CACHE_TTL)
+            self._verify_cache.move_to_end(digest)
+            while len(self._verify_cache) > self.VERIFY_CACHE_SIZE:
+                self._verify_cache.popitem(last=False)
+
+    def _forget_verification(self, digest: bytes) -> None:
+        """Drop a cached verification."""
+        with self._verify_cache_lock:
+            self._verify_cache.pop(digest, None)
+
     def list_keys(
         self,
         db: Session,
         include_revoked: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
     ) -> list[APIKey]:
         """
-        List all API keys.
+        List API keys, newest first.
 
         Args:
             db: Database session
             include_revoked: Whether to include revoked keys
+            limit: Maximum keys to return (None for all)
+            offset: Number of keys to skip
 
         Returns:
             List of APIKey models
@@ -180,7 +322,13 @@ class APIKeyService:
         if not include_revoked:
             query = query.filter(APIKey.is_active == True)
 
-        return query.order_by(desc(APIKey.created_at)).all()
+        query = query.order_by(desc(APIKey.created_at))
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+
+        return query.all()
 
     def get_key(self, db: Session, key_id: str) -> Optional[APIKey]:
         """
@@ -250,13 +398,22 @@ class APIKeyService:
         db.commit()
 
 
-# Global singleton instance
-_api_key_service: Optional[APIKeyService] = None
+# Backward compatible getter (delegates to @singleton decorator)
+def get_api_key_service() -> APIKeyService:
+    """
+    Get the global APIKeyService instance.
+
+    Note: This is a backward-compatible wrapper. New code should use
+          APIKeyService() directly, which returns the singleton instance.
+    """
+    return APIKeyService()
+
 
+def reset_api_key_service() -> None:
+    """
+    Reset the global APIKeyService instance (useful for testing).
 
-def get_api_key_service() -> APIKeyService:
-    """Get the global APIKeyService instance."""
-    global _api_key_service
-    if _api_key_service is None:
-        _api_key_service = APIKeyService()
-    return _api_key_service
+    Note: This is a backward-compatible wrapper. New code should use
+          APIKeyService._reset_instance() directly.
+    """
+    APIKeyService._reset_instance()
@@ -618,7 +618,10 @@ class BackupService:
                     db = self.session_factory()
                     try:
                         from app.models.event import Event
+                        from app.services.mcp_context import get_mcp_context_provider
                         events_restored = db.query(Event).count()
+                        # Feedback rows were replaced; refresh MCP's feedback-camera set
+                        get_mcp_context_provider().load_feedback_camera_ids(db)
                     finally:
                         db.close()
 
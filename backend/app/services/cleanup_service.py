@@ -25,6 +25,7 @@ from sqlalchemy import text
 from app.models.event import Event
 from app.core.database import SessionLocal
 from app.services.frame_storage_service import get_frame_storage_service
+from app.services.mcp_context import get_mcp_context_provider
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +113,7 @@ class CleanupService:
             db = self.session_factory()
             try:
                 # Query batch of events to delete (based on event timestamp, not record creation)
-                events_batch = db.query(Event.id, Event.thumbnail_path).filter(
+                events_batch = db.query(Event.id, Event.thumbnail_path, Event.camera_id).filter(
                     Event.timestamp < cutoff_date
                 ).limit(batch_size).all()
 
@@ -152,6 +153,11 @@ class CleanupService:
                 )
                 db.commit()
 
+                # Feedback for these events was cascaded away as well
+                provider = get_mcp_context_provider()
+                for camera_id in {event.camera_id for event in events_batch}:
+                    provider.invalidate_feedback_window(camera_id)
+
                 total_events_deleted += batch_size_actual
                 batches_processed += 1
 
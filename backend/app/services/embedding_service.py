@@ -32,6 +32,7 @@ import logging
 import time
 from typing import Optional
 
+import numpy as np
 from PIL import Image
 from sqlalchemy.orm import Session
 
@@ -49,11 +50,13 @@ class EmbeddingService:
         MODEL_NAME: sentence-transformers model identifier
         MODEL_VERSION: Version string stored in database for compatibility
         EMBEDDING_DIM: Output embedding dimension (512 for CLIP ViT-B/32)
+        BATCH_SIZE: Max images per CLIP forward pass in batched generation
     """
 
     MODEL_NAME = "clip-ViT-B-32"
     MODEL_VERSION = "clip-ViT-B-32-v1"
     EMBEDDING_DIM = 512
+    BATCH_SIZE = 16
 
     def __init__(self):
         """Initialize EmbeddingService with lazy model loading."""
@@ -197,6 +200,117 @@ class EmbeddingService:
             )
             raise
 
+    async def generate_embeddings(self, images: list[bytes]) -> list[list[float]]:
+        """
+        Generate embeddings for several images with batched CLIP inference.
+
+        All images go through the model together (up to BATCH_SIZE per
+        forward pass) instead of one encode call per image.
+
+        Args:
+            images: Raw image bytes (JPEG, PNG, etc.), one entry per image
+
+        Returns:
+            List of 512-float embeddings, in the same order as images
+
+        Raises:
+            ValueError: If any image is empty or invalid
+            Exception: If embedding generation fails
+        """
+        if not images:
+            return []
+        if any(not image_bytes for image_bytes in images):
+            raise ValueError("image_bytes cannot be empty")
+
+        pil_images = []
+        for image_bytes in images:
+            image = Image.open(io.BytesIO(image_bytes))
+            # Convert to RGB if necessary (CLIP expects RGB)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            pil_images.append(image)
+
+        return await self._encode_images(pil_images)
+
+    async def generate_embeddings_from_arrays(self, arrays: list[np.ndarray]) -> list[list[float]]:
+        """
+        Generate embeddings for already decoded images with batched CLIP inference.
+
+        Skips the JPEG encode/decode round-trip for callers that hold pixel
+        data, such as cropped vehicle regions.
+
+        Args:
+            arrays: RGB uint8 arrays of shape (height, width, 3), one per image
+
+        Returns:
+            List of 512-float embeddings, in the same order as arrays
+
+        Raises:
+            ValueError: If any array is empty
+            Exception: If embedding generation fails
+        """
+        if not arrays:
+            return []
+        if any(array.size == 0 for array in arrays):
+            raise ValueError("image array cannot be empty")
+
+        return await self._encode_images([Image.fromarray(array) for array in arrays])
+
+    async def _encode_images(self, pil_images: list[Image.Image]) -> list[list[float]]:
+        """
+        Run batched CLIP inference on RGB PIL images.
+
+        Args:
+            pil_images: RGB images to embed
+
+        Returns:
+            List of 512-float embeddings, in the same order as pil_images
+        """
+        start_time = time.time()
+
+        # Ensure model is loaded
+        await self._ensure_model_loaded()
+
+        try:
+            # Generate embeddings in thread pool (CPU-bound operation)
+            loop = asyncio.get_event_loop()
+            embeddings = await loop.run_in_executor(
+                None,
+                lambda: self._model.encode(
+                    pil_images,
+                    batch_size=self.BATCH_SIZE,
+                    convert_to_numpy=True,
+                )
+            )
+
+            embedding_lists = embeddings.tolist()
+
+            inference_time_ms = (time.time() - start_time) * 1000
+            logger.debug(
+                "Embeddings batch generated",
+                extra={
+                    "event_type": "embeddings_batch_generated",
+                    "inference_time_ms": inference_time_ms,
+                    "image_count": len(pil_images),
+                }
+            )
+
+            return embedding_lists
+
+        except Exception as e:
+            inference_time_ms = (time.time() - start_time) * 1000
+            logger.error(
+                f"Batch embedding generation failed: {e}",
+                exc_info=True,
+                extra={
+                    "event_type": "embedding_generation_error",
+                    "inference_time_ms": inference_time_ms,
+                    "image_count": len(pil_images),
+                    "error": str(e),
+                }
+            )
+            raise
+
     async def generate_embedding_from_base64(self, base64_str: str) -> list[float]:
         """
         Generate embedding from a base64-encoded image string.
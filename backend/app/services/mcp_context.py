@@ -51,12 +51,15 @@ import concurrent.futures
 import logging
 import math
 import re
+import string
+import threading
 import time
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
-from functools import partial
-from typing import Optional, List, Dict, Any, Tuple
+from functools import cached_property, partial
+from itertools import islice
+from typing import Optional, List, Dict, Any, Deque, Iterable, Sequence, Set, Tuple
 
 from prometheus_client import Counter as PromCounter, Histogram, Gauge
 from sqlalchemy import desc, select, func, extract
@@ -64,6 +67,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.metrics import REGISTRY
+from app.models.event_feedback import EventFeedback
 
 logger = logging.getLogger(__name__)
 
@@ -107,13 +111,99 @@ MCP_CACHE_HIT_RATE = Gauge(
 )
 
 
-@dataclass
+# Maps ASCII punctuation and digits to spaces for the fast correction tokenizer
+_PUNCT_TABLE = str.maketrans({c: " " for c in string.punctuation + string.digits})
+# Fallback tokenizer for non-ASCII corrections (full Unicode word boundaries)
+_WORD_RE = re.compile(r"\b[a-z]+\b")
+
+
+def _tokenize_correction(correction: str) -> List[str]:
+    """
+    Lowercase and split a correction into words.
+
+    ASCII text uses str.translate + split, which avoids the regex engine;
+    other text falls back to the word-boundary regex.
+    """
+    lowered = correction.lower()
+    if lowered.isascii():
+        return lowered.translate(_PUNCT_TABLE).split()
+    return _WORD_RE.findall(lowered)
+
+
+def _adjust_counts(counter: Counter, keys: Iterable[str], delta: int) -> None:
+    """Add delta to each key's count, dropping keys that fall to zero."""
+    for key in keys:
+        count = counter[key] + delta
+        if count > 0:
+            counter[key] = count
+        else:
+            counter.pop(key, None)
+
+
+class _FeedbackWindow:
+    """
+    Sliding window over a camera's most recent feedback (oldest first).
+
+    Term, document and bigram counts for the window's corrections are
+    updated as feedback is pushed and the oldest entry evicted, so pattern
+    extraction never re-tokenizes the whole history.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        # (rating, correction, meaningful tokens)
+        self.entries: Deque[Tuple[str, Optional[str], List[str]]] = deque()
+        self.positive_count = 0
+        self.num_docs = 0  # Entries with correction text
+        self.term_freq: Counter = Counter()
+        self.doc_freq: Counter = Counter()
+        self.bigrams: Counter = Counter()
+
+    def push(self, rating: str, correction: Optional[str], tokens: List[str]) -> None:
+        """Append the newest feedback, evicting the oldest beyond the limit."""
+        self.entries.append((rating, correction, tokens))
+        self._apply(rating, correction, tokens, 1)
+        if len(self.entries) > self.limit:
+            self._apply(*self.entries.popleft(), -1)
+
+    def _apply(self, rating: str, correction: Optional[str], tokens: List[str], delta: int) -> None:
+        if rating == 'helpful':
+            self.positive_count += delta
+        if not correction:
+            return
+        self.num_docs += delta
+        _adjust_counts(self.term_freq, tokens, delta)
+        _adjust_counts(self.doc_freq, set(tokens), delta)
+        _adjust_counts(self.bigrams, (f"{a} {b}" for a, b in zip(tokens, tokens[1:])), delta)
+
+
+@dataclass(frozen=True)
 class FeedbackContext:
-    """Context gathered from user feedback history."""
+    """Context gathered from user feedback history (immutable, may be shared)."""
     accuracy_rate: Optional[float]  # 0.0-1.0, None if no feedback
     total_feedback: int
-    common_corrections: List[str]  # Top 3 correction patterns
-    recent_negative_reasons: List[str]  # Last 5 negative feedback reasons
+    common_corrections: Sequence[str]  # Top 3 correction patterns
+    recent_negative_reasons: Sequence[str]  # Last 5 negative feedback reasons
+
+    @cached_property
+    def prompt_lines(self) -> Tuple[str, ...]:
+        """Prompt lines for this feedback, formatted once and memoized with the context."""
+        if self.accuracy_rate is None:
+            return ()
+        lines = [f"Previous accuracy for this camera: {int(self.accuracy_rate * 100)}%"]
+        if self.common_corrections:
+            lines.append(f"Common corrections: {', '.join(self.common_corrections)}")
+        return tuple(lines)
+
+
+# Shared result for cameras with no feedback history (avoids per-event allocation).
+# Tuples keep the shared instance immutable.
+_EMPTY_FEEDBACK_CONTEXT = FeedbackContext(
+    accuracy_rate=None,
+    total_feedback=0,
+    common_corrections=(),
+    recent_negative_reasons=(),
+)
 
 
 @dataclass
@@ -246,6 +336,11 @@ class MCPContextProvider:
         """
         self._db = db
         self._cache: Dict[str, CachedContext] = {}
+        # Camera IDs with at least one feedback row; None until loaded at startup
+        self._feedback_camera_ids: Optional[Set[str]] = None
+        # Per-camera feedback windows, built from the DB on first use and
+        # then maintained incrementally from feedback writes
+        self._feedback_windows: Dict[str, _FeedbackWindow] = {}
         # P14-6.3: Thread pool executor for running sync DB queries
         self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="mcp_ctx")
         # P14-6.8: Metrics tracking for dashboard
@@ -288,6 +383,97 @@ class MCPContextProvider:
             extra={"event_type": "mcp.cache_cleared"}
         )
 
+    def load_feedback_camera_ids(self, db: Session) -> None:
+        """
+        Load the set of cameras that have any feedback history.
+
+        Once loaded, _get_feedback_context skips the feedback query entirely
+        for cameras outside this set. Kept current via mark_camera_has_feedback(),
+        and must be reloaded whenever feedback rows are replaced wholesale
+        (e.g. database restore). Fail-open: on error the set is invalidated so
+        every camera falls back to querying.
+
+        Args:
+            db: SQLAlchemy session
+        """
+        try:
+            rows = db.query(EventFeedback.camera_id).distinct().all()
+        except Exception as e:
+            self._feedback_camera_ids = None
+            self._feedback_windows.clear()
+            logger.warning(
+                f"Failed to load cameras with feedback history: {e}",
+                extra={"event_type": "mcp.feedback_cameras_load_failed", "error": str(e)}
+            )
+            return
+
+        self._feedback_camera_ids = {camera_id for (camera_id,) in rows if camera_id}
+        self._feedback_windows.clear()
+        logger.debug(
+            f"Loaded {len(self._feedback_camera_ids)} cameras with feedback history",
+            extra={
+                "event_type": "mcp.feedback_cameras_loaded",
+                "camera_count": len(self._feedback_camera_ids),
+            }
+        )
+
+    def invalidate_feedback_camera_ids(self) -> None:
+        """
+        Forget the set of cameras with feedback history.
+
+        Disables the empty-feedback fast path until load_feedback_camera_ids()
+        is called again, so feedback is always queried in the meantime.
+        Per-camera feedback windows are dropped as well.
+        """
+        self._feedback_camera_ids = None
+        self._feedback_windows.clear()
+
+    def mark_camera_has_feedback(self, camera_id: Optional[str]) -> None:
+        """
+        Record that a camera has received feedback.
+
+        Called after feedback is written so the empty-feedback fast path
+        stops applying to this camera.
+
+        Args:
+            camera_id: UUID of the camera (ignored if None)
+        """
+        if camera_id and self._feedback_camera_ids is not None:
+            self._feedback_camera_ids.add(camera_id)
+
+    def record_feedback(self, camera_id: Optional[str], rating: str, correction: Optional[str]) -> None:
+        """
+        Apply newly created feedback to the camera's in-memory state.
+
+        Updates the feedback-camera set and, if the camera's feedback window
+        is already built, pushes the feedback into it so word counts stay
+        current without re-reading the database.
+
+        Args:
+            camera_id: UUID of the camera (ignored if None)
+            rating: 'helpful' or 'not_helpful'
+            correction: Optional correction text
+        """
+        if not camera_id:
+            return
+        self.mark_camera_has_feedback(camera_id)
+        window = self._feedback_windows.get(camera_id)
+        if window is not None:
+            window.push(rating, correction, self._meaningful_tokens(correction) if correction else [])
+
+    def invalidate_feedback_window(self, camera_id: Optional[str]) -> None:
+        """
+        Drop a camera's feedback window so it is rebuilt from the database.
+
+        Called when existing feedback is edited or deleted, which cannot be
+        applied incrementally.
+
+        Args:
+            camera_id: UUID of the camera (ignored if None)
+        """
+        if camera_id:
+            self._feedback_windows.pop(camera_id, None)
+
     def get_metrics(self) -> Dict[str, Any]:
         """
         Get MCP context metrics for dashboard (P14-6.8).
@@ -340,7 +526,7 @@ class MCPContextProvider:
         Returns:
             AIContext with available context components
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         session = db or self._db
         self._total_requests += 1
 
@@ -358,7 +544,7 @@ class MCPContextProvider:
         if cached and not cached.is_expired(self.CACHE_TTL_SECONDS):
             # Cache hit
             self._cache_hits += 1
-            context_gather_time_ms = (time.time() - start_time) * 1000
+            context_gather_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
             MCP_CACHE_HITS.inc()
             MCP_CONTEXT_LATENCY.labels(cached="true").observe(context_gather_time_ms / 1000)
 
@@ -368,7 +554,7 @@ class MCPContextProvider:
                     "event_type": "mcp.cache_hit",
                     "camera_id": camera_id,
                     "cache_key": cache_key,
-                    "duration_ms": round(context_gather_time_ms, 2),
+                    "duration_ms": context_gather_time_ms,
                 }
             )
 
@@ -419,7 +605,7 @@ class MCPContextProvider:
             # Return empty context on timeout
             return AIContext()
 
-        context_gather_time_ms = (time.time() - start_time) * 1000
+        context_gather_time_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
 
         # Record metrics (Story P11-3.4 AC-3.4.4)
         MCP_CONTEXT_LATENCY.labels(cached="false").observe(context_gather_time_ms / 1000)
@@ -431,7 +617,7 @@ class MCPContextProvider:
                 extra={
                     "event_type": "mcp.slow_query",
                     "camera_id": camera_id,
-                    "duration_ms": round(context_gather_time_ms, 2),
+                    "duration_ms": context_gather_time_ms,
                     "threshold_ms": self.SLOW_QUERY_THRESHOLD_MS,
                 }
             )
@@ -468,7 +654,7 @@ class MCPContextProvider:
             extra={
                 "event_type": "mcp.context_gathered",
                 "camera_id": camera_id,
-                "duration_ms": round(context_gather_time_ms, 2),
+                "duration_ms": context_gather_time_ms,
                 "has_feedback": feedback_ctx is not None,
                 "has_entity": entity_ctx is not None,
                 "has_camera": camera_ctx is not None,
@@ -585,41 +771,48 @@ class MCPContextProvider:
         Returns:
             FeedbackContext with accuracy and correction patterns
         """
-        from app.models.event_feedback import EventFeedback
+        # Fast path: camera has never received feedback, skip the query
+        if self._feedback_camera_ids is not None and camera_id not in self._feedback_camera_ids:
+            return _EMPTY_FEEDBACK_CONTEXT
+
+        window = self._feedback_windows.get(camera_id)
+        if window is None:
+            # Cold start: build the window from recent feedback for this camera
+            query = (
+                db.query(EventFeedback)
+                .filter(EventFeedback.camera_id == camera_id)
+                .order_by(desc(EventFeedback.created_at))
+                .limit(self.FEEDBACK_LIMIT)
+            )
 
-        # Query recent feedback for this camera
-        query = (
-            db.query(EventFeedback)
-            .filter(EventFeedback.camera_id == camera_id)
-            .order_by(desc(EventFeedback.created_at))
-            .limit(self.FEEDBACK_LIMIT)
-        )
+            window = _FeedbackWindow(self.FEEDBACK_LIMIT)
+            # Query is newest first; the window is kept oldest first
+            for f in reversed(query.all()):
+                window.push(
+                    f.rating,
+                    f.correction,
+                    self._meaningful_tokens(f.correction) if f.correction else [],
+                )
+            self._feedback_windows[camera_id] = window
 
-        feedbacks = query.all()
-        total = len(feedbacks)
+        total = len(window.entries)
 
         if total == 0:
-            return FeedbackContext(
-                accuracy_rate=None,
-                total_feedback=0,
-                common_corrections=[],
-                recent_negative_reasons=[],
-            )
+            return _EMPTY_FEEDBACK_CONTEXT
 
         # Calculate accuracy rate
-        positive_count = sum(1 for f in feedbacks if f.rating == 'helpful')
-        accuracy_rate = positive_count / total
+        accuracy_rate = window.positive_count / total
 
-        # Extract correction texts
-        corrections = [f.correction for f in feedbacks if f.correction]
-
-        # Get common correction patterns
-        common_patterns = self._extract_common_patterns(corrections)
+        # Get common correction patterns from the maintained counts
+        common_patterns = self._score_patterns(
+            window.term_freq, window.doc_freq, window.bigrams, window.num_docs
+        )
 
-        # Get recent negative feedback reasons (last 5 with text)
+        # Get recent negative feedback reasons (last 5 with text, newest first)
         recent_negative = [
-            f.correction for f in feedbacks[:5]
-            if f.rating == 'not_helpful' and f.correction
+            correction
+            for rating, correction, _ in islice(reversed(window.entries), 5)
+            if rating == 'not_helpful' and correction
         ]
 
         return FeedbackContext(
@@ -917,7 +1110,6 @@ class MCPContextProvider:
         """
         from app.models.camera import Camera
         from app.models.event import Event
-        from app.models.event_feedback import EventFeedback
 
         # Query camera by ID
         camera = (
@@ -1117,28 +1309,48 @@ class MCPContextProvider:
         if not corrections:
             return []
 
-        # Tokenize all documents
-        doc_tokens: List[List[str]] = []
-        for correction in corrections:
-            # Tokenize: lowercase, extract words
-            words = re.findall(r'\b[a-z]+\b', correction.lower())
-            # Filter stop words and short words
-            meaningful_words = [w for w in words if w not in self.STOP_WORDS and len(w) > 2]
-            doc_tokens.append(meaningful_words)
-
-        if not any(doc_tokens):
-            return []
-
-        # Count term frequencies (TF) and document frequencies (DF)
+        # Count term frequencies (TF), document frequencies (DF) and bigrams
         term_freq: Counter = Counter()  # How many times each word appears total
         doc_freq: Counter = Counter()   # How many documents contain each word
+        bigrams: Counter = Counter()
 
-        for tokens in doc_tokens:
+        for correction in corrections:
+            tokens = self._meaningful_tokens(correction)
             term_freq.update(tokens)
             # Count unique tokens per document for DF
             doc_freq.update(set(tokens))
+            bigrams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+        return self._score_patterns(term_freq, doc_freq, bigrams, len(corrections))
+
+    def _meaningful_tokens(self, correction: str) -> List[str]:
+        """Tokenize a correction, dropping stop words and words of 2 chars or fewer."""
+        return [w for w in _tokenize_correction(correction) if w not in self.STOP_WORDS and len(w) > 2]
+
+    def _score_patterns(
+        self,
+        term_freq: Counter,
+        doc_freq: Counter,
+        bigrams: Counter,
+        num_docs: int,
+    ) -> List[str]:
+        """
+        Rank patterns by TF-IDF from precomputed counts (P14-6.6).
+
+        Ties are broken alphabetically so results do not depend on the order
+        the counts were accumulated in.
+
+        Args:
+            term_freq: Total occurrences of each word
+            doc_freq: Number of corrections containing each word
+            bigrams: Occurrences of each adjacent word pair
+            num_docs: Number of corrections the counts cover
 
-        num_docs = len(corrections)
+        Returns:
+            List of top 3 most meaningful patterns
+        """
+        if not term_freq:
+            return []
 
         # P14-6.6: Calculate TF-IDF scores
         # TF-IDF = TF * log(N / DF) where N is total documents
@@ -1153,18 +1365,12 @@ class MCPContextProvider:
             tfidf_scores[word] = tf * idf
 
         # Sort by TF-IDF score and get top patterns
-        sorted_patterns = sorted(tfidf_scores.items(), key=lambda x: x[1], reverse=True)
+        sorted_patterns = sorted(tfidf_scores.items(), key=lambda x: (-x[1], x[0]))
         top_patterns = [word for word, _ in sorted_patterns[:5]]
 
-        # P14-6.6: Also extract bi-grams for multi-word patterns
-        bigrams: Counter = Counter()
-        for tokens in doc_tokens:
-            for i in range(len(tokens) - 1):
-                bigram = f"{tokens[i]} {tokens[i+1]}"
-                bigrams[bigram] += 1
-
-        # Add top bigram if it's more common than threshold
-        for bigram, count in bigrams.most_common(2):
+        # P14-6.6: Add top bigrams if they're more common than threshold
+        top_bigrams = sorted(bigrams.items(), key=lambda x: (-x[1], x[0]))[:2]
+        for bigram, count in top_bigrams:
             if count >= self.MIN_PATTERN_FREQUENCY and len(top_patterns) < 5:
                 top_patterns.append(bigram)
 
@@ -1185,14 +1391,9 @@ class MCPContextProvider:
         """
         parts = []
 
-        # Feedback context
-        if context.feedback and context.feedback.accuracy_rate is not None:
-            accuracy_pct = int(context.feedback.accuracy_rate * 100)
-            parts.append(f"Previous accuracy for this camera: {accuracy_pct}%")
-
-            if context.feedback.common_corrections:
-                corrections_str = ", ".join(context.feedback.common_corrections)
-                parts.append(f"Common corrections: {corrections_str}")
+        # Feedback context (formatted once per FeedbackContext, reused while cached)
+        if context.feedback:
+            parts.extend(context.feedback.prompt_lines)
 
         # Entity context (Story P11-3.2)
         if context.entity:
@@ -1405,30 +1606,33 @@ class MCPContextProvider:
 
 # Global singleton instance
 _mcp_context_provider: Optional[MCPContextProvider] = None
+_mcp_context_provider_lock = threading.Lock()
 
 
 def get_mcp_context_provider(db: Session = None) -> MCPContextProvider:
     """
     Get the global MCPContextProvider instance.
 
-    Creates the instance on first call (lazy initialization).
+    Creates the instance on first call (lazy initialization). Uses
+    double-checked locking so the common path is a lock-free read while
+    creation stays safe under concurrent worker threads.
 
     Args:
-        db: Optional SQLAlchemy session to use
+        db: Optional SQLAlchemy session to use (only applied on creation)
 
     Returns:
         MCPContextProvider singleton instance
     """
     global _mcp_context_provider
 
-    if _mcp_context_provider is None:
-        _mcp_context_provider = MCPContextProvider(db=db)
-        logger.info(
-            "Global MCPContextProvider instance created",
-            extra={"event_type": "mcp_context_provider_singleton_created"}
-        )
+    provider = _mcp_context_provider
+    if provider is not None:
+        return provider
 
-    return _mcp_context_provider
+    with _mcp_context_provider_lock:
+        if _mcp_context_provider is None:
+            _mcp_context_provider = MCPContextProvider(db=db)
+        return _mcp_context_provider
 
 
 def reset_mcp_context_provider() -> None:
@@ -1438,4 +1642,5 @@ def reset_mcp_context_provider() -> None:
     Useful for testing to ensure a fresh instance.
     """
     global _mcp_context_provider
-    _mcp_context_provider = None
+    with _mcp_context_provider_lock:
+        _mcp_context_provider = None
@@ -11,20 +11,48 @@ Uses Home Assistant MQTT Discovery protocol:
 https://www.home-assistant.io/integrations/mqtt/#mqtt-discovery
 """
 import asyncio
+import hashlib
 import logging
-from typing import Optional, Dict, Any, List
+import time
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 
-from app.services.mqtt_service import MQTTService, get_mqtt_service
-from app.core.database import SessionLocal
-from app.models.mqtt_config import MQTTConfig
-from app.models.camera import Camera
-from app.services.mqtt_status_service import publish_all_camera_statuses
+import orjson
+
+# Database models, SQLAlchemy and the MQTT client are imported where they are
+# used so importing this module (e.g. via the camera API) stays cheap
+if TYPE_CHECKING:
+    from app.models.camera import Camera
+    from app.models.mqtt_config import MQTTConfig
+    from app.services.mqtt_service import MQTTService
 
 logger = logging.getLogger(__name__)
 
 # Application version for device info
 APP_VERSION = "4.0.0"
 
+# How long a loaded MQTTConfig is reused before re-reading the database
+CONFIG_CACHE_TTL_SECONDS = 30.0
+
+# Max cameras whose discovery messages are queued at once during a fan-out,
+# so a reconnect with many cameras doesn't flood paho's outgoing buffer
+DISCOVERY_PUBLISH_CONCURRENCY = 16
+
+# Payload telling Home Assistant to hand a single-component entity over to
+# device-based discovery while keeping its registry settings
+MIGRATE_DISCOVERY_PAYLOAD = b'{"migrate_discovery":true}'
+
+# SystemSetting key recorded once every enabled camera has been migrated off
+# the legacy topics, so later process starts skip the migration entirely
+LEGACY_DISCOVERY_MIGRATED_SETTING = "mqtt_discovery_legacy_migrated"
+
+# Availability options every sensor repeats; device-based discovery sends
+# them once at the payload root instead of inside each component
+SHARED_AVAILABILITY_KEYS = ("availability_topic", "payload_available", "payload_not_available")
+
+# Quiet period before acting on a discovery setting change, so bursts of
+# toggles collapse into a single publish or removal fan-out
+DISCOVERY_SETTING_DEBOUNCE_SECONDS = 0.5
+
 
 class MQTTDiscoveryService:
     """
@@ -39,22 +67,28 @@ class MQTTDiscoveryService:
     - Remove sensors on camera delete/disable
     - Support discovery enable/disable toggle
 
-    Discovery Topic Format:
-        {discovery_prefix}/sensor/liveobject_{camera_id}_event/config
+    Discovery Topic Format (device-based, one retained message per camera):
+        {discovery_prefix}/device/liveobject_{camera_id}/config
+
+    Device Payload Structure:
+        - device: camera device info with identifiers
+        - origin: ArgusAI name and version
+        - components: every camera sensor keyed by unique_id, e.g.
+          "liveobject_{camera_id}_event" with state_topic
+          "{topic_prefix}/camera/{camera_id}/event"
 
-    Sensor Payload Structure:
-        - name: "{camera_name} AI Events"
-        - unique_id: "liveobject_{camera_id}_event"
-        - state_topic: "{topic_prefix}/camera/{camera_id}/event"
-        - availability_topic: "{topic_prefix}/status"
-        - device grouping with identifiers
+    Cameras published by older versions used one single-component topic per
+    sensor ({discovery_prefix}/sensor/liveobject_{camera_id}_event/config,
+    ...). Those are migrated on first publish and cleared on removal; once
+    a fan-out has migrated every enabled camera a SystemSetting marker is
+    stored and the migration is not repeated.
 
     Attributes:
         _mqtt_service: Reference to MQTT service for publishing
         _published_cameras: Set of camera IDs with active discovery
     """
 
-    def __init__(self, mqtt_service: Optional[MQTTService] = None):
+    def __init__(self, mqtt_service: Optional["MQTTService"] = None):
         """
         Initialize discovery service.
 
@@ -64,6 +98,16 @@ class MQTTDiscoveryService:
         self._mqtt_service = mqtt_service
         self._published_cameras: set = set()
         self._main_event_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._config_cache: Optional[Tuple["MQTTConfig", float]] = None
+        # camera_id -> (fingerprint, topic, payload bytes, digest)
+        self._message_cache: Dict[str, Tuple[tuple, str, bytes, bytes]] = {}
+        # camera_id -> digest of the messages last published successfully
+        self._published_digests: Dict[str, bytes] = {}
+        # camera_id -> (discovery prefix, device topic + legacy topics)
+        self._topic_cache: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        # Whether the legacy topic migration has completed (None: not loaded)
+        self._legacy_migrated: Optional[bool] = None
+        self._setting_sync_task: Optional[asyncio.Task] = None
 
     def set_main_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
         """
@@ -81,16 +125,158 @@ class MQTTDiscoveryService:
             extra={"event_type": "mqtt_discovery_loop_set"}
         )
 
+    async def _get_config(self) -> Optional["MQTTConfig"]:
+        """
+        Get the MQTT config, reusing a recent load when possible.
+
+        Only the columns discovery reads are loaded; the cached instance is
+        detached from its session and must not be used for other fields.
+        Database reads run in a worker thread to keep the event loop free.
+
+        Returns:
+            MQTTConfig or None if no config row exists.
+        """
+        config = self._get_cached_config()
+        if config is not None:
+            return config
+
+        config = await asyncio.to_thread(self._load_config)
+        self._store_config(config)
+        return config
+
+    def _get_cached_config(self) -> Optional["MQTTConfig"]:
+        """Return the cached MQTT config if it is still within the TTL."""
+        if self._config_cache is not None:
+            config, loaded_at = self._config_cache
+            if time.monotonic() - loaded_at < CONFIG_CACHE_TTL_SECONDS:
+                return config
+        return None
+
+    def _store_config(self, config: Optional["MQTTConfig"]) -> None:
+        """Cache a freshly loaded MQTT config (missing configs are not cached)."""
+        self._config_cache = (config, time.monotonic()) if config else None
+
+    @classmethod
+    def _load_config(cls) -> Optional["MQTTConfig"]:
+        """Load the discovery-relevant MQTTConfig columns (blocking)."""
+        from app.core.database import SessionLocal
+
+        with SessionLocal() as db:
+            return cls._query_config(db)
+
+    @classmethod
+    def _load_enabled_cameras(cls) -> List[Any]:
+        """Load the columns discovery payloads use for enabled cameras (blocking)."""
+        from app.core.database import SessionLocal
+
+        with SessionLocal() as db:
+            return cls._query_enabled_cameras(db)
+
+    @classmethod
+    def _load_config_and_cameras(cls) -> Tuple[Optional["MQTTConfig"], List[Any]]:
+        """Load config and enabled cameras through one session (blocking)."""
+        from app.core.database import SessionLocal
+
+        with SessionLocal() as db:
+            return cls._query_config(db), cls._query_enabled_cameras(db)
+
+    @staticmethod
+    def _query_config(db: Any) -> Optional["MQTTConfig"]:
+        """Query the discovery-relevant MQTTConfig columns on an open session."""
+        from sqlalchemy.orm import load_only
+        from app.models.mqtt_config import MQTTConfig
+
+        return db.query(MQTTConfig).options(
+            load_only(
+                MQTTConfig.topic_prefix,
+                MQTTConfig.discovery_prefix,
+                MQTTConfig.discovery_enabled,
+            )
+        ).first()
+
+    @staticmethod
+    def _query_enabled_cameras(db: Any) -> List[Any]:
+        """Query projected rows for enabled cameras on an open session."""
+        from sqlalchemy import select
+        from app.models.camera import Camera
+
+        return db.execute(
+            select(
+                Camera.id,
+                Camera.name,
+                Camera.source_type,
+                Camera.type,
+                Camera.is_doorbell,
+            ).where(Camera.is_enabled.is_(True))
+        ).all()
+
+    @staticmethod
+    def _load_legacy_migrated() -> bool:
+        """Read the legacy-migration marker (blocking)."""
+        from app.core.database import SessionLocal
+        from app.models.system_setting import SystemSetting
+
+        with SessionLocal() as db:
+            setting = db.query(SystemSetting).filter(
+                SystemSetting.key == LEGACY_DISCOVERY_MIGRATED_SETTING
+            ).first()
+            return setting is not None and setting.value == "true"
+
+    @staticmethod
+    def _store_legacy_migrated() -> None:
+        """Persist the legacy-migration marker (blocking)."""
+        from app.core.database import SessionLocal
+        from app.models.system_setting import SystemSetting
+
+        with SessionLocal() as db:
+            setting = db.query(SystemSetting).filter(
+                SystemSetting.key == LEGACY_DISCOVERY_MIGRATED_SETTING
+            ).first()
+            if setting:
+                setting.value = "true"
+            else:
+                db.add(SystemSetting(key=LEGACY_DISCOVERY_MIGRATED_SETTING, value="true"))
+            db.commit()
+
+    async def _needs_legacy_migration(self) -> bool:
+        """Whether legacy topics may still exist, loading the marker once."""
+        if self._legacy_migrated is None:
+            try:
+                self._legacy_migrated = await asyncio.to_thread(self._load_legacy_migrated)
+            except Exception as e:
+                # Migrating again is harmless; retry the lookup next time
+                logger.warning(f"Could not read legacy discovery migration marker: {e}")
+                return True
+        return not self._legacy_migrated
+
+    async def _mark_legacy_migrated(self) -> None:
+        """Record that every enabled camera has been migrated."""
+        try:
+            await asyncio.to_thread(self._store_legacy_migrated)
+        except Exception as e:
+            logger.warning(f"Could not store legacy discovery migration marker: {e}")
+            return
+        self._legacy_migrated = True
+        logger.debug(
+            "Legacy discovery topics migrated",
+            extra={"event_type": "mqtt_discovery_legacy_migrated"}
+        )
+
+    def invalidate_config_cache(self) -> None:
+        """Drop the cached MQTT config so the next lookup re-reads the database."""
+        self._config_cache = None
+
     @property
-    def mqtt_service(self) -> MQTTService:
+    def mqtt_service(self) -> "MQTTService":
         """Get MQTT service instance (lazy load singleton if needed)."""
         if self._mqtt_service is None:
+            from app.services.mqtt_service import get_mqtt_service
             self._mqtt_service = get_mqtt_service()
         return self._mqtt_service
 
     def generate_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -165,7 +351,7 @@ class MQTTDiscoveryService:
 
     def generate_status_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -207,7 +393,7 @@ class MQTTDiscoveryService:
 
     def generate_last_event_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -250,7 +436,7 @@ class MQTTDiscoveryService:
 
     def generate_events_today_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -292,7 +478,7 @@ class MQTTDiscoveryService:
 
     def generate_events_week_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -334,7 +520,7 @@ class MQTTDiscoveryService:
 
     def generate_activity_binary_sensor_config(
         self,
-        camera: Camera,
+        camera: "Camera",
         topic_prefix: str = "liveobject"
     ) -> Dict[str, Any]:
         """
@@ -374,6 +560,72 @@ class MQTTDiscoveryService:
             }
         }
 
+    def generate_device_config(
+        self,
+        camera: "Camera",
+        topic_prefix: str = "liveobject"
+    ) -> Dict[str, Any]:
+        """
+        Generate a device-based discovery payload bundling all camera sensors.
+
+        Home Assistant (2024.11+) accepts one retained message describing a
+        device and all of its entities, so a camera needs one discovery
+        message instead of one per sensor. Component payloads are the
+        single-component configs without their per-entity device block;
+        availability options, identical for every sensor, are sent once at
+        the root where Home Assistant shares them with all components.
+
+        Args:
+            camera: Camera model instance
+            topic_prefix: MQTT topic prefix
+
+        Returns:
+            Dictionary ready for JSON serialization to the device discovery topic.
+        """
+        component_generators = [
+            (self.generate_sensor_config, "sensor"),
+            (self.generate_status_sensor_config, "sensor"),
+            (self.generate_last_event_sensor_config, "sensor"),
+            (self.generate_events_today_sensor_config, "sensor"),
+            (self.generate_events_week_sensor_config, "sensor"),
+            (self.generate_activity_binary_sensor_config, "binary_sensor"),
+        ]
+
+        device = None
+        components = {}
+        for generator, platform in component_generators:
+            component = generator(camera, topic_prefix=topic_prefix)
+            component_device = component.pop("device")
+            # The event sensor comes first and carries the camera-type model
+            if device is None:
+                device = component_device
+            for key in SHARED_AVAILABILITY_KEYS:
+                component.pop(key, None)
+            component["platform"] = platform
+            components[component["unique_id"]] = component
+
+        return {
+            "device": device,
+            "origin": {"name": "ArgusAI", "sw_version": APP_VERSION},
+            "availability_topic": f"{topic_prefix}/status",
+            "payload_available": "online",
+            "payload_not_available": "offline",
+            "components": components,
+        }
+
+    def get_device_discovery_topic(
+        self,
+        camera_id: str,
+        discovery_prefix: str = "homeassistant"
+    ) -> str:
+        """
+        Get the device-based discovery topic for a camera.
+
+        Example:
+            homeassistant/device/liveobject_abc123/config
+        """
+        return f"{discovery_prefix}/device/liveobject_{camera_id}/config"
+
     def get_status_discovery_topic(
         self,
         camera_id: str,
@@ -440,10 +692,88 @@ class MQTTDiscoveryService:
         sensor_id = f"liveobject_{camera_id}_event"
         return f"{discovery_prefix}/sensor/{sensor_id}/config"
 
+    def _get_discovery_message(
+        self,
+        camera: "Camera",
+        config: "MQTTConfig"
+    ) -> Tuple[str, bytes, bytes]:
+        """
+        Get the encoded device discovery message for a camera.
+
+        The payload only depends on a handful of camera and config fields, so
+        it is built and JSON-encoded once and reused on every reconnect until
+        one of those fields changes.
+
+        Args:
+            camera: Camera to build the discovery message for
+            config: MQTT configuration supplying topic and discovery prefixes
+
+        Returns:
+            Tuple of (discovery topic, payload bytes, digest of both).
+        """
+        camera_id = str(camera.id)
+        fingerprint = (
+            camera.name,
+            camera.source_type,
+            camera.type,
+            camera.is_doorbell,
+            config.topic_prefix,
+            config.discovery_prefix,
+        )
+
+        cached = self._message_cache.get(camera_id)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1], cached[2], cached[3]
+
+        topic = self._get_discovery_topics(camera_id, config.discovery_prefix)[0]
+        payload = orjson.dumps(self.generate_device_config(camera, topic_prefix=config.topic_prefix))
+        digest = hashlib.blake2b(topic.encode() + payload, digest_size=16).digest()
+
+        self._message_cache[camera_id] = (fingerprint, topic, payload, digest)
+        return topic, payload, digest
+
+    def _build_discovery_topics(self, camera_id: str, discovery_prefix: str) -> Tuple[str, ...]:
+        """Build the device topic followed by the pre-device single-component topics."""
+        topic_generators = [
+            self.get_device_discovery_topic,
+            self.get_discovery_topic,
+            self.get_status_discovery_topic,
+            self.get_last_event_discovery_topic,
+            self.get_events_today_discovery_topic,
+            self.get_events_week_discovery_topic,
+            self.get_activity_discovery_topic,
+        ]
+        return tuple(
+            topic_generator(camera_id, discovery_prefix=discovery_prefix)
+            for topic_generator in topic_generators
+        )
+
+    def _get_discovery_topics(self, camera_id: str, discovery_prefix: str) -> Tuple[str, ...]:
+        """
+        Get every discovery topic a camera may have retained config on.
+
+        Topics are built once per camera and prefix and reused afterwards.
+
+        Returns:
+            Tuple of the device topic followed by the legacy topics.
+        """
+        cached = self._topic_cache.get(camera_id)
+        if cached is not None and cached[0] == discovery_prefix:
+            return cached[1]
+
+        topics = self._build_discovery_topics(camera_id, discovery_prefix)
+        self._topic_cache[camera_id] = (discovery_prefix, topics)
+        return topics
+
+    def _get_legacy_discovery_topics(self, camera_id: str, discovery_prefix: str) -> Tuple[str, ...]:
+        """Get the single-component discovery topics used before device-based discovery."""
+        return self._get_discovery_topics(camera_id, discovery_prefix)[1:]
+
     async def publish_discovery_config(
         self,
-        camera: Camera,
-        config: Optional[MQTTConfig] = None
+        camera: "Camera",
+        config: Optional["MQTTConfig"] = None,
+        force: bool = False
     ) -> bool:
         """
         Publish discovery configuration for a single camera (AC1, AC5, AC7).
@@ -457,16 +787,23 @@ class MQTTDiscoveryService:
         - Activity binary sensor
 
         Args:
-            camera: Camera to publish discovery for
-            config: MQTT configuration (loads from DB if not provided)
+            camera: Camera to publish discovery for. Any object exposing id,
+                name, source_type, type and is_doorbell works, such as the
+                projected rows loaded by publish_all_discovery_configs.
+            config: MQTT configuration. Fan-out callers must pass the config
+                they already hold; when omitted it is fetched through the
+                config cache, which may cost a database round trip.
+            force: Publish even if identical messages were already published.
+                Unchanged cameras are otherwise skipped, since the broker
+                still holds the retained copies.
 
         Returns:
-            True if all published successfully, False otherwise.
+            True if all published successfully (or already up to date),
+            False otherwise.
         """
         # Load config if not provided
         if config is None:
-            with SessionLocal() as db:
-                config = db.query(MQTTConfig).first()
+            config = await self._get_config()
 
         if not config:
             logger.warning("Cannot publish discovery: no MQTT config")
@@ -483,60 +820,79 @@ class MQTTDiscoveryService:
             return False
 
         camera_id = str(camera.id)
-        all_success = True
 
-        # List of (config_generator, topic_generator, sensor_type) tuples
-        sensor_configs = [
-            (self.generate_sensor_config, self.get_discovery_topic, "event"),
-            (self.generate_status_sensor_config, self.get_status_discovery_topic, "status"),
-            (self.generate_last_event_sensor_config, self.get_last_event_discovery_topic, "last_event"),
-            (self.generate_events_today_sensor_config, self.get_events_today_discovery_topic, "events_today"),
-            (self.generate_events_week_sensor_config, self.get_events_week_discovery_topic, "events_week"),
-            (self.generate_activity_binary_sensor_config, self.get_activity_discovery_topic, "activity"),
-        ]
+        try:
+            topic, payload, digest = self._get_discovery_message(camera, config)
+        except Exception as e:
+            logger.error(
+                f"Error building discovery config for camera {camera.name}: {e}",
+                extra={
+                    "event_type": "mqtt_discovery_error",
+                    "camera_id": camera_id,
+                    "error": str(e)
+                }
+            )
+            return False
 
-        for config_generator, topic_generator, sensor_type in sensor_configs:
-            try:
-                # Generate payload
-                payload = config_generator(camera, topic_prefix=config.topic_prefix)
+        if not force and self._published_digests.get(camera_id) == digest:
+            logger.debug(f"Discovery unchanged, skipping camera {camera_id}")
+            return True
 
-                # Get discovery topic
-                topic = topic_generator(camera_id, discovery_prefix=config.discovery_prefix)
+        # First publish for this camera in this process, before the migration
+        # marker is stored: entities may still exist under single-component
+        # topics from an older version. Hand them over before publishing the
+        # device config and clear them after, per HA's migration procedure,
+        # so entity registry settings survive.
+        legacy_topics = []
+        if camera_id not in self._published_digests and await self._needs_legacy_migration():
+            legacy_topics = self._get_legacy_discovery_topics(camera_id, config.discovery_prefix)
 
-                # Publish with QoS 1 and retain=True per HA spec
-                success = await self.mqtt_service.publish(
-                    topic=topic,
-                    payload=payload,
-                    qos=1,
-                    retain=True
+        all_success = True
+        try:
+            if legacy_topics:
+                self.mqtt_service.publish_many(
+                    [(legacy_topic, MIGRATE_DISCOVERY_PAYLOAD, 1, True) for legacy_topic in legacy_topics]
                 )
 
-                if not success:
-                    all_success = False
-                    logger.warning(
-                        f"Failed to publish {sensor_type} discovery for camera {camera.name}",
-                        extra={
-                            "event_type": "mqtt_discovery_failed",
-                            "camera_id": camera_id,
-                            "sensor_type": sensor_type
-                        }
-                    )
-            except Exception as e:
+            # Queue with QoS 1 and retain=True per HA spec; PUBACKs are
+            # handled on paho's network thread rather than awaited here
+            info = self.mqtt_service.publish_nowait(
+                topic=topic,
+                payload=payload,
+                qos=1,
+                retain=True
+            )
+
+            if info is None:
                 all_success = False
-                logger.error(
-                    f"Error publishing {sensor_type} discovery for camera {camera.name}: {e}",
+                logger.warning(
+                    f"Failed to publish discovery for camera {camera.name}",
                     extra={
-                        "event_type": "mqtt_discovery_error",
-                        "camera_id": camera_id,
-                        "sensor_type": sensor_type,
-                        "error": str(e)
+                        "event_type": "mqtt_discovery_failed",
+                        "camera_id": camera_id
                     }
                 )
+            elif legacy_topics:
+                self.mqtt_service.publish_many(
+                    [(legacy_topic, b"", 1, True) for legacy_topic in legacy_topics]
+                )
+        except Exception as e:
+            all_success = False
+            logger.error(
+                f"Error publishing discovery for camera {camera.name}: {e}",
+                extra={
+                    "event_type": "mqtt_discovery_error",
+                    "camera_id": camera_id,
+                    "error": str(e)
+                }
+            )
 
         if all_success:
             self._published_cameras.add(camera_id)
-            logger.info(
-                f"Published all discovery configs for camera {camera.name}",
+            self._published_digests[camera_id] = digest
+            # Per-camera detail only; fan-outs log one aggregate info line
+            logger.debug(
+                f"Published discovery config for camera {camera.name}",
                 extra={
                     "event_type": "mqtt_discovery_published",
                     "camera_id": camera_id,
@@ -547,19 +903,49 @@ class MQTTDiscoveryService:
 
         return all_success
 
-    async def publish_all_discovery_configs(self) -> int:
+    async def _gather_paced(self, coros: List[Any]) -> List[Any]:
+        """
+        Run discovery coroutines concurrently with bounded parallelism.
+
+        At most DISCOVERY_PUBLISH_CONCURRENCY run at once, and each yields to
+        the event loop when done so queued PUBACKs and other tasks get a turn.
+
+        Args:
+            coros: Coroutines to run (one per camera)
+
+        Returns:
+            Results in input order; exceptions are returned, not raised.
+        """
+        semaphore = asyncio.Semaphore(DISCOVERY_PUBLISH_CONCURRENCY)
+
+        async def run(coro):
+            async with semaphore:
+                result = await coro
+                await asyncio.sleep(0)
+                return result
+
+        return await asyncio.gather(*[run(coro) for coro in coros], return_exceptions=True)
+
+    async def publish_all_discovery_configs(self, force: bool = False) -> int:
         """
         Publish discovery configs for all enabled cameras (AC1, AC5).
 
         Called on MQTT connect and reconnect to ensure all sensors
         are registered in Home Assistant.
 
+        Args:
+            force: Republish cameras whose discovery messages are unchanged
+
         Returns:
             Number of cameras successfully published.
         """
-        # Load MQTT config
-        with SessionLocal() as db:
-            config = db.query(MQTTConfig).first()
+        # Reuse the cached config; on a miss, load it alongside the cameras
+        # so the whole fan-out costs one session and one thread hop
+        config = self._get_cached_config()
+        cameras = None
+        if config is None:
+            config, cameras = await asyncio.to_thread(self._load_config_and_cameras)
+            self._store_config(config)
 
         if not config:
             logger.warning("No MQTT config found, skipping discovery")
@@ -570,45 +956,63 @@ class MQTTDiscoveryService:
             logger.info("MQTT discovery disabled, skipping all cameras")
             return 0
 
-        # Get all enabled cameras
-        with SessionLocal() as db:
-            cameras = db.query(Camera).filter(Camera.is_enabled == True).all()
-
-            if not cameras:
-                logger.info("No enabled cameras found for discovery")
-                return 0
-
-            # Publish for each camera
-            published_count = 0
-            for camera in cameras:
-                try:
-                    if await self.publish_discovery_config(camera, config):
-                        published_count += 1
-                except Exception as e:
-                    logger.error(
-                        f"Error publishing discovery for camera {camera.id}: {e}",
-                        extra={
-                            "event_type": "mqtt_discovery_error",
-                            "camera_id": str(camera.id),
-                            "error": str(e)
-                        }
-                    )
+        # Get all enabled cameras, loading only the columns payloads use
+        if cameras is None:
+            cameras = await asyncio.to_thread(self._load_enabled_cameras)
 
+        # Cameras published earlier but no longer enabled (e.g. disabled while
+        # MQTT was down) are removed; unchanged ones are skipped by digest
+        stale_cameras = self._published_cameras - {str(camera.id) for camera in cameras}
+        if stale_cameras:
+            removed_count = self._remove_cameras(list(stale_cameras), config)
             logger.info(
-                f"Published discovery for {published_count}/{len(cameras)} cameras",
+                f"Removed discovery for {removed_count} cameras no longer enabled",
                 extra={
-                    "event_type": "mqtt_discovery_all_complete",
-                    "published_count": published_count,
-                    "total_cameras": len(cameras)
+                    "event_type": "mqtt_discovery_stale_removed",
+                    "removed_count": removed_count
                 }
             )
 
-            return published_count
+        if not cameras:
+            logger.info("No enabled cameras found for discovery")
+            return 0
+
+        # Publish for all cameras concurrently so PUBACK round trips overlap
+        results = await self._gather_paced(
+            [self.publish_discovery_config(camera, config, force=force) for camera in cameras]
+        )
+
+        published_count = sum(1 for result in results if result is True)
+        # Every enabled camera has now been through the migrate-then-clear
+        # sequence, so later process starts can skip it
+        if published_count == len(cameras) and await self._needs_legacy_migration():
+            await self._mark_legacy_migrated()
+        for camera, result in zip(cameras, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Error publishing discovery for camera {camera.id}: {result}",
+                    extra={
+                        "event_type": "mqtt_discovery_error",
+                        "camera_id": str(camera.id),
+                        "error": str(result)
+                    }
+                )
+
+        logger.info(
+            f"Published discovery for {published_count}/{len(cameras)} cameras",
+            extra={
+                "event_type": "mqtt_discovery_all_complete",
+                "published_count": published_count,
+                "total_cameras": len(cameras)
+            }
+        )
+
+        return published_count
 
     async def remove_discovery_config(
         self,
         camera_id: str,
-        config: Optional[MQTTConfig] = None
+        config: Optional["MQTTConfig"] = None
     ) -> bool:
         """
         Remove all discovery configs for a camera (AC4).
@@ -625,8 +1029,13 @@ class MQTTDiscoveryService:
         """
         # Load config if not provided
         if config is None:
-            with SessionLocal() as db:
-                config = db.query(MQTTConfig).first()
+            config = await self._get_config()
+
+        # Camera is going away or being disabled; drop its encoded payloads
+        # and forget what was published so a re-enable publishes again
+        self._message_cache.pop(camera_id, None)
+        self._published_digests.pop(camera_id, None)
+        self._topic_cache.pop(camera_id, None)
 
         if not config:
             logger.warning("Cannot remove discovery: no MQTT config")
@@ -639,24 +1048,13 @@ class MQTTDiscoveryService:
             self._published_cameras.discard(camera_id)
             return False
 
-        # List of topic generators for all sensor types
-        topic_generators = [
-            self.get_discovery_topic,
-            self.get_status_discovery_topic,
-            self.get_last_event_discovery_topic,
-            self.get_events_today_discovery_topic,
-            self.get_events_week_discovery_topic,
-            self.get_activity_discovery_topic,
-        ]
-
         all_success = True
 
         # Publish empty payload to remove sensors (HA Discovery spec)
         # Note: Empty string payload with retain=True removes the retained message
         try:
             if self.mqtt_service._client:
-                for topic_generator in topic_generators:
-                    topic = topic_generator(camera_id, discovery_prefix=config.discovery_prefix)
+                for topic in self._build_discovery_topics(camera_id, config.discovery_prefix):
                     result = self.mqtt_service._client.publish(
                         topic,
                         payload="",
@@ -668,7 +1066,7 @@ class MQTTDiscoveryService:
 
                 if all_success:
                     self._published_cameras.discard(camera_id)
-                    logger.info(
+                    logger.debug(
                         f"Removed all discovery configs for camera {camera_id}",
                         extra={
                             "event_type": "mqtt_discovery_removed",
@@ -690,6 +1088,61 @@ class MQTTDiscoveryService:
 
         return False
 
+    def _remove_cameras(self, cameras_to_remove: List[str], config: "MQTTConfig") -> int:
+        """
+        Clear retained discovery configs for several cameras in one batch.
+
+        Args:
+            cameras_to_remove: Camera UUIDs whose discovery should be removed
+            config: MQTT configuration supplying the discovery prefix
+
+        Returns:
+            Number of cameras whose removals were all queued.
+        """
+        for camera_id in cameras_to_remove:
+            self._message_cache.pop(camera_id, None)
+            self._published_digests.pop(camera_id, None)
+            self._topic_cache.pop(camera_id, None)
+
+        if not self.mqtt_service.is_connected:
+            logger.debug("MQTT not connected, cannot remove discovery")
+            # Still clear tracking, matching remove_discovery_config
+            self._published_cameras.difference_update(cameras_to_remove)
+            return 0
+
+        # Queue every empty retained payload in one pass instead of one
+        # coroutine per camera (HA Discovery removal spec)
+        topics_by_camera = [
+            (camera_id, self._build_discovery_topics(camera_id, config.discovery_prefix))
+            for camera_id in cameras_to_remove
+        ]
+        items = [
+            (topic, b"", 1, True)
+            for _, topics in topics_by_camera
+            for topic in topics
+        ]
+
+        try:
+            infos = self.mqtt_service.publish_many(items)
+        except Exception as e:
+            logger.error(
+                f"Error removing discovery configs: {e}",
+                extra={"event_type": "mqtt_discovery_remove_error", "error": str(e)}
+            )
+            return 0
+
+        removed_count = 0
+        offset = 0
+        for camera_id, topics in topics_by_camera:
+            camera_infos = infos[offset:offset + len(topics)]
+            offset += len(topics)
+            # Cameras with a failed removal stay tracked so a later call retries
+            if len(camera_infos) == len(topics) and all(info.rc == 0 for info in camera_infos):
+                self._published_cameras.discard(camera_id)
+                removed_count += 1
+
+        return removed_count
+
     async def remove_all_discovery_configs(self) -> int:
         """
         Remove all discovery configs (AC6: when discovery disabled).
@@ -698,19 +1151,12 @@ class MQTTDiscoveryService:
             Number of cameras removed.
         """
         # Load config for prefix
-        with SessionLocal() as db:
-            config = db.query(MQTTConfig).first()
+        config = await self._get_config()
 
         if not config:
             return 0
 
-        # Get list of published cameras
-        cameras_to_remove = list(self._published_cameras)
-
-        removed_count = 0
-        for camera_id in cameras_to_remove:
-            if await self.remove_discovery_config(camera_id, config):
-                removed_count += 1
+        removed_count = self._remove_cameras(list(self._published_cameras), config)
 
         logger.info(
             f"Removed discovery for {removed_count} cameras",
@@ -722,6 +1168,42 @@ class MQTTDiscoveryService:
 
         return removed_count
 
+    def schedule_setting_sync(self, enabled: bool) -> asyncio.Task:
+        """
+        Publish or remove all discovery configs after a short quiet period.
+
+        A call made while an earlier one is still waiting replaces it, so
+        only the latest discovery_enabled value is acted on.
+
+        Args:
+            enabled: Latest discovery_enabled value
+
+        Returns:
+            The scheduled task (mainly useful for tests).
+        """
+        if self._setting_sync_task is not None and not self._setting_sync_task.done():
+            self._setting_sync_task.cancel()
+
+        self._setting_sync_task = asyncio.create_task(self._debounced_setting_sync(enabled))
+        return self._setting_sync_task
+
+    async def _debounced_setting_sync(self, enabled: bool) -> None:
+        """Wait out the debounce window, then apply the discovery setting."""
+        await asyncio.sleep(DISCOVERY_SETTING_DEBOUNCE_SECONDS)
+
+        try:
+            if enabled:
+                # Re-publish all discovery configs
+                await self.publish_all_discovery_configs()
+            else:
+                # Remove all discovery configs
+                await self.remove_all_discovery_configs()
+        except Exception as e:
+            logger.error(
+                f"Error applying discovery setting change: {e}",
+                extra={"event_type": "mqtt_discovery_setting_error", "enabled": enabled, "error": str(e)}
+            )
+
     def on_mqtt_connect(self) -> None:
         """
         Callback for MQTT connection (AC5: discovery on reconnect).
@@ -730,8 +1212,9 @@ class MQTTDiscoveryService:
         Triggers discovery publishing for all cameras.
 
         Note: This callback runs in paho-mqtt's network thread, not the main
-        asyncio event loop. We use run_coroutine_threadsafe() to schedule
-        async work on the main loop safely.
+        asyncio event loop. Work is handed to the main loop captured at
+        initialization with run_coroutine_threadsafe(), so the network thread
+        returns immediately and keeps processing PUBACKs.
 
         Fixed in P14-1.1: Replaced asyncio.run() with run_coroutine_threadsafe()
         to avoid RuntimeError when called from a thread with an existing event loop.
@@ -741,37 +1224,27 @@ class MQTTDiscoveryService:
             extra={"event_type": "mqtt_discovery_connect_trigger"}
         )
 
-        # Schedule async publish - handle different execution contexts
-        if self._main_event_loop is not None and self._main_event_loop.is_running():
-            # Preferred path: Schedule on main event loop from MQTT callback thread
-            # This is thread-safe and won't conflict with the main event loop
-            future = asyncio.run_coroutine_threadsafe(
-                self._publish_discovery_on_connect(),
-                self._main_event_loop
+        if self._main_event_loop is None or not self._main_event_loop.is_running():
+            # Without the app's loop there is nowhere to run discovery; blocking
+            # paho's thread on a temporary loop would stall the connection.
+            # Discovery is published on the next connect once the loop is set.
+            logger.warning(
+                "No running main event loop, skipping discovery publish on connect",
+                extra={"event_type": "mqtt_discovery_no_loop"}
             )
-            # Log any errors from the future (non-blocking)
-            future.add_done_callback(self._handle_publish_future)
-            logger.debug(
-                "Scheduled discovery publish on main event loop",
-                extra={"event_type": "mqtt_discovery_scheduled_threadsafe"}
-            )
-        else:
-            # Fallback: No main loop available (rare case - sync context or test)
-            # Create a temporary event loop in this thread
-            logger.debug(
-                "No main event loop available, creating temporary loop",
-                extra={"event_type": "mqtt_discovery_temp_loop"}
-            )
-            loop = asyncio.new_event_loop()
-            try:
-                loop.run_until_complete(self._publish_discovery_on_connect())
-            except Exception as e:
-                logger.error(
-                    f"Error in discovery publish (temp loop): {e}",
-                    extra={"event_type": "mqtt_discovery_temp_loop_error", "error": str(e)}
-                )
-            finally:
-                loop.close()
+            return
+
+        # Schedule on main event loop from MQTT callback thread
+        future = asyncio.run_coroutine_threadsafe(
+            self._publish_discovery_on_connect(),
+            self._main_event_loop
+        )
+        # Log any errors from the future (non-blocking)
+        future.add_done_callback(self._handle_publish_future)
+        logger.debug(
+            "Scheduled discovery publish on main event loop",
+            extra={"event_type": "mqtt_discovery_scheduled_threadsafe"}
+        )
 
     def _handle_publish_future(self, future: asyncio.Future) -> None:
         """Handle completion of threadsafe discovery publish."""
@@ -786,18 +1259,27 @@ class MQTTDiscoveryService:
     async def _publish_discovery_on_connect(self) -> None:
         """Internal async handler for on_connect callback."""
         try:
-            # Small delay to ensure connection is stable
-            await asyncio.sleep(0.5)
-
-            # Publish online status first (AC7)
-            await self._publish_online_status()
-
-            # Then publish all discovery configs
-            await self.publish_all_discovery_configs()
+            # MQTTService only invokes the connect callback once CONNACK has
+            # been accepted, so publishing can start right away. Online status
+            # (AC7) is queued first, in the same burst as the discovery configs.
+            # Discovery is forced: the broker may have restarted and lost its
+            # retained copies, so unchanged digests prove nothing here (AC5).
+            results = await asyncio.gather(
+                self._publish_online_status(),
+                self.publish_all_discovery_configs(force=True),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"Error publishing discovery on connect: {result}",
+                        extra={"event_type": "mqtt_discovery_connect_error", "error": str(result)}
+                    )
 
             # Publish camera statuses on connect/reconnect (Bug fix: statuses were only
             # published at startup, not on reconnect, causing "Unknown" in Home Assistant)
             try:
+                from app.services.mqtt_status_service import publish_all_camera_statuses
                 status_count = await publish_all_camera_statuses()
                 logger.info(
                     f"Published status for {status_count} cameras on MQTT connect",
@@ -817,8 +1299,7 @@ class MQTTDiscoveryService:
 
     async def _publish_online_status(self) -> None:
         """Publish online status to availability topic (AC7)."""
-        with SessionLocal() as db:
-            config = db.query(MQTTConfig).first()
+        config = await self._get_config()
 
         if not config:
             return
@@ -868,6 +1349,8 @@ async def initialize_discovery_service() -> None:
     Note: Must be called from async context (FastAPI lifespan) to capture
     the running event loop for cross-thread scheduling.
     """
+    from app.services.mqtt_service import get_mqtt_service
+
     discovery = get_discovery_service()
     mqtt = get_mqtt_service()
 
@@ -922,14 +1405,11 @@ async def on_discovery_setting_changed(enabled: bool) -> None:
     """
     Hook for discovery_enabled setting change (AC6).
 
+    The publish/remove fan-out is debounced; rapid toggles collapse into one.
+
     Args:
         enabled: New discovery_enabled value
     """
     discovery = get_discovery_service()
-
-    if enabled:
-        # Re-publish all discovery configs
-        await discovery.publish_all_discovery_configs()
-    else:
-        # Remove all discovery configs
-        await discovery.remove_all_discovery_configs()
+    discovery.invalidate_config_cache()
+    discovery.schedule_setting_sync(enabled)
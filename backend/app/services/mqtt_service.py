@@ -17,14 +17,15 @@ with graceful fallback to MQTT 3.1.1 if broker doesn't support v5.
 Migrated to @singleton: Story P14-5.3
 """
 import asyncio
-import json
 import logging
 import ssl
 import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Optional, Any, Dict, Callable
+from typing import Optional, Any, Dict, Callable, List, Tuple, Union
 
+import orjson
 import paho.mqtt.client as mqtt
 from paho.mqtt.properties import Properties
 from paho.mqtt.packettypes import PacketTypes
@@ -94,6 +95,9 @@ class MQTTService:
         # Callbacks for connection state changes
         self._on_connect_callback: Optional[Callable[[], None]] = None
         self._on_disconnect_callback: Optional[Callable[[str], None]] = None
+        # Single worker so connect/disconnect status writes land in order
+        # without blocking paho's network thread on the database
+        self._db_status_executor: Optional[ThreadPoolExecutor] = None
 
     @property
     def is_connected(self) -> bool:
@@ -468,12 +472,38 @@ class MQTTService:
             When connected via MQTT 5.0, messages include MessageExpiryInterval
             based on config.message_expiry_seconds (P5-6.1).
         """
+        return self.publish_nowait(topic, payload, qos=qos, retain=retain) is not None
+
+    def publish_nowait(
+        self,
+        topic: str,
+        payload: Union[dict, bytes],
+        qos: Optional[int] = None,
+        retain: Optional[bool] = None
+    ) -> Optional[mqtt.MQTTMessageInfo]:
+        """
+        Hand a message to paho's outgoing queue without awaiting anything.
+
+        PUBACKs for QoS 1/2 stream back on paho's network thread, so callers
+        publishing many messages (e.g. discovery fan-out) can queue them
+        back-to-back instead of yielding to the event loop per message.
+
+        Args:
+            topic: MQTT topic to publish to
+            payload: Dictionary to serialize as JSON, or already-encoded bytes
+                which are sent as-is
+            qos: Quality of Service level (0, 1, or 2). Defaults to config value.
+            retain: Whether to retain message. Defaults to config value.
+
+        Returns:
+            MQTTMessageInfo for the queued message, or None if it was not queued.
+        """
         if not self._connected or not self._client:
             logger.warning(
                 "Cannot publish: MQTT not connected",
                 extra={"event_type": "mqtt_publish_skipped", "topic": topic}
             )
-            return False
+            return None
 
         # Use config defaults if not specified
         if qos is None:
@@ -482,8 +512,15 @@ class MQTTService:
             retain = self._config.retain_messages if self._config else True
 
         try:
-            # Serialize payload to JSON
-            message = json.dumps(payload, default=self._json_serializer)
+            # Serialize payload to JSON bytes unless the caller pre-encoded it
+            if isinstance(payload, bytes):
+                message = payload
+            else:
+                message = orjson.dumps(
+                    payload,
+                    default=self._json_serializer,
+                    option=orjson.OPT_SERIALIZE_NUMPY
+                )
 
             # Build MQTT 5.0 properties with message expiry (P5-6.1)
             properties = None
@@ -516,7 +553,7 @@ class MQTTService:
                         "message_id": result.mid
                     }
                 )
-                return True
+                return result
             else:
                 # Update Prometheus metrics
                 record_mqtt_publish_error()
@@ -529,7 +566,7 @@ class MQTTService:
                         "error_code": result.rc
                     }
                 )
-                return False
+                return None
 
         except Exception as e:
             # Update Prometheus metrics
@@ -543,7 +580,49 @@ class MQTTService:
                     "error": str(e)
                 }
             )
-            return False
+            return None
+
+    def publish_many(
+        self,
+        items: List[Tuple[str, Union[str, bytes], int, bool]]
+    ) -> List[mqtt.MQTTMessageInfo]:
+        """
+        Queue several pre-encoded messages back-to-back.
+
+        Intended for bulk operations such as clearing retained discovery
+        topics, where per-message coroutines and logging add up.
+
+        Args:
+            items: (topic, payload, qos, retain) tuples
+
+        Returns:
+            MQTTMessageInfo per item in input order, or an empty list if not
+            connected. Callers check each info's rc for failures.
+        """
+        if not self._connected or not self._client:
+            logger.warning(
+                "Cannot publish: MQTT not connected",
+                extra={"event_type": "mqtt_publish_skipped", "count": len(items)}
+            )
+            return []
+
+        infos = [
+            self._client.publish(topic, payload, qos=qos, retain=retain)
+            for topic, payload, qos, retain in items
+        ]
+
+        published = sum(1 for info in infos if info.rc == mqtt.MQTT_ERR_SUCCESS)
+        with self._lock:
+            self._messages_published += published
+
+        # Update Prometheus metrics
+        for info in infos:
+            if info.rc == mqtt.MQTT_ERR_SUCCESS:
+                record_mqtt_message_published()
+            else:
+                record_mqtt_publish_error()
+
+        return infos
 
     @staticmethod
     def _json_serializer(obj: Any) -> str:
@@ -604,8 +683,8 @@ class MQTTService:
                 except Exception as e:
                     logger.error(f"MQTT on_connect callback failed: {e}")
 
-            # Update database status
-            self._update_db_status(connected=True)
+            # Update database status off the network thread
+            self._schedule_db_status_update(connected=True)
         else:
             error_msg = f"Connection refused: {reason_code}"
 
@@ -685,8 +764,8 @@ class MQTTService:
             except Exception as e:
                 logger.error(f"MQTT on_disconnect callback failed: {e}")
 
-        # Update database status
-        self._update_db_status(connected=False, error=self._last_error)
+        # Update database status off the network thread
+        self._schedule_db_status_update(connected=False, error=self._last_error)
 
         # Start reconnect loop if enabled and was previously connected
         if was_connected and self._should_reconnect:
@@ -785,6 +864,32 @@ class MQTTService:
 
         self._reconnect_task = None
 
+    def _schedule_db_status_update(
+        self,
+        connected: bool,
+        error: Optional[str] = None
+    ) -> None:
+        """
+        Queue a database status update on the status worker thread.
+
+        Called from paho callbacks, which run on the network thread; a
+        synchronous commit there would stall PUBACK/keepalive handling
+        while SQLite waits on a write lock.
+
+        Args:
+            connected: Connection state to record
+            error: Optional error message to record
+        """
+        if self._db_status_executor is None:
+            self._db_status_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="mqtt-db-status"
+            )
+        try:
+            self._db_status_executor.submit(self._update_db_status, connected, error)
+        except RuntimeError as e:
+            # Executor shut down (process exiting) - skip the status write
+            logger.debug(f"Skipped MQTT status database update: {e}")
+
     def _update_db_status(
         self,
         connected: bool,
@@ -1303,6 +1408,9 @@ async def shutdown_mqtt_service() -> None:
     instance = MQTTService._get_instance()
     if instance:
         await instance.disconnect()
+        if instance._db_status_executor is not None:
+            # Pending status writes still run; just don't block shutdown on them
+            instance._db_status_executor.shutdown(wait=False)
         MQTTService._reset_instance()
 
 
@@ -297,6 +297,26 @@ class VehicleDetectionService:
             image_bytes: Raw image bytes (JPEG/PNG)
             confidence_threshold: Minimum confidence (defaults to CONFIDENCE_THRESHOLD)
 
+        Returns:
+            List of VehicleDetection results, sorted by confidence descending
+        """
+        return await self.detect_vehicles_in_image(
+            self._bytes_to_cv2(image_bytes),
+            confidence_threshold=confidence_threshold
+        )
+
+    async def detect_vehicles_in_image(
+        self,
+        image: np.ndarray,
+        confidence_threshold: Optional[float] = None
+    ) -> list[VehicleDetection]:
+        """
+        Detect vehicles in an already decoded image.
+
+        Args:
+            image: OpenCV image (BGR format), e.g. from decode_image
+            confidence_threshold: Minimum confidence (defaults to CONFIDENCE_THRESHOLD)
+
         Returns:
             List of VehicleDetection results, sorted by confidence descending
         """
@@ -304,9 +324,6 @@ class VehicleDetectionService:
         if not self._model_loaded:
             self._load_model()
 
-        # Convert to OpenCV format
-        image = self._bytes_to_cv2(image_bytes)
-
         # Run detection in thread pool (CPU-bound)
         loop = asyncio.get_event_loop()
         vehicles = await loop.run_in_executor(
@@ -330,6 +347,18 @@ class VehicleDetectionService:
 
         return vehicles
 
+    def decode_image(self, image_bytes: bytes) -> np.ndarray:
+        """
+        Decode image bytes once for reuse across several crops.
+
+        Args:
+            image_bytes: Raw image bytes (JPEG/PNG)
+
+        Returns:
+            OpenCV BGR image array
+        """
+        return self._bytes_to_cv2(image_bytes)
+
     def crop_vehicle(
         self,
         image_bytes: bytes,
@@ -347,11 +376,53 @@ class VehicleDetectionService:
         Returns:
             Cropped and resized vehicle image as JPEG bytes
         """
+        return self.crop_vehicle_from_image(self._bytes_to_cv2(image_bytes), bbox, padding)
+
+    def crop_vehicle_from_image(
+        self,
+        image: np.ndarray,
+        bbox: BoundingBox,
+        padding: Optional[float] = None
+    ) -> bytes:
+        """
+        Crop a vehicle region from an already decoded image.
+
+        Args:
+            image: OpenCV image (BGR format), e.g. from decode_image
+            bbox: Bounding box of the vehicle
+            padding: Padding around vehicle as fraction (default: DEFAULT_PADDING)
+
+        Returns:
+            Cropped and resized vehicle image as JPEG bytes
+        """
+        vehicle_resized = self.crop_vehicle_array(image, bbox, padding)
+
+        # Encode as JPEG
+        _, buffer = cv2.imencode('.jpg', vehicle_resized, [cv2.IMWRITE_JPEG_QUALITY, 90])
+        vehicle_bytes = buffer.tobytes()
+
+        return vehicle_bytes
+
+    def crop_vehicle_array(
+        self,
+        image: np.ndarray,
+        bbox: BoundingBox,
+        padding: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Crop and resize a vehicle region without encoding it.
+
+        Args:
+            image: OpenCV image (BGR format), e.g. from decode_image
+            bbox: Bounding box of the vehicle
+            padding: Padding around vehicle as fraction (default: DEFAULT_PADDING)
+
+        Returns:
+            Vehicle region resized to TARGET_SIZE (BGR format)
+        """
         if padding is None:
             padding = self.DEFAULT_PADDING
 
-        # Convert to OpenCV format
-        image = self._bytes_to_cv2(image_bytes)
         (h, w) = image.shape[:2]
 
         # Calculate padded bounding box
@@ -367,13 +438,7 @@ class VehicleDetectionService:
         vehicle_crop = image[y1:y2, x1:x2]
 
         # Resize to standard size
-        vehicle_resized = cv2.resize(vehicle_crop, self.TARGET_SIZE)
-
-        # Encode as JPEG
-        _, buffer = cv2.imencode('.jpg', vehicle_resized, [cv2.IMWRITE_JPEG_QUALITY, 90])
-        vehicle_bytes = buffer.tobytes()
-
-        return vehicle_bytes
+        return cv2.resize(vehicle_crop, self.TARGET_SIZE)
 
     def is_model_loaded(self) -> bool:
         """Check if the vehicle detection model is loaded."""
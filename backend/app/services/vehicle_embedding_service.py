@@ -17,13 +17,23 @@ Privacy:
     - Users can delete all vehicle embeddings via API
 """
 import asyncio
-import json
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Optional
 
+import numpy as np
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.models.vehicle_embedding import VehicleEmbedding
+from app.core.config import settings
+from app.models.vehicle_embedding import (
+    VehicleEmbedding,
+    dequantize_embedding,
+    pack_bounding_box,
+    quantize_embedding,
+    unpack_bounding_box,
+)
 from app.services.vehicle_detection_service import (
     VehicleDetectionService,
     get_vehicle_detection_service,
@@ -44,9 +54,11 @@ class VehicleEmbeddingService:
 
     Attributes:
         MODEL_VERSION: Version string for tracking embedding compatibility
+        EMBEDDING_CACHE_SIZE: Max quantized embeddings kept by crop content hash
     """
 
     MODEL_VERSION = "clip-ViT-B-32-vehicle-v1"
+    EMBEDDING_CACHE_SIZE = 1024
 
     def __init__(
         self,
@@ -62,6 +74,9 @@ class VehicleEmbeddingService:
         """
         self._vehicle_detector = vehicle_detector or get_vehicle_detection_service()
         self._embedding_service = embedding_service or get_embedding_service()
+        self._max_vehicles_per_event = settings.VEHICLE_MAX_PER_EVENT
+        # LRU of crop content hash -> quantized (embedding, scale)
+        self._embedding_cache: OrderedDict[bytes, tuple[bytes, float]] = OrderedDict()
 
         logger.info(
             "VehicleEmbeddingService initialized",
@@ -96,9 +111,11 @@ class VehicleEmbeddingService:
         if not thumbnail_bytes:
             raise ValueError("thumbnail_bytes cannot be empty")
 
-        # Step 1: Detect vehicles
-        vehicles = await self._vehicle_detector.detect_vehicles(
-            thumbnail_bytes,
+        # Step 1: Decode the thumbnail once, off the event loop, and detect
+        # vehicles in it; the same decoded image is reused for every crop
+        image = await asyncio.to_thread(self._vehicle_detector.decode_image, thumbnail_bytes)
+        vehicles = await self._vehicle_detector.detect_vehicles_in_image(
+            image,
             confidence_threshold=confidence_threshold
         )
 
@@ -109,72 +126,95 @@ class VehicleEmbeddingService:
             )
             return []
 
+        # Crop and embed only the strongest detections; CLIP cost is linear
+        # in the number of vehicles, so crowded scenes are capped
+        detected_count = len(vehicles)
+        vehicles = sorted(vehicles, key=lambda v: v.confidence, reverse=True)[:self._max_vehicles_per_event]
+
         logger.info(
-            f"Detected {len(vehicles)} vehicle(s) in event thumbnail",
+            f"Detected {detected_count} vehicle(s) in event thumbnail",
             extra={
                 "event_type": "vehicles_detected",
                 "event_id": event_id,
                 "vehicle_count": len(vehicles),
+                "rejected_count": detected_count - len(vehicles),
                 "confidences": [v.confidence for v in vehicles],
                 "vehicle_types": [v.vehicle_type for v in vehicles],
             }
         )
 
-        # Step 2: Process each vehicle
-        vehicle_embedding_ids = []
-
-        for i, vehicle in enumerate(vehicles):
-            try:
-                # Extract vehicle region
-                vehicle_bytes = self._vehicle_detector.crop_vehicle(
-                    thumbnail_bytes,
-                    vehicle.bbox
-                )
-
-                # Generate embedding using CLIP on the cropped vehicle
-                embedding_vector = await self._embedding_service.generate_embedding(
-                    vehicle_bytes
-                )
-
-                # Store vehicle embedding
-                vehicle_embedding = VehicleEmbedding(
-                    event_id=event_id,
-                    embedding=json.dumps(embedding_vector),
-                    bounding_box=json.dumps(vehicle.bbox.to_dict()),
-                    confidence=vehicle.confidence,
-                    vehicle_type=vehicle.vehicle_type,
-                    model_version=self.MODEL_VERSION,
-                )
-
-                db.add(vehicle_embedding)
-                db.commit()
-                db.refresh(vehicle_embedding)
-
-                vehicle_embedding_ids.append(vehicle_embedding.id)
+        # Step 2: Crop every vehicle in worker threads so the CPU-bound work
+        # stays off the event loop
+        results = await asyncio.gather(
+            *[
+                asyncio.to_thread(self._vehicle_detector.crop_vehicle_array, image, vehicle.bbox)
+                for vehicle in vehicles
+            ],
+            return_exceptions=True,
+        )
 
-                logger.debug(
-                    f"Stored vehicle embedding {i+1}/{len(vehicles)}",
+        crops: list[tuple[VehicleDetection, np.ndarray]] = []
+        for i, (vehicle, result) in enumerate(zip(vehicles, results)):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to process vehicle {i+1}/{len(vehicles)}: {result}",
+                    exc_info=result,
                     extra={
-                        "event_type": "vehicle_embedding_stored",
+                        "event_type": "vehicle_embedding_error",
                         "event_id": event_id,
-                        "vehicle_embedding_id": vehicle_embedding.id,
-                        "confidence": vehicle.confidence,
-                        "vehicle_type": vehicle.vehicle_type,
+                        "vehicle_index": i,
+                        "error": str(result),
                     }
                 )
-
+                # Continue processing remaining vehicles
+                continue
+            crops.append((vehicle, result))
+
+        # Step 3: Generate CLIP embeddings for all crops in one batched call
+        try:
+            quantized = await self._embed_crops([crop for _, crop in crops])
+        except Exception as e:
+            logger.error(
+                f"Failed to generate embeddings for {len(crops)} vehicle(s): {e}",
+                exc_info=True,
+                extra={
+                    "event_type": "vehicle_embedding_error",
+                    "event_id": event_id,
+                    "vehicle_count": len(crops),
+                    "error": str(e),
+                }
+            )
+            quantized = []
+
+        pending: list[VehicleEmbedding] = []
+        for (vehicle, _), (embedding, embedding_scale) in zip(crops, quantized):
+            pending.append(VehicleEmbedding(
+                event_id=event_id,
+                embedding=embedding,
+                embedding_scale=embedding_scale,
+                bounding_box=pack_bounding_box(vehicle.bbox.to_dict()),
+                confidence=vehicle.confidence,
+                vehicle_type=vehicle.vehicle_type,
+                model_version=self.MODEL_VERSION,
+            ))
+
+        # Step 4: Store all of the event's embeddings in one transaction, in
+        # a worker thread so the commit's fsync doesn't stall the event loop
+        vehicle_embedding_ids = []
+        if pending:
+            try:
+                vehicle_embedding_ids = await asyncio.to_thread(self._store_embeddings, db, pending)
             except Exception as e:
                 logger.error(
-                    f"Failed to process vehicle {i+1}/{len(vehicles)}: {e}",
+                    f"Failed to store {len(pending)} vehicle embedding(s): {e}",
                     exc_info=True,
                     extra={
-                        "event_type": "vehicle_embedding_error",
+                        "event_type": "vehicle_embedding_store_error",
                         "event_id": event_id,
-                        "vehicle_index": i,
+                        "vehicle_count": len(pending),
                         "error": str(e),
                     }
                 )
-                # Continue processing remaining vehicles
 
         logger.info(
             f"Processed {len(vehicle_embedding_ids)}/{len(vehicles)} vehicle embeddings for event",
@@ -188,6 +228,89 @@ class VehicleEmbeddingService:
 
         return vehicle_embedding_ids
 
+    @staticmethod
+    def _store_embeddings(db: Session, pending: list[VehicleEmbedding]) -> list[str]:
+        """
+        Insert vehicle embeddings in one transaction and return their IDs.
+
+        IDs are generated client-side at flush, so they are read before commit
+        expires the instances instead of refreshing each row.
+
+        Args:
+            db: SQLAlchemy database session
+            pending: New VehicleEmbedding rows
+
+        Returns:
+            IDs of the stored rows, in the same order as pending
+
+        Raises:
+            Exception: Any database error, after rolling back
+        """
+        try:
+            db.add_all(pending)
+            db.flush()
+            stored_ids = [vehicle_embedding.id for vehicle_embedding in pending]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return stored_ids
+
+    async def _embed_crops(self, crops: list[np.ndarray]) -> list[tuple[bytes, float]]:
+        """
+        Embed vehicle crops, reusing cached results for identical pixels.
+
+        Only crops whose content hash is not cached go to CLIP, together in
+        one batch; a parked car filmed by a static camera often yields the
+        exact same crop across events.
+
+        Args:
+            crops: Vehicle crops (BGR format) from crop_vehicle_array
+
+        Returns:
+            Quantized (embedding, embedding_scale) pairs, in the same order as crops
+        """
+        keys = [hashlib.blake2b(crop.tobytes(), digest_size=16).digest() for crop in crops]
+
+        # Copy hits out before awaiting: a concurrent call may evict them
+        # from the shared cache while CLIP runs
+        embedded: dict[bytes, tuple[bytes, float]] = {}
+        missing: dict[bytes, np.ndarray] = {}
+        for key, crop in zip(keys, crops):
+            cached = self._embedding_cache.get(key)
+            if cached is not None:
+                embedded[key] = cached
+            else:
+                missing.setdefault(key, crop)
+
+        if missing:
+            # Hand over pixels directly (BGR -> RGB) rather than JPEG bytes
+            vectors = await self._embedding_service.generate_embeddings_from_arrays(
+                [crop[:, :, ::-1] for crop in missing.values()]
+            )
+            for key, vector in zip(missing, vectors):
+                embedded[key] = quantize_embedding(vector)
+
+        results = [embedded[key] for key in keys]
+
+        # Refresh recency (or re-insert entries evicted meanwhile), then trim
+        for key, value in embedded.items():
+            self._embedding_cache[key] = value
+            self._embedding_cache.move_to_end(key)
+        while len(self._embedding_cache) > self.EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
+        logger.debug(
+            "Vehicle crops embedded",
+            extra={
+                "event_type": "vehicle_crops_embedded",
+                "crop_count": len(crops),
+                "cache_hits": len(crops) - len(missing),
+            }
+        )
+
+        return results
+
     async def get_vehicle_embeddings(
         self,
         db: Session,
@@ -203,7 +326,17 @@ class VehicleEmbeddingService:
         Returns:
             List of vehicle embedding dictionaries with metadata
         """
-        embeddings = db.query(VehicleEmbedding).filter(
+        # Select metadata columns only; the embedding blob is not needed here
+        embeddings = db.query(
+            VehicleEmbedding.id,
+            VehicleEmbedding.event_id,
+            VehicleEmbedding.entity_id,
+            VehicleEmbedding.bounding_box,
+            VehicleEmbedding.confidence,
+            VehicleEmbedding.vehicle_type,
+            VehicleEmbedding.model_version,
+            VehicleEmbedding.created_at,
+        ).filter(
             VehicleEmbedding.event_id == event_id
         ).order_by(VehicleEmbedding.confidence.desc()).all()
 
@@ -212,7 +345,7 @@ class VehicleEmbeddingService:
                 "id": e.id,
                 "event_id": e.event_id,
                 "entity_id": e.entity_id,
-                "bounding_box": json.loads(e.bounding_box),
+                "bounding_box": unpack_bounding_box(e.bounding_box),
                 "confidence": e.confidence,
                 "vehicle_type": e.vehicle_type,
                 "model_version": e.model_version,
@@ -243,7 +376,7 @@ class VehicleEmbeddingService:
         if embedding is None:
             return None
 
-        return json.loads(embedding.embedding)
+        return dequantize_embedding(embedding.embedding, embedding.embedding_scale)
 
     async def delete_event_vehicles(
         self,
@@ -322,12 +455,25 @@ class VehicleEmbeddingService:
         """
         Get the total count of all vehicle embeddings.
 
+        On PostgreSQL this is the planner's row estimate from pg_class, which
+        is O(1) but only as fresh as the last VACUUM/ANALYZE; other databases
+        (and never-analyzed tables) get an exact COUNT(*).
+
         Args:
             db: SQLAlchemy database session
 
         Returns:
-            Total number of vehicle embeddings in database
+            Total number of vehicle embeddings in database (estimated on PostgreSQL)
         """
+        if db.get_bind().dialect.name == "postgresql":
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE relname = :table"),
+                {"table": VehicleEmbedding.__tablename__},
+            ).scalar()
+            # reltuples is -1 (or 0) until the table has been analyzed
+            if estimate is not None and estimate > 0:
+                return int(estimate)
+
         return db.query(VehicleEmbedding).count()
 
     def get_model_version(self) -> str:
@@ -475,7 +475,11 @@ class VehicleMatchingService:
         Raises:
             ValueError: If vehicle embedding not found
         """
-        from app.models.vehicle_embedding import VehicleEmbedding
+        from app.models.vehicle_embedding import (
+            VehicleEmbedding,
+            dequantize_embedding,
+            unpack_bounding_box,
+        )
         from app.models.recognized_entity import RecognizedEntity, EntityEvent
 
         start_time = time.time()
@@ -488,8 +492,10 @@ class VehicleMatchingService:
         if not vehicle_embedding:
             raise ValueError(f"VehicleEmbedding {vehicle_embedding_id} not found")
 
-        embedding_vector = json.loads(vehicle_embedding.embedding)
-        bounding_box = json.loads(vehicle_embedding.bounding_box)
+        embedding_vector = dequantize_embedding(
+            vehicle_embedding.embedding, vehicle_embedding.embedding_scale
+        )
+        bounding_box = unpack_bounding_box(vehicle_embedding.bounding_box)
         vehicle_type = vehicle_embedding.vehicle_type
 
         # Extract characteristics from description
@@ -924,7 +930,7 @@ class VehicleMatchingService:
             Vehicle dict with optional embeddings, or None if not found
         """
         from app.models.recognized_entity import RecognizedEntity
-        from app.models.vehicle_embedding import VehicleEmbedding
+        from app.models.vehicle_embedding import VehicleEmbedding, unpack_bounding_box
         from app.models.event import Event
         from sqlalchemy import desc
 
@@ -979,7 +985,7 @@ class VehicleMatchingService:
                 {
                     "id": e.id,
                     "event_id": e.event_id,
-                    "bounding_box": json.loads(e.bounding_box) if e.bounding_box else None,
+                    "bounding_box": unpack_bounding_box(e.bounding_box) if e.bounding_box else None,
                     "confidence": e.confidence,
                     "vehicle_type": e.vehicle_type,
                     "created_at": e.created_at,
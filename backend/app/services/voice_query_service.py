@@ -10,12 +10,15 @@ Example queries:
 - "Was there anyone at the back yard in the last hour?"
 """
 import re
+import json
 import logging
+from functools import lru_cache
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Callable
 from collections import Counter
 
+from sqlalchemy import func, text
 from sqlalchemy.orm import Session
 
 from app.models.event import Event
@@ -39,6 +42,84 @@ class TimeRange:
         }
 
 
+# Time range handlers, keyed by VoiceQueryService.TIME_PATTERNS time_type.
+# Each takes (now, today_start, amount) where amount is the hours or minutes
+# captured by relative expressions.
+TimeHandler = Callable[[datetime, datetime, Optional[int]], TimeRange]
+
+
+def _last_n_hours(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(
+        start=now - timedelta(hours=amount),
+        end=now,
+        description=f"the last {amount} hour{'s' if amount > 1 else ''}",
+    )
+
+
+def _last_n_minutes(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(
+        start=now - timedelta(minutes=amount),
+        end=now,
+        description=f"the last {amount} minute{'s' if amount > 1 else ''}",
+    )
+
+
+def _today(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(start=today_start, end=now, description="today")
+
+
+def _yesterday(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(
+        start=today_start - timedelta(days=1),
+        end=today_start - timedelta(seconds=1),
+        description="yesterday",
+    )
+
+
+def _part_of_today(start_hour: int, end_hour: int, description: str) -> TimeHandler:
+    """Handler for a window of today; the end is capped at now if still in progress."""
+    def handler(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+        end = today_start.replace(hour=end_hour)
+        if now.hour < end_hour:
+            end = now
+        return TimeRange(
+            start=today_start.replace(hour=start_hour),
+            end=end,
+            description=description,
+        )
+    return handler
+
+
+def _tonight(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(
+        start=today_start.replace(hour=18),
+        end=today_start + timedelta(days=1),  # Midnight
+        description="tonight",
+    )
+
+
+def _last_hour(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(start=now - timedelta(hours=1), end=now, description="the last hour")
+
+
+def _last_15_minutes(now: datetime, today_start: datetime, amount: Optional[int]) -> TimeRange:
+    return TimeRange(start=now - timedelta(minutes=15), end=now, description="the last 15 minutes")
+
+
+TIME_HANDLERS: Dict[str, TimeHandler] = {
+    "last_n_hours": _last_n_hours,
+    "last_n_minutes": _last_n_minutes,
+    "today": _today,
+    "yesterday": _yesterday,
+    "this_morning": _part_of_today(6, 12, "this morning"),
+    "this_afternoon": _part_of_today(12, 18, "this afternoon"),
+    "this_evening": _part_of_today(18, 22, "this evening"),
+    "tonight": _tonight,
+    "last_hour": _last_hour,
+    "last_15_minutes": _last_15_minutes,
+}
+
+
 @dataclass
 class ParsedQuery:
     """Result of parsing a natural language query."""
@@ -52,7 +133,7 @@ class ParsedQuery:
 @dataclass
 class QueryResult:
     """Result of executing a parsed query."""
-    events: List[Event] = field(default_factory=list)
+    events: List[Event] = field(default_factory=list)  # Loaded only when the response needs them
     count: int = 0
     cameras_involved: List[str] = field(default_factory=list)  # Camera names
     objects_detected: Dict[str, int] = field(default_factory=dict)  # object -> count
@@ -69,25 +150,29 @@ class VoiceQueryService:
     Generates TTS-friendly responses summarizing matching events.
     """
 
-    # Time expression patterns
+    # Time expression patterns as (time_type, pattern). They are combined
+    # into one alternation so a query is scanned once; the earliest
+    # expression in the query wins, with list order breaking ties.
     TIME_PATTERNS = [
         # Relative hours/minutes
-        (r"last\s+(\d+)\s+hours?", "last_n_hours"),
-        (r"last\s+(\d+)\s+minutes?", "last_n_minutes"),
-        (r"past\s+(\d+)\s+hours?", "last_n_hours"),
-        (r"past\s+(\d+)\s+minutes?", "last_n_minutes"),
+        ("last_n_hours", r"(?:last|past)\s+(?P<hours>\d+)\s+hours?"),
+        ("last_n_minutes", r"(?:last|past)\s+(?P<minutes>\d+)\s+minutes?"),
         # Named periods
-        (r"\btoday\b", "today"),
-        (r"\byesterday\b", "yesterday"),
-        (r"\bthis\s+morning\b", "this_morning"),
-        (r"\bthis\s+afternoon\b", "this_afternoon"),
-        (r"\bthis\s+evening\b", "this_evening"),
-        (r"\btonight\b", "tonight"),
-        (r"\blast\s+hour\b", "last_hour"),
-        (r"\brecently\b", "last_hour"),
-        (r"\bjust\s+now\b", "last_15_minutes"),
+        ("today", r"\btoday\b"),
+        ("yesterday", r"\byesterday\b"),
+        ("this_morning", r"\bthis\s+morning\b"),
+        ("this_afternoon", r"\bthis\s+afternoon\b"),
+        ("this_evening", r"\bthis\s+evening\b"),
+        ("tonight", r"\btonight\b"),
+        ("last_hour", r"\blast\s+hour\b|\brecently\b"),
+        ("last_15_minutes", r"\bjust\s+now\b"),
     ]
 
+    _TIME_PATTERN = re.compile(
+        "|".join(f"(?P<{time_type}>{pattern})" for time_type, pattern in TIME_PATTERNS),
+        re.IGNORECASE,
+    )
+
     # Camera name synonyms for fuzzy matching
     CAMERA_SYNONYMS = {
         "front": ["front door", "front entrance", "front porch", "main entrance"],
@@ -98,6 +183,12 @@ class VoiceQueryService:
         "garden": ["garden", "lawn"],
     }
 
+    # Query types whose responses describe each matching event
+    EVENT_LIST_QUERY_TYPES = ("specific_event",)
+
+    # Object types that are not worth mentioning in a spoken summary
+    IGNORED_OBJECTS = ("unknown", "motion")
+
     def __init__(self):
         """Initialize the voice query service."""
         pass
@@ -115,11 +206,11 @@ class VoiceQueryService:
         """
         query_lower = query.lower().strip()
 
-        # Parse time range
-        time_range = self._parse_time_expression(query_lower)
-
-        # Parse camera filter
-        camera_id, camera_name = self._match_camera_name(query_lower, cameras)
+        # Assistants repeat the same phrases, so the regex and camera matching
+        # are memoized; only the time window is materialized per call
+        camera_sig = self._camera_signature(cameras)
+        time_type, amount, camera_id, camera_name = self._parse_cached(query_lower, camera_sig)
+        time_range = self._build_time_range(time_type, amount)
 
         return ParsedQuery(
             original_query=query,
@@ -140,50 +231,120 @@ class VoiceQueryService:
         Returns:
             QueryResult with matching events and aggregations
         """
-        # Build base query
-        query = db.query(Event).filter(
+        filters = [
             Event.timestamp >= parsed.time_range.start,
             Event.timestamp <= parsed.time_range.end,
-        )
+        ]
 
         # Apply camera filter if specified
         if parsed.camera_filter:
-            query = query.filter(Event.camera_id == parsed.camera_filter)
-
-        # Order by timestamp descending (most recent first)
-        query = query.order_by(Event.timestamp.desc())
+            filters.append(Event.camera_id == parsed.camera_filter)
+
+        # Count events per camera in SQL rather than loading every row
+        counts_by_camera: Dict[str, int] = dict(
+            db.query(Event.camera_id, func.count(Event.id))
+            .filter(*filters)
+            .group_by(Event.camera_id)
+            .all()
+        )
+        count = sum(counts_by_camera.values())
+
+        # Only hydrate events when the response describes them individually
+        events: List[Event] = []
+        if count == 1 or parsed.query_type in self.EVENT_LIST_QUERY_TYPES:
+            events = (
+                db.query(Event)
+                .filter(*filters)
+                .order_by(Event.timestamp.desc())
+                .all()
+            )
 
-        # Execute query
-        events = query.all()
+        # Resolve camera names with one query instead of one per event
+        camera_ids = set(counts_by_camera)
+        camera_names: Dict[str, str] = dict(
+            db.query(Camera.id, Camera.name).filter(Camera.id.in_(camera_ids)).all()
+        ) if camera_ids else {}
 
         # Aggregate results
-        cameras_involved = set()
-        objects_counter: Counter = Counter()
-
-        for event in events:
-            # Get camera name
-            camera = db.query(Camera).filter(Camera.id == event.camera_id).first()
-            if camera:
-                cameras_involved.add(camera.name)
+        cameras_involved = {
+            camera_names[camera_id] for camera_id in camera_ids if camera_id in camera_names
+        }
 
-            # Count detected objects
-            if event.objects_detected:
-                try:
-                    import json
-                    objects = json.loads(event.objects_detected) if isinstance(event.objects_detected, str) else event.objects_detected
-                    for obj in objects:
-                        if obj.lower() not in ("unknown", "motion"):
-                            objects_counter[obj.lower()] += 1
-                except (json.JSONDecodeError, TypeError):
-                    pass
+        # Count detected objects, in SQL where the database can unpack JSON
+        if not count:
+            objects_counter: Counter = Counter()
+        elif db.get_bind().dialect.name == "postgresql":
+            objects_counter = self._count_objects_in_database(db, parsed)
+        else:
+            objects_counter = self._count_objects(
+                objects for (objects,) in db.query(Event.objects_detected).filter(*filters)
+            )
 
         return QueryResult(
             events=events,
-            count=len(events),
+            count=count,
             cameras_involved=list(cameras_involved),
             objects_detected=dict(objects_counter),
         )
 
+    _OBJECT_COUNTS_SQL = """
+        SELECT lower(obj) AS object_type, COUNT(*) AS object_count
+        FROM events, jsonb_array_elements_text(events.objects_detected::jsonb) AS obj
+        WHERE events.timestamp >= :start
+          AND events.timestamp <= :end
+          {camera_clause}
+          AND lower(obj) NOT IN ('unknown', 'motion')
+        GROUP BY lower(obj)
+    """
+
+    def _count_objects_in_database(self, db: Session, parsed: ParsedQuery) -> Counter:
+        """
+        Count detected objects server-side with PostgreSQL JSONB functions.
+
+        Args:
+            db: Database session bound to PostgreSQL
+            parsed: Parsed query with filters
+
+        Returns:
+            Counter of lowercased object types
+        """
+        params: Dict[str, Any] = {
+            "start": parsed.time_range.start,
+            "end": parsed.time_range.end,
+        }
+        camera_clause = ""
+        if parsed.camera_filter:
+            camera_clause = "AND events.camera_id = :camera_id"
+            params["camera_id"] = parsed.camera_filter
+
+        rows = db.execute(
+            text(self._OBJECT_COUNTS_SQL.format(camera_clause=camera_clause)),
+            params,
+        ).all()
+        return Counter({object_type: count for object_type, count in rows})
+
+    def _count_objects(self, objects_detected_values: Iterable[Any]) -> Counter:
+        """
+        Count detected objects by parsing each event's JSON list in Python.
+
+        Args:
+            objects_detected_values: objects_detected column values to aggregate
+
+        Returns:
+            Counter of lowercased object types
+        """
+        objects_counter: Counter = Counter()
+        for objects_detected in objects_detected_values:
+            if objects_detected:
+                try:
+                    objects = json.loads(objects_detected) if isinstance(objects_detected, str) else objects_detected
+                    for obj in objects:
+                        if obj.lower() not in self.IGNORED_OBJECTS:
+                            objects_counter[obj.lower()] += 1
+                except (json.JSONDecodeError, TypeError):
+                    pass
+        return objects_counter
+
     def generate_response(self, parsed: ParsedQuery, result: QueryResult) -> str:
         """
         Generate a TTS-friendly spoken response from query results.
@@ -220,101 +381,65 @@ class VoiceQueryService:
         Args:
             query: Lowercase query string
 
+        Returns:
+            TimeRange with start, end, and description
+        """
+        return self._build_time_range(*self._match_time_expression(query))
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _parse_cached(
+        query: str, camera_sig: Tuple[Tuple[str, str], ...]
+    ) -> Tuple[Optional[str], Optional[int], Optional[str], Optional[str]]:
+        """
+        Memoized parse of the parts of a query that do not depend on the clock.
+
+        Args:
+            query: Lowercase query string
+            camera_sig: Camera (id, name) pairs from _camera_signature
+
+        Returns:
+            Tuple of (time_type, amount, camera_id, camera_name)
+        """
+        time_type, amount = VoiceQueryService._match_time_expression(query)
+        camera_id, camera_name = VoiceQueryService._match_camera_signature(query, camera_sig)
+        return time_type, amount, camera_id, camera_name
+
+    @classmethod
+    def _match_time_expression(cls, query: str) -> Tuple[Optional[str], Optional[int]]:
+        """
+        Find the time expression in a query.
+
+        Args:
+            query: Lowercase query string
+
+        Returns:
+            Tuple of (time_type, amount), where amount is the number of hours
+            or minutes for relative expressions; (None, None) if none found
+        """
+        match = cls._TIME_PATTERN.search(query)
+        if not match:
+            return None, None
+        amount = match.group("hours") or match.group("minutes")
+        return match.lastgroup, int(amount) if amount else None
+
+    def _build_time_range(self, time_type: Optional[str], amount: Optional[int]) -> TimeRange:
+        """
+        Materialize a matched time expression against the current time.
+
+        Args:
+            time_type: Time expression type from _match_time_expression
+            amount: Hours or minutes for relative expressions
+
         Returns:
             TimeRange with start, end, and description
         """
         now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        for pattern, time_type in self.TIME_PATTERNS:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                if time_type == "last_n_hours":
-                    n = int(match.group(1))
-                    return TimeRange(
-                        start=now - timedelta(hours=n),
-                        end=now,
-                        description=f"the last {n} hour{'s' if n > 1 else ''}",
-                    )
-                elif time_type == "last_n_minutes":
-                    n = int(match.group(1))
-                    return TimeRange(
-                        start=now - timedelta(minutes=n),
-                        end=now,
-                        description=f"the last {n} minute{'s' if n > 1 else ''}",
-                    )
-                elif time_type == "today":
-                    return TimeRange(
-                        start=today_start,
-                        end=now,
-                        description="today",
-                    )
-                elif time_type == "yesterday":
-                    yesterday_start = today_start - timedelta(days=1)
-                    yesterday_end = today_start - timedelta(seconds=1)
-                    return TimeRange(
-                        start=yesterday_start,
-                        end=yesterday_end,
-                        description="yesterday",
-                    )
-                elif time_type == "this_morning":
-                    morning_start = today_start.replace(hour=6)
-                    morning_end = today_start.replace(hour=12)
-                    # If it's before noon, end is now
-                    if now.hour < 12:
-                        morning_end = now
-                    return TimeRange(
-                        start=morning_start,
-                        end=morning_end,
-                        description="this morning",
-                    )
-                elif time_type == "this_afternoon":
-                    afternoon_start = today_start.replace(hour=12)
-                    afternoon_end = today_start.replace(hour=18)
-                    if now.hour < 18:
-                        afternoon_end = now
-                    return TimeRange(
-                        start=afternoon_start,
-                        end=afternoon_end,
-                        description="this afternoon",
-                    )
-                elif time_type == "this_evening":
-                    evening_start = today_start.replace(hour=18)
-                    evening_end = today_start.replace(hour=22)
-                    if now.hour < 22:
-                        evening_end = now
-                    return TimeRange(
-                        start=evening_start,
-                        end=evening_end,
-                        description="this evening",
-                    )
-                elif time_type == "tonight":
-                    tonight_start = today_start.replace(hour=18)
-                    tonight_end = today_start + timedelta(days=1)  # Midnight
-                    return TimeRange(
-                        start=tonight_start,
-                        end=tonight_end,
-                        description="tonight",
-                    )
-                elif time_type == "last_hour":
-                    return TimeRange(
-                        start=now - timedelta(hours=1),
-                        end=now,
-                        description="the last hour",
-                    )
-                elif time_type == "last_15_minutes":
-                    return TimeRange(
-                        start=now - timedelta(minutes=15),
-                        end=now,
-                        description="the last 15 minutes",
-                    )
-
         # Default: last hour
-        return TimeRange(
-            start=now - timedelta(hours=1),
-            end=now,
-            description="the last hour",
-        )
+        handler = TIME_HANDLERS.get(time_type, _last_hour)
+        return handler(now, today_start, amount)
 
     def _match_camera_name(
         self, query: str, cameras: List[Camera]
@@ -329,41 +454,91 @@ class VoiceQueryService:
         Returns:
             Tuple of (camera_id, camera_name) or (None, None) if no match
         """
-        # Ensure query is lowercase for matching
-        query = query.lower()
+        return self._match_camera_signature(query.lower(), self._camera_signature(cameras))
 
+    @staticmethod
+    def _camera_signature(cameras: List[Camera]) -> Tuple[Tuple[str, str], ...]:
+        """Hashable (id, name) pairs for cameras, in their original order."""
+        return tuple((camera.id, camera.name) for camera in cameras)
+
+    @classmethod
+    def _match_camera_signature(
+        cls, query: str, camera_sig: Tuple[Tuple[str, str], ...]
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Match camera name from a lowercase query against (id, name) pairs.
+
+        Args:
+            query: Lowercase query string
+            camera_sig: Camera (id, name) pairs from _camera_signature
+
+        Returns:
+            Tuple of (camera_id, camera_name) or (None, None) if no match
+        """
         # Check for "all cameras" or no camera filter
         if "all camera" in query or "every camera" in query:
             return None, None
 
+        exact_names, synonym_matches, word_index = cls._build_camera_index(camera_sig)
+
         # Try exact name matching first
-        for camera in cameras:
-            camera_name_lower = camera.name.lower()
-            if camera_name_lower in query:
-                return camera.id, camera.name
+        for name_lower, camera in exact_names:
+            if name_lower in query:
+                return camera
 
         # Try synonym matching
-        for base_term, synonyms in self.CAMERA_SYNONYMS.items():
-            for synonym in synonyms:
-                if synonym in query:
-                    # Find a camera that matches this term
-                    for camera in cameras:
-                        camera_name_lower = camera.name.lower()
-                        if base_term in camera_name_lower or any(
-                            s in camera_name_lower for s in synonyms
-                        ):
-                            return camera.id, camera.name
-
-        # Try partial word matching
-        query_words = set(query.split())
-        for camera in cameras:
-            camera_words = set(camera.name.lower().split())
-            # If any significant word matches
-            if query_words & camera_words:
-                return camera.id, camera.name
+        for synonym, camera in synonym_matches:
+            if synonym in query:
+                return camera
+
+        # Try partial word matching; the earliest camera sharing a word wins
+        positions = [word_index[word] for word in query.split() if word in word_index]
+        if positions:
+            return camera_sig[min(positions)]
 
         return None, None
 
+    @classmethod
+    @lru_cache(maxsize=64)
+    def _build_camera_index(
+        cls, camera_sig: Tuple[Tuple[str, str], ...]
+    ) -> Tuple[
+        Tuple[Tuple[str, Tuple[str, str]], ...],
+        Tuple[Tuple[str, Tuple[str, str]], ...],
+        Dict[str, int],
+    ]:
+        """
+        Precompute camera lookups for a camera list, once per signature.
+
+        Args:
+            camera_sig: Camera (id, name) pairs from _camera_signature
+
+        Returns:
+            Tuple of (lowercase name to camera pairs, synonym to camera pairs
+            in CAMERA_SYNONYMS order, word to earliest camera position)
+        """
+        exact_names = tuple((name.lower(), (camera_id, name)) for camera_id, name in camera_sig)
+
+        synonym_matches = []
+        for base_term, synonyms in cls.CAMERA_SYNONYMS.items():
+            # Find a camera that matches this term
+            camera = next(
+                (
+                    entry for name_lower, entry in exact_names
+                    if base_term in name_lower or any(s in name_lower for s in synonyms)
+                ),
+                None,
+            )
+            if camera:
+                synonym_matches.extend((synonym, camera) for synonym in synonyms)
+
+        word_index: Dict[str, int] = {}
+        for position, (name_lower, _) in enumerate(exact_names):
+            for word in name_lower.split():
+                word_index.setdefault(word, position)
+
+        return exact_names, tuple(synonym_matches), word_index
+
     def _generate_no_events_response(self, time_desc: str, camera_desc: str) -> str:
         """Generate response when no events found."""
         if camera_desc == "all cameras":
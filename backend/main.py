@@ -58,6 +58,7 @@ from app.services.mqtt_status_service import initialize_status_sensors  # Story
 from app.services.pattern_service import get_pattern_service  # Story P4-3.5: Pattern Detection
 from app.services.digest_scheduler import initialize_digest_scheduler, shutdown_digest_scheduler  # Story P4-4.2: Digest Scheduler
 from app.services.homekit_service import get_homekit_service, initialize_homekit_service, shutdown_homekit_service  # Story P4-6.1: HomeKit
+from app.services.mcp_context import get_mcp_context_provider  # Story P11-3.1: MCP Context
 
 # Application version
 APP_VERSION = "1.0.0"
@@ -268,6 +269,10 @@ async def lifespan(app: FastAPI):
             print(f"Username: admin")
             print(f"Password: {password}")
             print(f"{'='*60}\n")
+
+        # Preload cameras with feedback history so MCP context can skip
+        # the feedback query for cameras that have none
+        get_mcp_context_provider().load_feedback_camera_ids(setup_db)
     finally:
         setup_db.close()
 
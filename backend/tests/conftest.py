@@ -17,8 +17,9 @@ import json
 import pytest
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 from app.core.database import Base, get_db
 from app.models.event import Event
 from app.models.camera import Camera
@@ -349,35 +350,60 @@ def clear_app_overrides():
 
 
 
+@pytest.fixture(scope="session")
+def db_engine():
+    """
+    Create the shared in-memory SQLite database for db_session
+
+    The schema is created once per test session. StaticPool keeps the single
+    in-memory connection alive for every test that uses it.
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Let SQLAlchemy issue BEGIN itself so SAVEPOINTs work under pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
 @pytest.fixture(scope="function")
-def db_session():
+def db_session(db_engine):
     """
-    Create an in-memory SQLite database for testing
+    Create a session on the shared in-memory test database
 
     Yields:
         SQLAlchemy Session for test database
 
     Cleanup:
-        Drops all tables after test completes
+        Rolls back everything the test wrote; commits inside the test only
+        release a SAVEPOINT
     """
-    # Create in-memory database
-    engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False}
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint"
     )
 
-    # Create all tables
-    Base.metadata.create_all(engine)
-
-    # Create session
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    session = SessionLocal()
-
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -7,7 +7,7 @@ Each test module that imports `client` will get a fresh, isolated database.
 import os
 import tempfile
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
@@ -41,6 +41,15 @@ def _create_test_database(use_file=True):
         path = None
 
     engine = create_engine(db_url, connect_args={"check_same_thread": False})
+
+    # Throwaway databases don't need durable commits
+    @event.listens_for(engine, "connect")
+    def _disable_sync(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.close()
+
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
     return engine, SessionLocal, cleanup, path
@@ -10,9 +10,12 @@ Tests the vehicle API endpoints in context.py:
 - DELETE /api/v1/context/vehicle-embeddings - Delete all embeddings
 - GET /api/v1/context/vehicle-embeddings/stats - Get stats
 """
+import asyncio
 import json
+import httpx
 import pytest
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -26,6 +29,34 @@ from app.services.vehicle_matching_service import get_vehicle_matching_service
 from app.services.vehicle_embedding_service import get_vehicle_embedding_service
 
 
+# Fixed timestamp for mock payloads; tests never check recency
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Baseline vehicle payload; tests override only the fields they care about
+_VEHICLE_TEMPLATE = {
+    "id": "v-1",
+    "name": "My Car",
+    "first_seen_at": _NOW.isoformat(),
+    "last_seen_at": _NOW.isoformat(),
+    "occurrence_count": 5,
+    "embedding_count": 3,
+    "vehicle_type": "car",
+    "primary_color": "blue",
+}
+
+# Request URLs, named by what the test exercises
+_URL_LIST = "/api/v1/context/vehicles"
+_URL_LIST_PAGED = _URL_LIST + "?limit=10&offset=20"
+_URL_LIST_NAMED_ONLY = _URL_LIST + "?named_only=true"
+_URL_LIST_LIMIT_TOO_SMALL = _URL_LIST + "?limit=0"
+_URL_LIST_LIMIT_TOO_LARGE = _URL_LIST + "?limit=1000"
+_URL_LIST_NEGATIVE_OFFSET = _URL_LIST + "?offset=-1"
+_URL_VEHICLE = _URL_LIST + "/v-1"
+_URL_VEHICLE_MISSING = _URL_LIST + "/nonexistent"
+_URL_EMBEDDINGS = "/api/v1/context/vehicle-embeddings"
+_URL_EMBEDDING_STATS = _URL_EMBEDDINGS + "/stats"
+
+
 # Create module-level temp database (file-based for isolation)
 _test_db_fd, _test_db_path = tempfile.mkstemp(suffix="_vehicles.db")
 os.close(_test_db_fd)
@@ -48,6 +79,18 @@ def _override_get_db():
         db.close()
 
 
+def _vehicle(**overrides):
+    """Build a mock vehicle payload from the template with the given overrides"""
+    return {**_VEHICLE_TEMPLATE, **overrides}
+
+
+def _async_return(value):
+    """Coroutine function returning value, for stubs whose calls aren't asserted"""
+    async def _return(*args, **kwargs):
+        return value
+    return _return
+
+
 @pytest.fixture(scope="module", autouse=True)
 def setup_module_database():
     """Set up database and override at module start, teardown at end."""
@@ -83,15 +126,14 @@ class TestListVehicles:
 
     def test_list_vehicles_empty(self, client):
         """Test listing vehicles when none exist."""
-        mock_service = MagicMock()
-        mock_service.get_vehicles = AsyncMock(return_value=([], 0))
+        mock_service = SimpleNamespace(get_vehicles=_async_return(([], 0)))
 
         def override_vehicle_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles")
+        response = client.get(_URL_LIST)
 
         assert response.status_code == 200
         data = response.json()
@@ -100,28 +142,16 @@ class TestListVehicles:
 
     def test_list_vehicles_with_data(self, client):
         """Test listing vehicles with data."""
-        mock_vehicles = [
-            {
-                "id": "v-1",
-                "name": "My Car",
-                "first_seen_at": datetime.now(timezone.utc).isoformat(),
-                "last_seen_at": datetime.now(timezone.utc).isoformat(),
-                "occurrence_count": 5,
-                "embedding_count": 3,
-                "vehicle_type": "car",
-                "primary_color": "blue",
-            }
-        ]
+        mock_vehicles = [_vehicle()]
 
-        mock_service = MagicMock()
-        mock_service.get_vehicles = AsyncMock(return_value=(mock_vehicles, 1))
+        mock_service = SimpleNamespace(get_vehicles=_async_return((mock_vehicles, 1)))
 
         def override_vehicle_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles")
+        response = client.get(_URL_LIST)
 
         assert response.status_code == 200
         data = response.json()
@@ -139,7 +169,7 @@ class TestListVehicles:
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles?limit=10&offset=20")
+        response = client.get(_URL_LIST_PAGED)
 
         assert response.status_code == 200
         mock_service.get_vehicles.assert_called_once()
@@ -157,7 +187,7 @@ class TestListVehicles:
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles?named_only=true")
+        response = client.get(_URL_LIST_NAMED_ONLY)
 
         assert response.status_code == 200
         mock_service.get_vehicles.assert_called_once()
@@ -170,29 +200,25 @@ class TestGetVehicle:
 
     def test_get_vehicle_success(self, client):
         """Test getting vehicle details."""
-        mock_vehicle = {
-            "id": "v-1",
-            "name": "Work Truck",
-            "first_seen_at": datetime.now(timezone.utc).isoformat(),
-            "last_seen_at": datetime.now(timezone.utc).isoformat(),
-            "occurrence_count": 10,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
-            "vehicle_type": "truck",
-            "primary_color": "white",
-            "metadata": {"detected_type": "truck"},
-            "recent_detections": [],
-        }
+        mock_vehicle = _vehicle(
+            name="Work Truck",
+            occurrence_count=10,
+            created_at=_NOW.isoformat(),
+            updated_at=_NOW.isoformat(),
+            vehicle_type="truck",
+            primary_color="white",
+            metadata={"detected_type": "truck"},
+            recent_detections=[],
+        )
 
-        mock_service = MagicMock()
-        mock_service.get_vehicle = AsyncMock(return_value=mock_vehicle)
+        mock_service = SimpleNamespace(get_vehicle=_async_return(mock_vehicle))
 
         def override_vehicle_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles/v-1")
+        response = client.get(_URL_VEHICLE)
 
         assert response.status_code == 200
         data = response.json()
@@ -201,15 +227,14 @@ class TestGetVehicle:
 
     def test_get_vehicle_not_found(self, client):
         """Test getting non-existent vehicle."""
-        mock_service = MagicMock()
-        mock_service.get_vehicle = AsyncMock(return_value=None)
+        mock_service = SimpleNamespace(get_vehicle=_async_return(None))
 
         def override_vehicle_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
-        response = client.get("/api/v1/context/vehicles/nonexistent")
+        response = client.get(_URL_VEHICLE_MISSING)
 
         assert response.status_code == 404
 
@@ -219,18 +244,9 @@ class TestUpdateVehicle:
 
     def test_update_vehicle_name(self, client):
         """Test updating vehicle name."""
-        mock_vehicle = {
-            "id": "v-1",
-            "name": "New Name",
-            "first_seen_at": datetime.now(timezone.utc).isoformat(),
-            "last_seen_at": datetime.now(timezone.utc).isoformat(),
-            "occurrence_count": 5,
-            "vehicle_type": "car",
-            "primary_color": "red",
-        }
+        mock_vehicle = _vehicle(name="New Name", primary_color="red")
 
-        mock_service = MagicMock()
-        mock_service.update_vehicle_name = AsyncMock(return_value=mock_vehicle)
+        mock_service = SimpleNamespace(update_vehicle_name=_async_return(mock_vehicle))
 
         def override_vehicle_service():
             return mock_service
@@ -238,7 +254,7 @@ class TestUpdateVehicle:
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
         response = client.put(
-            "/api/v1/context/vehicles/v-1",
+            _URL_VEHICLE,
             json={"name": "New Name"}
         )
 
@@ -248,9 +264,10 @@ class TestUpdateVehicle:
 
     def test_update_vehicle_not_found(self, client):
         """Test updating non-existent vehicle."""
-        mock_service = MagicMock()
-        mock_service.update_vehicle_name = AsyncMock(return_value=None)
-        mock_service.get_vehicle = AsyncMock(return_value=None)
+        mock_service = SimpleNamespace(
+            update_vehicle_name=_async_return(None),
+            get_vehicle=_async_return(None),
+        )
 
         def override_vehicle_service():
             return mock_service
@@ -258,7 +275,7 @@ class TestUpdateVehicle:
         app.dependency_overrides[get_vehicle_matching_service] = override_vehicle_service
 
         response = client.put(
-            "/api/v1/context/vehicles/nonexistent",
+            _URL_VEHICLE_MISSING,
             json={"name": "Test"}
         )
 
@@ -268,54 +285,28 @@ class TestUpdateVehicle:
 class TestVehicleEmbeddings:
     """Tests for vehicle embedding endpoints."""
 
+    @pytest.mark.skip(reason="Placeholder - needs an Event row in the test database")
     def test_get_vehicle_embeddings_for_event(self, client):
         """Test getting vehicle embeddings for an event."""
-        mock_vehicles = [
-            {
-                "id": "emb-1",
-                "event_id": "event-1",
-                "entity_id": "v-1",
-                "bounding_box": {"x": 10, "y": 20, "width": 100, "height": 80},
-                "confidence": 0.95,
-                "vehicle_type": "car",
-                "model_version": "clip-ViT-B-32-vehicle-v1",
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            }
-        ]
-
-        mock_service = MagicMock()
-        mock_service.get_vehicle_embeddings = AsyncMock(return_value=mock_vehicles)
-
-        def override_embedding_service():
-            return mock_service
-
-        app.dependency_overrides[get_vehicle_embedding_service] = override_embedding_service
-
-        # This test requires an event to exist, so we'll just verify the endpoint is reachable
-        # In actual usage, the event must exist in DB
+        # The endpoint 404s unless the event exists in DB
+        pass
 
+    @pytest.mark.skip(reason="Placeholder - needs an Event row in the test database")
     def test_delete_event_vehicles(self, client):
         """Test deleting vehicle embeddings for an event."""
-        mock_service = MagicMock()
-        mock_service.delete_event_vehicles = AsyncMock(return_value=3)
-
-        def override_embedding_service():
-            return mock_service
-
-        app.dependency_overrides[get_vehicle_embedding_service] = override_embedding_service
-        # Note: Actual test would need proper DB setup with event
+        # The endpoint 404s unless the event exists in DB
+        pass
 
     def test_delete_all_vehicles(self, client):
         """Test deleting all vehicle embeddings."""
-        mock_service = MagicMock()
-        mock_service.delete_all_vehicles = AsyncMock(return_value=100)
+        mock_service = SimpleNamespace(delete_all_vehicles=_async_return(100))
 
         def override_embedding_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_embedding_service] = override_embedding_service
 
-        response = client.delete("/api/v1/context/vehicle-embeddings")
+        response = client.delete(_URL_EMBEDDINGS)
 
         assert response.status_code == 200
         data = response.json()
@@ -323,16 +314,17 @@ class TestVehicleEmbeddings:
 
     def test_get_vehicle_stats(self, client):
         """Test getting vehicle embedding stats."""
-        mock_service = MagicMock()
-        mock_service.get_total_vehicle_count = AsyncMock(return_value=150)
-        mock_service.get_model_version = MagicMock(return_value="clip-ViT-B-32-vehicle-v1")
+        mock_service = SimpleNamespace(
+            get_total_vehicle_count=_async_return(150),
+            get_model_version=lambda: "clip-ViT-B-32-vehicle-v1",
+        )
 
         def override_embedding_service():
             return mock_service
 
         app.dependency_overrides[get_vehicle_embedding_service] = override_embedding_service
 
-        response = client.get("/api/v1/context/vehicle-embeddings/stats")
+        response = client.get(_URL_EMBEDDING_STATS)
 
         assert response.status_code == 200
         data = response.json()
@@ -342,15 +334,23 @@ class TestVehicleEmbeddings:
 class TestVehicleAPIValidation:
     """Tests for API input validation."""
 
-    def test_list_vehicles_limit_validation(self, client):
+    @pytest.mark.asyncio
+    async def test_list_vehicles_limit_validation(self):
         """Test limit parameter validation."""
-        response = client.get("/api/v1/context/vehicles?limit=0")
-        assert response.status_code == 422  # Validation error
-
-        response = client.get("/api/v1/context/vehicles?limit=1000")
-        assert response.status_code == 422  # Exceeds max
+        transport = httpx.ASGITransport(app=app)
+        # Same user agent as TestClient, which the auth middleware lets through
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://testserver", headers={"user-agent": "testclient"}
+        ) as ac:
+            too_small, too_large = await asyncio.gather(
+                ac.get(_URL_LIST_LIMIT_TOO_SMALL),
+                ac.get(_URL_LIST_LIMIT_TOO_LARGE),
+            )
+
+        assert too_small.status_code == 422  # Validation error
+        assert too_large.status_code == 422  # Exceeds max
 
     def test_list_vehicles_offset_validation(self, client):
         """Test offset parameter validation."""
-        response = client.get("/api/v1/context/vehicles?offset=-1")
+        response = client.get(_URL_LIST_NEGATIVE_OFFSET)
         assert response.status_code == 422  # Negative not allowed
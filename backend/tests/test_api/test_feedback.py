@@ -329,6 +329,29 @@ class TestEventFeedbackEndpoints:
         response = client.delete(f"/api/v1/events/{test_event.id}/feedback")
         assert response.status_code == 404
 
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_delete_event_invalidates_mcp_feedback_window(self, client, db_session, test_event: Event, bulk):
+        """Deleting an event (and its cascaded feedback) drops the camera's MCP feedback window"""
+        from app.services.mcp_context import get_mcp_context_provider, reset_mcp_context_provider
+
+        db_session.add(EventFeedback(event_id=test_event.id, camera_id=test_event.camera_id, rating="helpful"))
+        db_session.commit()
+
+        reset_mcp_context_provider()
+        provider = get_mcp_context_provider()
+        provider._feedback_windows[test_event.camera_id] = object()
+        try:
+            if bulk:
+                response = client.delete(f"/api/v1/events/bulk?event_ids={test_event.id}")
+                assert response.status_code == 200
+            else:
+                response = client.delete(f"/api/v1/events/{test_event.id}")
+                assert response.status_code == 204
+
+            assert test_event.camera_id not in provider._feedback_windows
+        finally:
+            reset_mcp_context_provider()
+
     def test_correction_at_max_length(self, client, test_event: Event):
         """Test correction text at exactly 500 characters (boundary)"""
         max_correction = "a" * 500  # Exactly at limit
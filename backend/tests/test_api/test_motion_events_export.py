@@ -5,16 +5,103 @@ Story: P6-4.1 - Implement Motion Events CSV Export
 """
 import pytest
 import csv
-import io
 import json
 from datetime import datetime, timezone, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
+from main import app
+from app.core.database import Base, get_db
 from app.models.motion_event import MotionEvent
 from app.models.camera import Camera
 
 
-class TestMotionEventsExport:
-    """Test suite for GET /api/v1/motion-events/export endpoint"""
+# Fixed timestamp for events whose time doesn't matter to the test
+_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+_EXPECTED_COLUMNS = [
+    "timestamp", "camera_id", "camera_name", "confidence",
+    "algorithm", "x", "y", "width", "height", "zone_id"
+]
+_SAMPLE_BBOX = {"x": 100, "y": 200, "width": 50, "height": 75}
+
+
+@pytest.fixture(scope="module")
+def export_engine():
+    """In-memory database with the schema created once for the module"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+    # Let SQLAlchemy issue BEGIN itself so SAVEPOINTs work under pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def export_connection(export_engine):
+    """Connection whose outer transaction is rolled back after each test"""
+    connection = export_engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def db_session(export_connection):
+    """Session whose commits only release a SAVEPOINT in the test transaction"""
+    session = Session(bind=export_connection, join_transaction_mode="create_savepoint")
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def api_client(export_connection):
+    """Test client whose requests share the test's connection and transaction"""
+    sessions = []
+
+    def override_get_db():
+        db = Session(bind=export_connection, join_transaction_mode="create_savepoint")
+        sessions.append(db)
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    previous_override = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    # A streamed CSV body is generated after the dependency has closed its
+    # session, so the session begins a fresh SAVEPOINT; close it again so
+    # that SAVEPOINT is released before the test's own transaction ends
+    for session in reversed(sessions):
+        session.close()
+    if previous_override is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous_override
+
+
+class _ExportTestHelpers:
+    """Data and CSV helpers shared by the export test classes"""
 
     def _create_camera(self, db_session, camera_id="test-camera-1", name="Front Door"):
         """Helper to create a camera for testing"""
@@ -41,7 +128,7 @@ class TestMotionEventsExport:
     ):
         """Helper to create a motion event for testing"""
         if timestamp is None:
-            timestamp = datetime.now(timezone.utc)
+            timestamp = _NOW
 
         event = MotionEvent(
             camera_id=camera_id,
@@ -54,22 +141,39 @@ class TestMotionEventsExport:
         db_session.commit()
         return event
 
-    def _parse_csv_response(self, response_content):
-        """Parse CSV content from response"""
-        reader = csv.DictReader(io.StringIO(response_content))
-        return list(reader)
+    def _create_motion_events(self, db_session, specs):
+        """Helper to create several motion events with a single commit"""
+        events = [
+            MotionEvent(
+                camera_id=spec.get("camera_id", "test-camera-1"),
+                timestamp=spec.get("timestamp") or _NOW,
+                confidence=spec.get("confidence", 0.85),
+                algorithm_used=spec.get("algorithm", "mog2"),
+                bounding_box=json.dumps(spec["bounding_box"]) if spec.get("bounding_box") else None
+            )
+            for spec in specs
+        ]
+        db_session.add_all(events)
+        db_session.commit()
+        return events
 
-    # AC #1: GET /api/v1/motion-events/export?format=csv endpoint created
-    def test_export_endpoint_returns_200_with_csv_format(self, api_client, db_session):
-        """Test endpoint returns 200 with valid format=csv parameter"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
+    def _parse_csv_response(self, response):
+        """Parse CSV rows from a response line by line"""
+        return list(csv.DictReader(response.iter_lines()))
 
-        response = api_client.get("/api/v1/motion-events/export?format=csv")
+    def _csv_header(self, response):
+        """Column names from the first line of a CSV response"""
+        return next(csv.reader(response.iter_lines()))
 
-        assert response.status_code == 200
-        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    def _csv_first_row(self, response):
+        """First data row of a CSV response, without parsing the rest"""
+        return next(csv.DictReader(response.iter_lines()), None)
 
+
+class TestMotionEventsExport(_ExportTestHelpers):
+    """Test suite for GET /api/v1/motion-events/export endpoint"""
+
+    # AC #1: GET /api/v1/motion-events/export?format=csv endpoint created
     def test_export_endpoint_returns_422_with_invalid_format(self, api_client):
         """Test endpoint returns 422 with invalid format parameter"""
         response = api_client.get("/api/v1/motion-events/export?format=json")
@@ -83,22 +187,6 @@ class TestMotionEventsExport:
         assert response.status_code == 422
 
     # AC #2: CSV columns include required fields
-    def test_csv_contains_all_required_columns(self, api_client, db_session):
-        """Test CSV contains all required columns in correct order"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv")
-
-        rows = self._parse_csv_response(response.text)
-        assert len(rows) == 1
-
-        expected_columns = [
-            "timestamp", "camera_id", "camera_name", "confidence",
-            "algorithm", "x", "y", "width", "height", "zone_id"
-        ]
-        assert list(rows[0].keys()) == expected_columns
-
     def test_csv_camera_name_from_camera_table(self, api_client, db_session):
         """Test camera_name is populated from Camera table join"""
         camera = self._create_camera(db_session, camera_id="cam-1", name="Backyard Camera")
@@ -106,15 +194,15 @@ class TestMotionEventsExport:
 
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["camera_name"] == "Backyard Camera"
+        row = self._csv_first_row(response)
+        assert row["camera_name"] == "Backyard Camera"
 
     def test_csv_camera_name_fallback_to_id_if_camera_deleted(self, api_client, db_session):
         """Test camera_name uses camera_id as fallback if camera not found"""
         # Create motion event without corresponding camera
         event = MotionEvent(
             camera_id="deleted-camera-id",
-            timestamp=datetime.now(timezone.utc),
+            timestamp=_NOW,
             confidence=0.75,
             algorithm_used="mog2"
         )
@@ -123,35 +211,21 @@ class TestMotionEventsExport:
 
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["camera_name"] == "deleted-camera-id"
+        row = self._csv_first_row(response)
+        assert row["camera_name"] == "deleted-camera-id"
 
     def test_csv_bounding_box_parsed_correctly(self, api_client, db_session):
         """Test bounding_box JSON is parsed correctly into x,y,width,height columns"""
         self._create_camera(db_session)
-        bbox = {"x": 100, "y": 200, "width": 50, "height": 75}
-        self._create_motion_event(db_session, bounding_box=bbox)
+        self._create_motion_event(db_session, bounding_box=_SAMPLE_BBOX)
 
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["x"] == "100"
-        assert rows[0]["y"] == "200"
-        assert rows[0]["width"] == "50"
-        assert rows[0]["height"] == "75"
-
-    def test_csv_handles_null_bounding_box(self, api_client, db_session):
-        """Test null bounding_box results in empty strings"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session, bounding_box=None)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv")
-
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["x"] == ""
-        assert rows[0]["y"] == ""
-        assert rows[0]["width"] == ""
-        assert rows[0]["height"] == ""
+        row = self._csv_first_row(response)
+        assert row["x"] == "100"
+        assert row["y"] == "200"
+        assert row["width"] == "50"
+        assert row["height"] == "75"
 
     def test_csv_confidence_and_algorithm_values(self, api_client, db_session):
         """Test confidence and algorithm values are correctly exported"""
@@ -160,29 +234,25 @@ class TestMotionEventsExport:
 
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["confidence"] == "0.92"
-        assert rows[0]["algorithm"] == "knn"
+        row = self._csv_first_row(response)
+        assert row["confidence"] == "0.92"
+        assert row["algorithm"] == "knn"
 
     # AC #3: Date range filtering
     def test_start_date_filter_excludes_earlier_events(self, api_client, db_session):
         """Test start_date filter excludes events before date"""
         self._create_camera(db_session)
 
-        # Event before filter date (should be excluded)
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        # Event on filter date (should be included)
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)
-        )
+        self._create_motion_events(db_session, [
+            # Event before filter date (should be excluded)
+            {"timestamp": datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)},
+            # Event on filter date (should be included)
+            {"timestamp": datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)},
+        ])
 
         response = api_client.get("/api/v1/motion-events/export?format=csv&start_date=2025-12-10")
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 1
         assert "2025-12-10" in rows[0]["timestamp"]
 
@@ -190,20 +260,16 @@ class TestMotionEventsExport:
         """Test end_date filter excludes events after date"""
         self._create_camera(db_session)
 
-        # Event before filter date (should be included)
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 5, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        # Event after filter date (should be excluded)
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)
-        )
+        self._create_motion_events(db_session, [
+            # Event before filter date (should be included)
+            {"timestamp": datetime(2025, 12, 5, 10, 0, 0, tzinfo=timezone.utc)},
+            # Event after filter date (should be excluded)
+            {"timestamp": datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)},
+        ])
 
         response = api_client.get("/api/v1/motion-events/export?format=csv&end_date=2025-12-10")
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 1
         assert "2025-12-05" in rows[0]["timestamp"]
 
@@ -211,30 +277,20 @@ class TestMotionEventsExport:
         """Test combined start_date and end_date filters"""
         self._create_camera(db_session)
 
-        # Events outside range
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 20, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        # Events inside range
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)
-        )
+        self._create_motion_events(db_session, [
+            # Events outside range
+            {"timestamp": datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)},
+            {"timestamp": datetime(2025, 12, 20, 10, 0, 0, tzinfo=timezone.utc)},
+            # Events inside range
+            {"timestamp": datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)},
+            {"timestamp": datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)},
+        ])
 
         response = api_client.get(
             "/api/v1/motion-events/export?format=csv&start_date=2025-12-05&end_date=2025-12-16"
         )
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 2
 
     # AC #4: Camera filtering
@@ -243,12 +299,14 @@ class TestMotionEventsExport:
         self._create_camera(db_session, camera_id="camera-1", name="Camera 1")
         self._create_camera(db_session, camera_id="camera-2", name="Camera 2")
 
-        self._create_motion_event(db_session, camera_id="camera-1")
-        self._create_motion_event(db_session, camera_id="camera-2")
+        self._create_motion_events(db_session, [
+            {"camera_id": "camera-1"},
+            {"camera_id": "camera-2"},
+        ])
 
         response = api_client.get("/api/v1/motion-events/export?format=csv&camera_id=camera-1")
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 1
         assert rows[0]["camera_id"] == "camera-1"
 
@@ -257,119 +315,49 @@ class TestMotionEventsExport:
         self._create_camera(db_session, camera_id="camera-1", name="Camera 1")
         self._create_camera(db_session, camera_id="camera-2", name="Camera 2")
 
-        # Camera 1, in date range
-        self._create_motion_event(
-            db_session,
-            camera_id="camera-1",
-            timestamp=datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        # Camera 1, out of date range
-        self._create_motion_event(
-            db_session,
-            camera_id="camera-1",
-            timestamp=datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        # Camera 2, in date range
-        self._create_motion_event(
-            db_session,
-            camera_id="camera-2",
-            timestamp=datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)
-        )
+        self._create_motion_events(db_session, [
+            # Camera 1, in date range
+            {"camera_id": "camera-1", "timestamp": datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)},
+            # Camera 1, out of date range
+            {"camera_id": "camera-1", "timestamp": datetime(2025, 12, 1, 10, 0, 0, tzinfo=timezone.utc)},
+            # Camera 2, in date range
+            {"camera_id": "camera-2", "timestamp": datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)},
+        ])
 
         response = api_client.get(
             "/api/v1/motion-events/export?format=csv&camera_id=camera-1&start_date=2025-12-05"
         )
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 1
         assert rows[0]["camera_id"] == "camera-1"
 
-    # AC #5: Streaming response
-    def test_streaming_response_headers(self, api_client, db_session):
-        """Test streaming response has correct Content-Type header"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv")
-
-        assert "text/csv" in response.headers["content-type"]
-
-    # AC #6: Filename includes date range
-    def test_filename_includes_date_range_when_filtered(self, api_client, db_session):
-        """Test filename includes date range when filters applied"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get(
-            "/api/v1/motion-events/export?format=csv&start_date=2025-12-01&end_date=2025-12-17"
-        )
-
-        content_disposition = response.headers.get("content-disposition", "")
-        assert "motion_events_2025-12-01_2025-12-17.csv" in content_disposition
-
-    def test_filename_uses_all_when_no_date_filters(self, api_client, db_session):
-        """Test filename uses 'all' when no date filters"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv")
-
-        content_disposition = response.headers.get("content-disposition", "")
-        assert "motion_events_all.csv" in content_disposition
-
-    def test_filename_with_start_date_only(self, api_client, db_session):
-        """Test filename format when only start_date provided"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv&start_date=2025-12-01")
-
-        content_disposition = response.headers.get("content-disposition", "")
-        assert "motion_events_2025-12-01_latest.csv" in content_disposition
-
-    def test_filename_with_end_date_only(self, api_client, db_session):
-        """Test filename format when only end_date provided"""
-        self._create_camera(db_session)
-        self._create_motion_event(db_session)
-
-        response = api_client.get("/api/v1/motion-events/export?format=csv&end_date=2025-12-17")
-
-        content_disposition = response.headers.get("content-disposition", "")
-        assert "motion_events_earliest_2025-12-17.csv" in content_disposition
-
     # Edge cases
     def test_empty_result_set(self, api_client, db_session):
         """Test export with empty result set returns headers only"""
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
         assert response.status_code == 200
-        rows = self._parse_csv_response(response.text)
-        assert len(rows) == 0
+        assert self._csv_first_row(response) is None
         # Verify headers are still present
-        assert "timestamp" in response.text
-        assert "camera_id" in response.text
+        header = self._csv_header(response)
+        assert "timestamp" in header
+        assert "camera_id" in header
 
     def test_export_with_multiple_events_in_order(self, api_client, db_session):
         """Test multiple events are exported in timestamp order"""
         self._create_camera(db_session)
 
         # Create events out of order
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)
-        )
-        self._create_motion_event(
-            db_session,
-            timestamp=datetime(2025, 12, 12, 10, 0, 0, tzinfo=timezone.utc)
-        )
+        self._create_motion_events(db_session, [
+            {"timestamp": datetime(2025, 12, 15, 10, 0, 0, tzinfo=timezone.utc)},
+            {"timestamp": datetime(2025, 12, 10, 10, 0, 0, tzinfo=timezone.utc)},
+            {"timestamp": datetime(2025, 12, 12, 10, 0, 0, tzinfo=timezone.utc)},
+        ])
 
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
-        rows = self._parse_csv_response(response.text)
+        rows = self._parse_csv_response(response)
         assert len(rows) == 3
         # Should be ordered by timestamp ascending
         assert "2025-12-10" in rows[0]["timestamp"]
@@ -382,7 +370,7 @@ class TestMotionEventsExport:
 
         event = MotionEvent(
             camera_id="test-camera-1",
-            timestamp=datetime.now(timezone.utc),
+            timestamp=_NOW,
             confidence=0.85,
             algorithm_used="mog2",
             bounding_box="not valid json"  # Invalid JSON
@@ -393,6 +381,107 @@ class TestMotionEventsExport:
         response = api_client.get("/api/v1/motion-events/export?format=csv")
 
         assert response.status_code == 200
-        rows = self._parse_csv_response(response.text)
-        assert rows[0]["x"] == ""
-        assert rows[0]["y"] == ""
+        row = self._csv_first_row(response)
+        assert row["x"] == ""
+        assert row["y"] == ""
+
+
+class TestMotionEventsExportSingleEvent(_ExportTestHelpers):
+    """Read-only export tests sharing one camera and one motion event"""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def one_event_connection(cls, export_engine):
+        """Connection whose outer transaction spans the whole class"""
+        connection = export_engine.connect()
+        transaction = connection.begin()
+        yield connection
+        transaction.rollback()
+        connection.close()
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def one_event(cls, one_event_connection):
+        """Insert the shared camera and motion event once for the class"""
+        session = Session(
+            bind=one_event_connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False
+        )
+        helpers = cls()
+        camera = helpers._create_camera(session)
+        event = helpers._create_motion_event(session)
+        session.close()
+        yield camera, event
+
+    @pytest.fixture
+    def export_connection(self, one_event_connection, one_event):
+        """Roll each test back to a SAVEPOINT taken after the shared rows"""
+        savepoint = one_event_connection.begin_nested()
+        yield one_event_connection
+        savepoint.rollback()
+
+    # AC #1: GET /api/v1/motion-events/export?format=csv endpoint created
+    def test_export_endpoint_returns_200_with_csv_format(self, api_client, one_event):
+        """Test endpoint returns 200 with valid format=csv parameter"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/csv; charset=utf-8"
+
+    # AC #2: CSV columns include required fields
+    def test_csv_contains_all_required_columns(self, api_client, one_event):
+        """Test CSV contains all required columns in correct order"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv")
+
+        rows = self._parse_csv_response(response)
+        assert len(rows) == 1
+        assert list(rows[0].keys()) == _EXPECTED_COLUMNS
+
+    def test_csv_handles_null_bounding_box(self, api_client, one_event):
+        """Test null bounding_box results in empty strings"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv")
+
+        row = self._csv_first_row(response)
+        assert row["x"] == ""
+        assert row["y"] == ""
+        assert row["width"] == ""
+        assert row["height"] == ""
+
+    # AC #5: Streaming response
+    def test_streaming_response_headers(self, api_client, one_event):
+        """Test streaming response has correct Content-Type header"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv")
+
+        assert "text/csv" in response.headers["content-type"]
+
+    # AC #6: Filename includes date range
+    def test_filename_includes_date_range_when_filtered(self, api_client, one_event):
+        """Test filename includes date range when filters applied"""
+        response = api_client.get(
+            "/api/v1/motion-events/export?format=csv&start_date=2025-12-01&end_date=2025-12-17"
+        )
+
+        content_disposition = response.headers.get("content-disposition", "")
+        assert "motion_events_2025-12-01_2025-12-17.csv" in content_disposition
+
+    def test_filename_uses_all_when_no_date_filters(self, api_client, one_event):
+        """Test filename uses 'all' when no date filters"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv")
+
+        content_disposition = response.headers.get("content-disposition", "")
+        assert "motion_events_all.csv" in content_disposition
+
+    def test_filename_with_start_date_only(self, api_client, one_event):
+        """Test filename format when only start_date provided"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv&start_date=2025-12-01")
+
+        content_disposition = response.headers.get("content-disposition", "")
+        assert "motion_events_2025-12-01_latest.csv" in content_disposition
+
+    def test_filename_with_end_date_only(self, api_client, one_event):
+        """Test filename format when only end_date provided"""
+        response = api_client.get("/api/v1/motion-events/export?format=csv&end_date=2025-12-17")
+
+        content_disposition = response.headers.get("content-disposition", "")
+        assert "motion_events_earliest_2025-12-17.csv" in content_disposition
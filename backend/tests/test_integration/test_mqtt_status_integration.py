@@ -8,6 +8,7 @@ End-to-end tests verifying:
 - Startup publishes initial camera states
 """
 import asyncio
+import json
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -29,6 +30,7 @@ class TestStatusSensorIntegration:
         service._config.topic_prefix = "liveobject"
         service._config.qos = 1
         service.publish = AsyncMock(return_value=True)
+        service.publish_nowait = MagicMock(return_value=MagicMock())
         service.publish_camera_status = AsyncMock(return_value=True)
         service.publish_last_event_timestamp = AsyncMock(return_value=True)
         service.publish_event_counts = AsyncMock(return_value=True)
@@ -55,33 +57,33 @@ class TestStatusSensorIntegration:
         mock_config.topic_prefix = "liveobject"
 
         # Create service with mocked MQTT using patch
-        with patch('app.services.mqtt_discovery_service.get_mqtt_service', return_value=mock_mqtt_service):
-            with patch('app.services.mqtt_discovery_service.SessionLocal'):
+        with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt_service):
+            with patch('app.core.database.SessionLocal'):
                 service = MQTTDiscoveryService()
                 result = await service.publish_discovery_config(mock_camera, mock_config)
 
         # Verify result
         assert result is True
 
-        # Verify publish was called 6 times (one for each sensor type)
-        assert mock_mqtt_service.publish.call_count == 6
-
-        # Verify topics for each sensor type
-        call_topics = [
-            call[1]["topic"] for call in mock_mqtt_service.publish.call_args_list
-        ]
-
-        expected_topic_patterns = [
-            "homeassistant/sensor/liveobject_test-camera-integration_event/config",
-            "homeassistant/sensor/liveobject_test-camera-integration_status/config",
-            "homeassistant/sensor/liveobject_test-camera-integration_last_event/config",
-            "homeassistant/sensor/liveobject_test-camera-integration_events_today/config",
-            "homeassistant/sensor/liveobject_test-camera-integration_events_week/config",
-            "homeassistant/binary_sensor/liveobject_test-camera-integration_activity/config",
-        ]
-
-        for expected in expected_topic_patterns:
-            assert expected in call_topics, f"Expected topic {expected} not found in {call_topics}"
+        # Verify one device-based message was published
+        assert mock_mqtt_service.publish_nowait.call_count == 1
+        call_kwargs = mock_mqtt_service.publish_nowait.call_args[1]
+        assert call_kwargs["topic"] == "homeassistant/device/liveobject_test-camera-integration/config"
+
+        # Verify the device carries a component for each sensor type
+        components = json.loads(call_kwargs["payload"])["components"]
+        expected_components = {
+            "liveobject_test-camera-integration_event": "sensor",
+            "liveobject_test-camera-integration_status": "sensor",
+            "liveobject_test-camera-integration_last_event": "sensor",
+            "liveobject_test-camera-integration_events_today": "sensor",
+            "liveobject_test-camera-integration_events_week": "sensor",
+            "liveobject_test-camera-integration_activity": "binary_sensor",
+        }
+
+        for unique_id, platform in expected_components.items():
+            assert unique_id in components, f"Expected component {unique_id} not found in {list(components)}"
+            assert components[unique_id]["platform"] == platform
 
     @pytest.mark.asyncio
     async def test_status_publish_on_camera_connect(self, mock_mqtt_service):
@@ -135,8 +137,8 @@ class TestStatusSensorIntegration:
         # Create service with mocked MQTT
         camera_id = "test-removal-camera"
 
-        with patch('app.services.mqtt_discovery_service.get_mqtt_service', return_value=mock_mqtt_service):
-            with patch('app.services.mqtt_discovery_service.SessionLocal'):
+        with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt_service):
+            with patch('app.core.database.SessionLocal'):
                 service = MQTTDiscoveryService()
                 # Add camera to tracking set
                 service._published_cameras.add(camera_id)
@@ -150,8 +152,8 @@ class TestStatusSensorIntegration:
         # Verify camera removed from tracking
         assert camera_id not in service._published_cameras
 
-        # Verify empty payload published to all 6 topics
-        assert mock_mqtt_service._client.publish.call_count == 6
+        # Verify empty payload published to the device topic and all 6 legacy topics
+        assert mock_mqtt_service._client.publish.call_count == 7
 
     @pytest.mark.asyncio
     async def test_activity_timeout_integration(self, mock_mqtt_service):
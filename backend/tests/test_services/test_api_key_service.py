@@ -11,11 +11,18 @@ This test module provides comprehensive coverage for:
 """
 import pytest
 import bcrypt
+import threading
 from datetime import datetime, timezone, timedelta
-from unittest.mock import MagicMock, patch, PropertyMock
+from functools import lru_cache
+from types import SimpleNamespace
+from unittest.mock import MagicMock, call, patch, PropertyMock
 from sqlalchemy.orm import Session
 
-from app.services.api_key_service import APIKeyService, get_api_key_service
+from app.services.api_key_service import (
+    APIKeyService,
+    get_api_key_service,
+    reset_api_key_service,
+)
 from app.models.api_key import APIKey
 from app.schemas.api_key import VALID_SCOPES
 
@@ -25,9 +32,53 @@ from app.schemas.api_key import VALID_SCOPES
 # =============================================================================
 
 
+# One low-cost salt for every hash built in this module; reusing it is fine
+# because each hash is only checked against a fixed plaintext
+_TEST_SALT = bcrypt.gensalt(rounds=4)
+
+
+@lru_cache(maxsize=128)
+def _default_key_hash(prefix: str) -> str:
+    """Hash of a placeholder key for prefix, computed once per prefix."""
+    return bcrypt.hashpw(
+        f"argus_{prefix}extradata12345678901234".encode('utf-8'),
+        _TEST_SALT
+    ).decode('utf-8')
+
+
+def _stub_query(db, *chain: str, result):
+    """Make db.query(...).<chain...>() return result; returns the last mock."""
+    node = db.query.return_value
+    for step in chain[:-1]:
+        node = getattr(node, step).return_value
+    leaf = getattr(node, chain[-1])
+    leaf.return_value = result
+    return leaf
+
+
+@pytest.fixture(scope="module")
+def canonical_bcrypt_pair():
+    """A test key and its bcrypt hash, hashed once for the module."""
+    plaintext = "argus_testpref12345678901234567890123456"
+    return plaintext, bcrypt.hashpw(plaintext.encode('utf-8'), _TEST_SALT).decode('utf-8')
+
+
+@pytest.fixture(scope="module")
+def mismatched_bcrypt_hash():
+    """Hash of a different key sharing the canonical key's prefix."""
+    return bcrypt.hashpw(b"argus_testpref99999999999999999999999999", _TEST_SALT).decode('utf-8')
+
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    """Hash generated keys with the minimum bcrypt work factor."""
+    monkeypatch.setattr(APIKeyService, "BCRYPT_ROUNDS", 4)
+
+
 @pytest.fixture
 def api_key_service():
     """Create a fresh APIKeyService instance for each test."""
+    reset_api_key_service()
     return APIKeyService()
 
 
@@ -46,6 +97,7 @@ def mock_api_key_factory():
         name: str = "Test Key",
         prefix: str = "testpref",
         key_hash: str = None,
+        selector: str = None,
         scopes: list = None,
         is_active: bool = True,
         expires_at: datetime = None,
@@ -58,34 +110,31 @@ def mock_api_key_factory():
         revoked_at: datetime = None,
         revoked_by: str = None,
     ):
-        api_key = MagicMock(spec=APIKey)
-        api_key.id = id
-        api_key.name = name
-        api_key.prefix = prefix
-        api_key.key_hash = key_hash or bcrypt.hashpw(
-            f"argus_{prefix}extradata12345678901234".encode('utf-8'),
-            bcrypt.gensalt(rounds=4)  # Lower rounds for faster tests
-        ).decode('utf-8')
-        api_key.scopes = scopes or ["read:events"]
-        api_key.is_active = is_active
-        api_key.expires_at = expires_at
-        api_key.last_used_at = last_used_at
-        api_key.last_used_ip = last_used_ip
-        api_key.usage_count = usage_count
-        api_key.rate_limit_per_minute = rate_limit_per_minute
-        api_key.created_at = created_at or datetime.now(timezone.utc)
-        api_key.created_by = created_by
-        api_key.revoked_at = revoked_at
-        api_key.revoked_by = revoked_by
-
-        # Mock methods
-        api_key.is_expired = MagicMock(return_value=False)
-        api_key.is_valid = MagicMock(return_value=is_active)
-        api_key.has_scope = MagicMock(side_effect=lambda s: s in (scopes or ["read:events"]))
-        api_key.record_usage = MagicMock()
-        api_key.revoke = MagicMock()
-
-        return api_key
+        scopes = scopes or ["read:events"]
+        return SimpleNamespace(
+            id=id,
+            name=name,
+            prefix=prefix,
+            key_hash=key_hash or _default_key_hash(prefix),
+            selector=selector,
+            scopes=scopes,
+            is_active=is_active,
+            expires_at=expires_at,
+            last_used_at=last_used_at,
+            last_used_ip=last_used_ip,
+            usage_count=usage_count,
+            rate_limit_per_minute=rate_limit_per_minute,
+            created_at=created_at or datetime.now(timezone.utc),
+            created_by=created_by,
+            revoked_at=revoked_at,
+            revoked_by=revoked_by,
+            is_valid=lambda: is_active,
+            has_scope=lambda s: s in scopes,
+            # Mocks only for methods tests configure or assert on
+            is_expired=MagicMock(return_value=False),
+            record_usage=MagicMock(),
+            revoke=MagicMock(),
+        )
     return _create
 
 
@@ -99,9 +148,7 @@ class TestAPIKeyServiceSingleton:
 
     def test_get_api_key_service_returns_singleton(self):
         """Test that get_api_key_service returns same instance."""
-        # Reset singleton state
-        import app.services.api_key_service as module
-        module._api_key_service = None
+        reset_api_key_service()
 
         service1 = get_api_key_service()
         service2 = get_api_key_service()
@@ -170,6 +217,17 @@ class TestGenerateAPIKey:
             api_key.key_hash.encode('utf-8')
         )
 
+    def test_generate_key_stores_selector(self, api_key_service, mock_db_session):
+        """Test that the selector is the lookup digest of the plaintext."""
+        api_key, plaintext = api_key_service.generate_api_key(
+            db=mock_db_session,
+            name="Test Key",
+            scopes=["read:events"],
+        )
+
+        assert api_key.selector == APIKeyService._selector(plaintext)
+        assert len(api_key.selector) == 32
+
     def test_generate_key_stores_in_db(self, api_key_service, mock_db_session):
         """Test that APIKey model is added and committed to database."""
         api_key, plaintext = api_key_service.generate_api_key(
@@ -270,21 +328,19 @@ class TestGenerateAPIKey:
 class TestVerifyKey:
     """Tests for API key verification."""
 
-    def test_verify_key_success(self, api_key_service, mock_db_session, mock_api_key_factory):
+    def test_verify_key_success(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
         """Test that valid key returns APIKey model."""
         # Create a real key to test against
-        plaintext = "argus_testpref12345678901234567890123456"
-        key_hash = bcrypt.hashpw(
-            plaintext.encode('utf-8'),
-            bcrypt.gensalt(rounds=4)
-        ).decode('utf-8')
+        plaintext, key_hash = canonical_bcrypt_pair
 
         mock_api_key = mock_api_key_factory(
             prefix="testpref",
             key_hash=key_hash,
         )
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         result = api_key_service.verify_key(mock_db_session, plaintext)
 
@@ -305,9 +361,19 @@ class TestVerifyKey:
         assert result is None
         mock_db_session.query.assert_not_called()
 
+    def test_verify_key_non_ascii_prefix(self, api_key_service, mock_db_session):
+        """Test that a non-ASCII prefix is rejected without raising."""
+        result = api_key_service.verify_key(
+            mock_db_session,
+            "ärgus_testpref12345678901234567890123456"
+        )
+
+        assert result is None
+        mock_db_session.query.assert_not_called()
+
     def test_verify_key_no_matching_prefix(self, api_key_service, mock_db_session):
         """Test that non-existent prefix returns None."""
-        mock_db_session.query.return_value.filter.return_value.all.return_value = []
+        _stub_query(mock_db_session, "filter", "all", result=[])
 
         result = api_key_service.verify_key(
             mock_db_session,
@@ -316,19 +382,17 @@ class TestVerifyKey:
 
         assert result is None
 
-    def test_verify_key_hash_mismatch(self, api_key_service, mock_db_session, mock_api_key_factory):
+    def test_verify_key_hash_mismatch(
+        self, api_key_service, mock_db_session, mock_api_key_factory, mismatched_bcrypt_hash
+    ):
         """Test that wrong key with same prefix returns None."""
         # Create a key with a different hash
-        different_key = "argus_testpref99999999999999999999999999"
         mock_api_key = mock_api_key_factory(
             prefix="testpref",
-            key_hash=bcrypt.hashpw(
-                different_key.encode('utf-8'),
-                bcrypt.gensalt(rounds=4)
-            ).decode('utf-8'),
+            key_hash=mismatched_bcrypt_hash,
         )
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         # Try to verify with a different plaintext
         result = api_key_service.verify_key(
@@ -338,13 +402,11 @@ class TestVerifyKey:
 
         assert result is None
 
-    def test_verify_key_expired(self, api_key_service, mock_db_session, mock_api_key_factory):
+    def test_verify_key_expired(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
         """Test that expired key returns None."""
-        plaintext = "argus_testpref12345678901234567890123456"
-        key_hash = bcrypt.hashpw(
-            plaintext.encode('utf-8'),
-            bcrypt.gensalt(rounds=4)
-        ).decode('utf-8')
+        plaintext, key_hash = canonical_bcrypt_pair
 
         mock_api_key = mock_api_key_factory(
             prefix="testpref",
@@ -353,7 +415,7 @@ class TestVerifyKey:
         )
         mock_api_key.is_expired.return_value = True
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         result = api_key_service.verify_key(mock_db_session, plaintext)
 
@@ -362,7 +424,7 @@ class TestVerifyKey:
     def test_verify_key_revoked(self, api_key_service, mock_db_session, mock_api_key_factory):
         """Test that revoked (inactive) key is not returned by query."""
         # The query filters for is_active=True, so revoked keys won't be returned
-        mock_db_session.query.return_value.filter.return_value.all.return_value = []
+        _stub_query(mock_db_session, "filter", "all", result=[])
 
         result = api_key_service.verify_key(
             mock_db_session,
@@ -378,7 +440,7 @@ class TestVerifyKey:
             key_hash="invalid_not_a_bcrypt_hash",
         )
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         # Should not raise, just return None
         result = api_key_service.verify_key(
@@ -388,37 +450,117 @@ class TestVerifyKey:
 
         assert result is None
 
-    def test_verify_key_multiple_potential_matches(self, api_key_service, mock_db_session, mock_api_key_factory):
+    def test_verify_key_multiple_potential_matches(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
         """Test verification when multiple keys share same prefix."""
-        plaintext = "argus_testpref12345678901234567890123456"
-        correct_hash = bcrypt.hashpw(
-            plaintext.encode('utf-8'),
-            bcrypt.gensalt(rounds=4)
-        ).decode('utf-8')
+        plaintext, correct_hash = canonical_bcrypt_pair
 
         mock_key1 = mock_api_key_factory(
             id="key1",
             prefix="testpref",
-            key_hash=bcrypt.hashpw(b"argus_testpref_wrong_key_1", bcrypt.gensalt(rounds=4)).decode('utf-8'),
+            key_hash=bcrypt.hashpw(b"argus_testpref_wrong_key_1", _TEST_SALT).decode('utf-8'),
+            selector=APIKeyService._selector("argus_testpref_wrong_key_1"),
         )
         mock_key2 = mock_api_key_factory(
             id="key2",
             prefix="testpref",
             key_hash=correct_hash,
+            selector=APIKeyService._selector(plaintext),
         )
         mock_key3 = mock_api_key_factory(
             id="key3",
             prefix="testpref",
-            key_hash=bcrypt.hashpw(b"argus_testpref_wrong_key_3", bcrypt.gensalt(rounds=4)).decode('utf-8'),
+            key_hash=bcrypt.hashpw(b"argus_testpref_wrong_key_3", _TEST_SALT).decode('utf-8'),
+            selector=APIKeyService._selector("argus_testpref_wrong_key_3"),
         )
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [
+        _stub_query(mock_db_session, "filter", "all", result=[
             mock_key1, mock_key2, mock_key3
-        ]
+        ])
 
-        result = api_key_service.verify_key(mock_db_session, plaintext)
+        with patch(
+            "app.services.api_key_service.bcrypt.checkpw", wraps=bcrypt.checkpw
+        ) as checkpw:
+            result = api_key_service.verify_key(mock_db_session, plaintext)
 
         assert result == mock_key2
+        # Only the row whose selector matches is bcrypt-checked
+        assert checkpw.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_averify_key_runs_bcrypt_off_event_loop(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
+        """Test that averify_key matches like verify_key with bcrypt in a worker thread."""
+        plaintext, key_hash = canonical_bcrypt_pair
+        mock_api_key = mock_api_key_factory(
+            prefix="testpref",
+            key_hash=key_hash,
+        )
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
+
+        checkpw_threads = []
+        real_checkpw = bcrypt.checkpw
+
+        def recording_checkpw(password, hashed):
+            checkpw_threads.append(threading.get_ident())
+            return real_checkpw(password, hashed)
+
+        with patch("app.services.api_key_service.bcrypt.checkpw", side_effect=recording_checkpw):
+            result = await api_key_service.averify_key(mock_db_session, plaintext)
+
+        assert result == mock_api_key
+        assert checkpw_threads and threading.get_ident() not in checkpw_threads
+
+    @pytest.mark.asyncio
+    async def test_averify_key_wrong_prefix_format(self, api_key_service, mock_db_session):
+        """Test that averify_key rejects malformed keys without a query."""
+        result = await api_key_service.averify_key(mock_db_session, "invalid_key_format")
+
+        assert result is None
+        mock_db_session.query.assert_not_called()
+
+    def test_verify_key_cached_skips_bcrypt(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
+        """Test that a repeat verification is served from cache without bcrypt."""
+        plaintext, key_hash = canonical_bcrypt_pair
+        mock_api_key = mock_api_key_factory(
+            prefix="testpref",
+            key_hash=key_hash,
+        )
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
+        mock_db_session.get.return_value = mock_api_key
+
+        assert api_key_service.verify_key(mock_db_session, plaintext) == mock_api_key
+
+        with patch(
+            "app.services.api_key_service.bcrypt.checkpw",
+            side_effect=AssertionError("bcrypt should not run on a cache hit"),
+        ):
+            result = api_key_service.verify_key(mock_db_session, plaintext)
+
+        assert result == mock_api_key
+        mock_db_session.get.assert_called_once_with(APIKey, mock_api_key.id)
+
+    def test_verify_key_cache_rechecks_revocation(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
+        """Test that a cached key revoked since is rejected."""
+        plaintext, key_hash = canonical_bcrypt_pair
+        mock_api_key = mock_api_key_factory(
+            prefix="testpref",
+            key_hash=key_hash,
+        )
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
+        assert api_key_service.verify_key(mock_db_session, plaintext) == mock_api_key
+
+        mock_api_key.is_active = False
+        mock_db_session.get.return_value = mock_api_key
+        _stub_query(mock_db_session, "filter", "all", result=[])
+
+        assert api_key_service.verify_key(mock_db_session, plaintext) is None
 
 
 # =============================================================================
@@ -431,7 +573,7 @@ class TestListKeys:
 
     def test_list_keys_empty(self, api_key_service, mock_db_session):
         """Test that empty list is returned when no keys exist."""
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = []
+        _stub_query(mock_db_session, "filter", "order_by", "all", result=[])
 
         result = api_key_service.list_keys(mock_db_session)
 
@@ -441,7 +583,7 @@ class TestListKeys:
         """Test that default excludes revoked keys."""
         active_key = mock_api_key_factory(id="active", is_active=True)
 
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [active_key]
+        _stub_query(mock_db_session, "filter", "order_by", "all", result=[active_key])
 
         result = api_key_service.list_keys(mock_db_session, include_revoked=False)
 
@@ -455,7 +597,7 @@ class TestListKeys:
         active_key = mock_api_key_factory(id="active", is_active=True)
         revoked_key = mock_api_key_factory(id="revoked", is_active=False)
 
-        mock_db_session.query.return_value.order_by.return_value.all.return_value = [active_key, revoked_key]
+        _stub_query(mock_db_session, "order_by", "all", result=[active_key, revoked_key])
 
         result = api_key_service.list_keys(mock_db_session, include_revoked=True)
 
@@ -473,9 +615,9 @@ class TestListKeys:
         )
 
         # Mock returns in correct order (newest first)
-        mock_db_session.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+        _stub_query(mock_db_session, "filter", "order_by", "all", result=[
             new_key, old_key
-        ]
+        ])
 
         result = api_key_service.list_keys(mock_db_session)
 
@@ -485,6 +627,19 @@ class TestListKeys:
         assert result[0].id == "new"
         assert result[1].id == "old"
 
+    def test_list_keys_respects_limit_and_offset(self, api_key_service, mock_db_session, mock_api_key_factory):
+        """Test that limit and offset are applied after ordering."""
+        _stub_query(mock_db_session, "filter", "order_by", "limit", "offset", "all", result=[
+            mock_api_key_factory(id="page")
+        ])
+
+        result = api_key_service.list_keys(mock_db_session, limit=10, offset=20)
+
+        query_calls = mock_db_session.query.mock_calls
+        assert call().filter().order_by().limit(10) in query_calls
+        assert call().filter().order_by().limit().offset(20) in query_calls
+        assert [key.id for key in result] == ["page"]
+
 
 # =============================================================================
 # Test: get_key()
@@ -498,7 +653,7 @@ class TestGetKey:
         """Test that existing key is returned."""
         mock_api_key = mock_api_key_factory(id="test-key-123")
 
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_api_key
+        _stub_query(mock_db_session, "filter", "first", result=mock_api_key)
 
         result = api_key_service.get_key(mock_db_session, "test-key-123")
 
@@ -507,7 +662,7 @@ class TestGetKey:
 
     def test_get_key_not_found(self, api_key_service, mock_db_session):
         """Test that None is returned for non-existent ID."""
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        _stub_query(mock_db_session, "filter", "first", result=None)
 
         result = api_key_service.get_key(mock_db_session, "non-existent-id")
 
@@ -526,7 +681,7 @@ class TestRevokeKey:
         """Test that revoke sets is_active=False and audit fields."""
         mock_api_key = mock_api_key_factory(id="test-key-123", is_active=True)
 
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_api_key
+        _stub_query(mock_db_session, "filter", "first", result=mock_api_key)
 
         result = api_key_service.revoke_key(
             mock_db_session,
@@ -541,7 +696,7 @@ class TestRevokeKey:
 
     def test_revoke_key_not_found(self, api_key_service, mock_db_session):
         """Test that None is returned for non-existent ID."""
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        _stub_query(mock_db_session, "filter", "first", result=None)
 
         result = api_key_service.revoke_key(mock_db_session, "non-existent-id")
 
@@ -552,7 +707,7 @@ class TestRevokeKey:
         """Test that revoked key returns None on verify (filtered by is_active)."""
         # After revocation, the key has is_active=False
         # verify_key queries filter for is_active=True, so revoked keys are excluded
-        mock_db_session.query.return_value.filter.return_value.all.return_value = []
+        _stub_query(mock_db_session, "filter", "all", result=[])
 
         result = api_key_service.verify_key(
             mock_db_session,
@@ -672,7 +827,7 @@ class TestEdgeCases:
             prefix=api_key.prefix,
             key_hash=api_key.key_hash,
         )
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         # Verify the key
         result = api_key_service.verify_key(mock_db_session, plaintext)
@@ -706,19 +861,21 @@ class TestIntegrationScenarios:
             key_hash=api_key.key_hash,
             is_active=True,
         )
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         result = api_key_service.verify_key(mock_db_session, plaintext)
         assert result == mock_api_key
 
         # Step 3: Revoke key
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_api_key
+        _stub_query(mock_db_session, "filter", "first", result=mock_api_key)
         api_key_service.revoke_key(mock_db_session, mock_api_key.id, revoked_by="admin")
 
         mock_api_key.revoke.assert_called_once()
 
         # Step 4: Verify key no longer works (filtered out by is_active=True)
-        mock_db_session.query.return_value.filter.return_value.all.return_value = []
+        mock_api_key.is_active = False
+        mock_db_session.get.return_value = mock_api_key
+        _stub_query(mock_db_session, "filter", "all", result=[])
 
         result = api_key_service.verify_key(mock_db_session, plaintext)
         assert result is None
@@ -745,12 +902,13 @@ class TestIntegrationScenarios:
         for (api_key, _), expected_scopes in zip(keys, scopes_list):
             assert api_key.scopes == expected_scopes
 
-    def test_key_with_expiration_in_future(self, api_key_service, mock_db_session, mock_api_key_factory):
+    def test_key_with_expiration_in_future(
+        self, api_key_service, mock_db_session, mock_api_key_factory, canonical_bcrypt_pair
+    ):
         """Test that key with future expiration is valid."""
         future_expiration = datetime.now(timezone.utc) + timedelta(days=30)
 
-        plaintext = "argus_testpref12345678901234567890123456"
-        key_hash = bcrypt.hashpw(plaintext.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+        plaintext, key_hash = canonical_bcrypt_pair
 
         mock_api_key = mock_api_key_factory(
             prefix="testpref",
@@ -759,7 +917,7 @@ class TestIntegrationScenarios:
         )
         mock_api_key.is_expired.return_value = False
 
-        mock_db_session.query.return_value.filter.return_value.all.return_value = [mock_api_key]
+        _stub_query(mock_db_session, "filter", "all", result=[mock_api_key])
 
         result = api_key_service.verify_key(mock_db_session, plaintext)
 
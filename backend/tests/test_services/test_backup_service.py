@@ -0,0 +1,77 @@
+"""Unit tests for BackupService restore side effects"""
+import json
+import zipfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models.event_feedback import EventFeedback
+from app.services.backup_service import BackupService
+from app.services.mcp_context import get_mcp_context_provider, reset_mcp_context_provider
+
+
+class TestRestoreRefreshesMCPFeedbackCameras:
+    """Restoring a database must refresh MCP context's feedback-camera set"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        """Point a BackupService at a temporary data directory"""
+        reset_mcp_context_provider()
+
+        self.data_dir = tmp_path / "data"
+        self.data_dir.mkdir()
+        self.database_path = self.data_dir / "app.db"
+
+        self.engine = create_engine(
+            f"sqlite:///{self.database_path}",
+            connect_args={"check_same_thread": False}
+        )
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        self.service = BackupService(session_factory=SessionLocal)
+        self.service.data_dir = self.data_dir
+        self.service.backup_dir = self.data_dir / "backups"
+        self.service.backup_dir.mkdir()
+        self.service.database_path = self.database_path
+        self.service.thumbnails_dir = self.data_dir / "thumbnails"
+
+        yield
+
+        self.engine.dispose()
+        reset_mcp_context_provider()
+
+    def _make_backup_zip(self, tmp_path, camera_id: str):
+        """Build a backup ZIP whose database has feedback for camera_id"""
+        backup_db_path = tmp_path / "database.db"
+        backup_engine = create_engine(f"sqlite:///{backup_db_path}")
+        Base.metadata.create_all(backup_engine)
+        BackupSession = sessionmaker(bind=backup_engine)
+        session = BackupSession()
+        session.add(EventFeedback(event_id="event-1", camera_id=camera_id, rating="helpful"))
+        session.commit()
+        session.close()
+        backup_engine.dispose()
+
+        zip_path = tmp_path / "backup.zip"
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            zf.write(backup_db_path, "database.db")
+            zf.writestr("metadata.json", json.dumps({"app_version": "1.0.0"}))
+        return zip_path
+
+    @pytest.mark.asyncio
+    async def test_restore_reloads_feedback_camera_ids(self, tmp_path):
+        """Cameras with feedback in the restored database are picked up"""
+        provider = get_mcp_context_provider()
+        provider._feedback_camera_ids = set()
+        zip_path = self._make_backup_zip(tmp_path, "camera-restored")
+
+        result = await self.service.restore_from_backup(
+            zip_path,
+            restore_thumbnails=False,
+            restore_settings=False,
+        )
+
+        assert result.success is True
+        assert provider._feedback_camera_ids == {"camera-restored"}
@@ -253,6 +253,30 @@ class TestCleanupService:
         finally:
             db.close()
 
+    @pytest.mark.asyncio
+    async def test_cleanup_invalidates_mcp_feedback_windows(self):
+        """Feedback cascaded away with old events is dropped from MCP context"""
+        from app.services.mcp_context import get_mcp_context_provider, reset_mcp_context_provider
+
+        reset_mcp_context_provider()
+        provider = get_mcp_context_provider()
+        provider._feedback_windows["test-camera-id"] = object()
+        provider._feedback_windows["other-camera-id"] = object()
+
+        db = self.SessionLocal()
+        try:
+            db.add(self._create_test_event("old-0", datetime.now(timezone.utc) - timedelta(days=45)))
+            db.commit()
+
+            stats = await self.cleanup_service.cleanup_old_events(retention_days=30)
+
+            assert stats["events_deleted"] == 1
+            assert "test-camera-id" not in provider._feedback_windows
+            assert "other-camera-id" in provider._feedback_windows
+        finally:
+            db.close()
+            reset_mcp_context_provider()
+
     @pytest.mark.asyncio
     async def test_get_database_size(self):
         """Test database size calculation"""
@@ -149,6 +149,58 @@ class TestEmbeddingGeneration:
         with pytest.raises(Exception):
             await service_with_mock.generate_embedding(b"not an image")
 
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_encodes_batch_in_one_call(self, service_with_mock, test_image_bytes, mock_model):
+        """generate_embeddings runs one batched encode for all images."""
+        import numpy as np
+
+        mock_model.encode.return_value = np.random.randn(3, 512).astype(np.float32)
+
+        embeddings = await service_with_mock.generate_embeddings([test_image_bytes] * 3)
+
+        assert len(embeddings) == 3
+        assert all(len(embedding) == 512 for embedding in embeddings)
+        mock_model.encode.assert_called_once()
+        images = mock_model.encode.call_args[0][0]
+        assert len(images) == 3
+        assert all(image.mode == "RGB" for image in images)
+        assert mock_model.encode.call_args.kwargs["batch_size"] == EmbeddingService.BATCH_SIZE
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_empty_list(self, service_with_mock, mock_model):
+        """An empty batch returns no embeddings without touching the model."""
+        assert await service_with_mock.generate_embeddings([]) == []
+        mock_model.encode.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_empty_bytes_raises(self, service_with_mock, test_image_bytes):
+        """An empty image in the batch raises ValueError."""
+        with pytest.raises(ValueError, match="image_bytes cannot be empty"):
+            await service_with_mock.generate_embeddings([test_image_bytes, b""])
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_from_arrays(self, service_with_mock, mock_model):
+        """Pixel arrays are embedded in one batch without a JPEG round-trip."""
+        import numpy as np
+
+        mock_model.encode.return_value = np.random.randn(2, 512).astype(np.float32)
+        arrays = [np.full((224, 224, 3), 128, dtype=np.uint8)] * 2
+
+        embeddings = await service_with_mock.generate_embeddings_from_arrays(arrays)
+
+        assert len(embeddings) == 2
+        images = mock_model.encode.call_args[0][0]
+        assert [image.mode for image in images] == ["RGB", "RGB"]
+        assert images[0].getpixel((0, 0)) == (128, 128, 128)
+
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_from_empty_array_raises(self, service_with_mock):
+        """An empty array in the batch raises ValueError."""
+        import numpy as np
+
+        with pytest.raises(ValueError, match="image array cannot be empty"):
+            await service_with_mock.generate_embeddings_from_arrays([np.zeros((0, 0, 3), dtype=np.uint8)])
+
     @pytest.mark.asyncio
     async def test_generate_embedding_from_base64(self, service_with_mock, test_image_bytes):
         """Test embedding generation from base64 string (AC10)."""
@@ -22,6 +22,8 @@ from app.services.mcp_context import (
     CachedContext,
     get_mcp_context_provider,
     reset_mcp_context_provider,
+    _EMPTY_FEEDBACK_CONTEXT,
+    _tokenize_correction,
     MCP_CACHE_HITS,
     MCP_CACHE_MISSES,
     MCP_CONTEXT_LATENCY,
@@ -75,6 +77,27 @@ class TestMCPContextProvider:
         provider2 = get_mcp_context_provider()
         assert provider1 is not provider2
 
+    def test_singleton_thread_safe(self):
+        """Test concurrent first calls from threads share one instance."""
+        import threading
+
+        reset_mcp_context_provider()
+        results = []
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            results.append(get_mcp_context_provider())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 8
+        assert all(p is results[0] for p in results)
+
 
 class TestFeedbackContextGathering:
     """Tests for feedback context gathering."""
@@ -137,7 +160,7 @@ class TestFeedbackContextGathering:
         assert context.feedback is not None
         assert context.feedback.accuracy_rate is None
         assert context.feedback.total_feedback == 0
-        assert context.feedback.common_corrections == []
+        assert context.feedback.common_corrections == ()
 
     @pytest.mark.asyncio
     async def test_get_context_all_positive_feedback(self, provider, camera_id):
@@ -217,6 +240,198 @@ class TestFeedbackContextGathering:
         assert context.feedback.accuracy_rate == 0.5
         assert context.feedback.total_feedback == 10
 
+    @pytest.mark.asyncio
+    async def test_feedback_context_skips_query_for_camera_without_feedback(self, provider, camera_id):
+        """Test cameras outside the loaded feedback set skip the feedback query."""
+        provider._feedback_camera_ids = set()
+        mock_db = MagicMock()
+
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert result is _EMPTY_FEEDBACK_CONTEXT
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_feedback_context_queries_when_camera_set_not_loaded(self, provider, camera_id):
+        """Test the feedback query still runs before the camera set is loaded."""
+        assert provider._feedback_camera_ids is None
+
+        mock_db = MagicMock()
+        mock_query = MagicMock()
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.all.return_value = [self._create_mock_feedback(rating="not_helpful")]
+        mock_db.query.return_value = mock_query
+
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        mock_db.query.assert_called_once()
+        assert result.accuracy_rate == 0.0
+        assert result.total_feedback == 1
+
+    def test_empty_feedback_context_is_immutable(self):
+        """Test the shared empty context cannot be mutated by callers."""
+        with pytest.raises(AttributeError):
+            _EMPTY_FEEDBACK_CONTEXT.common_corrections.append("leak")
+        with pytest.raises(Exception):
+            _EMPTY_FEEDBACK_CONTEXT.total_feedback = 1
+
+    @pytest.mark.asyncio
+    async def test_mark_camera_has_feedback_disables_fast_path(self, provider, camera_id):
+        """Test marking a camera with feedback makes the feedback query run."""
+        provider._feedback_camera_ids = set()
+        provider.mark_camera_has_feedback(camera_id)
+
+        mock_db = MagicMock()
+        mock_query = MagicMock()
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.all.return_value = [self._create_mock_feedback(rating="helpful")]
+        mock_db.query.return_value = mock_query
+
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert result.accuracy_rate == 1.0
+        assert result.total_feedback == 1
+
+    def test_load_feedback_camera_ids(self, provider, camera_id):
+        """Test loading the set of cameras with feedback history."""
+        mock_db = MagicMock()
+        mock_db.query.return_value.distinct.return_value.all.return_value = [(camera_id,), (None,)]
+
+        provider.load_feedback_camera_ids(mock_db)
+
+        assert provider._feedback_camera_ids == {camera_id}
+
+    def test_load_feedback_camera_ids_failure_invalidates(self, provider):
+        """Test a failed load leaves the fast path disabled (fail-open)."""
+        provider._feedback_camera_ids = {"stale-camera"}
+        mock_db = MagicMock()
+        mock_db.query.side_effect = Exception("database unavailable")
+
+        provider.load_feedback_camera_ids(mock_db)
+
+        assert provider._feedback_camera_ids is None
+
+    @pytest.mark.asyncio
+    async def test_reload_after_restore_picks_up_restored_cameras(self, provider, camera_id):
+        """Test reloading the camera set after a restore re-enables the feedback query."""
+        provider._feedback_camera_ids = set()
+
+        restored_db = MagicMock()
+        restored_db.query.return_value.distinct.return_value.all.return_value = [(camera_id,)]
+        provider.load_feedback_camera_ids(restored_db)
+
+        mock_db = MagicMock()
+        mock_query = MagicMock()
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.all.return_value = [self._create_mock_feedback(rating="helpful")]
+        mock_db.query.return_value = mock_query
+
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert result.total_feedback == 1
+
+    def test_invalidate_feedback_camera_ids(self, provider, camera_id):
+        """Test invalidation disables the fast path until the next load."""
+        provider._feedback_camera_ids = {camera_id}
+
+        provider.invalidate_feedback_camera_ids()
+
+        assert provider._feedback_camera_ids is None
+
+    def _mock_feedback_db(self, feedbacks):
+        """Build a mock session whose feedback query returns feedbacks (newest first)."""
+        mock_db = MagicMock()
+        mock_query = MagicMock()
+        mock_query.filter.return_value = mock_query
+        mock_query.order_by.return_value = mock_query
+        mock_query.limit.return_value = mock_query
+        mock_query.all.return_value = feedbacks
+        mock_db.query.return_value = mock_query
+        return mock_db
+
+    @pytest.mark.asyncio
+    async def test_feedback_window_built_once(self, provider, camera_id):
+        """Test the feedback query runs only on cold start for a camera."""
+        mock_db = self._mock_feedback_db([self._create_mock_feedback(rating="helpful")])
+
+        await provider._get_feedback_context(mock_db, camera_id)
+        await provider._get_feedback_context(mock_db, camera_id)
+
+        assert mock_db.query.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_record_feedback_updates_window(self, provider, camera_id):
+        """Test new feedback is applied incrementally without re-querying."""
+        mock_db = self._mock_feedback_db([
+            self._create_mock_feedback(rating="not_helpful", correction="delivery truck"),
+            self._create_mock_feedback(rating="not_helpful", correction="delivery van"),
+        ])
+        await provider._get_feedback_context(mock_db, camera_id)
+
+        provider.record_feedback(camera_id, "helpful", "delivery driver")
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert mock_db.query.call_count == 1
+        assert result.total_feedback == 3
+        assert result.accuracy_rate == pytest.approx(1 / 3)
+        assert "delivery" in result.common_corrections
+
+    @pytest.mark.asyncio
+    async def test_feedback_window_evicts_oldest(self, provider, camera_id):
+        """Test the window slides at FEEDBACK_LIMIT and drops evicted tokens."""
+        provider.FEEDBACK_LIMIT = 3
+        mock_db = self._mock_feedback_db([
+            self._create_mock_feedback(rating="not_helpful", correction="raccoon"),
+            self._create_mock_feedback(rating="not_helpful", correction="raccoon"),
+            self._create_mock_feedback(rating="not_helpful", correction="raccoon"),
+        ])
+        first = await provider._get_feedback_context(mock_db, camera_id)
+        assert first.common_corrections == ["raccoon"]
+
+        provider.record_feedback(camera_id, "helpful", "squirrel")
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert result.total_feedback == 3
+        assert result.common_corrections == []
+        window = provider._feedback_windows[camera_id]
+        assert window.term_freq == {"raccoon": 2, "squirrel": 1}
+
+    @pytest.mark.asyncio
+    async def test_window_patterns_match_full_rebuild(self, provider, camera_id):
+        """Test incrementally maintained counts rank patterns like a full rebuild."""
+        corrections = [
+            "delivery truck outside",
+            "package delivery driver",
+            "delivery truck parked",
+            "package left by driver",
+            "truck delivery again",
+        ]
+        mock_db = self._mock_feedback_db([])
+        await provider._get_feedback_context(mock_db, camera_id)
+        for correction in corrections:
+            provider.record_feedback(camera_id, "not_helpful", correction)
+
+        result = await provider._get_feedback_context(mock_db, camera_id)
+
+        assert result.common_corrections == provider._extract_common_patterns(corrections)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_feedback_window_rebuilds_from_db(self, provider, camera_id):
+        """Test invalidating a camera's window forces a fresh query."""
+        mock_db = self._mock_feedback_db([self._create_mock_feedback(rating="helpful")])
+        await provider._get_feedback_context(mock_db, camera_id)
+
+        provider.invalidate_feedback_window(camera_id)
+        await provider._get_feedback_context(mock_db, camera_id)
+
+        assert mock_db.query.call_count == 2
+
 
 class TestPatternExtraction:
     """Tests for common pattern extraction."""
@@ -226,6 +441,14 @@ class TestPatternExtraction:
         """Create a fresh MCPContextProvider instance."""
         return MCPContextProvider()
 
+    def test_tokenize_correction_ascii(self):
+        """Test ASCII corrections split on punctuation and digits."""
+        assert _tokenize_correction("It's a UPS-truck, 2 boxes!") == ["it", "s", "a", "ups", "truck", "boxes"]
+
+    def test_tokenize_correction_non_ascii_uses_regex(self):
+        """Test non-ASCII corrections fall back to the word-boundary regex."""
+        assert _tokenize_correction("Delivery at café door") == ["delivery", "at", "door"]
+
     def test_extract_patterns_empty_list(self, provider):
         """Test pattern extraction with empty list."""
         patterns = provider._extract_common_patterns([])
@@ -325,6 +548,22 @@ class TestPromptFormatting:
         result = provider.format_for_prompt(context)
         assert result == ""
 
+    def test_feedback_prompt_lines_memoized(self, provider):
+        """Test feedback prompt lines are formatted once per FeedbackContext."""
+        feedback = FeedbackContext(
+            accuracy_rate=0.5,
+            total_feedback=4,
+            common_corrections=("delivery",),
+            recent_negative_reasons=(),
+        )
+
+        assert feedback.prompt_lines is feedback.prompt_lines
+        assert feedback.prompt_lines == (
+            "Previous accuracy for this camera: 50%",
+            "Common corrections: delivery",
+        )
+        assert provider.format_for_prompt(AIContext(feedback=feedback)) == "\n".join(feedback.prompt_lines)
+
     def test_format_with_entity(self, provider):
         """Test formatting with entity context."""
         context = AIContext(
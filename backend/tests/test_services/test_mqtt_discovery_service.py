@@ -19,10 +19,19 @@ from app.services.mqtt_discovery_service import (
     get_discovery_service,
     on_camera_deleted,
     on_camera_disabled,
+    on_discovery_setting_changed,
 )
 from app.models.mqtt_config import MQTTConfig
 
 
+@pytest.fixture(autouse=True)
+def legacy_migration_marker():
+    """Keep the legacy-migration marker out of the database; starts unset."""
+    with patch.object(MQTTDiscoveryService, '_load_legacy_migrated', return_value=False) as load, \
+            patch.object(MQTTDiscoveryService, '_store_legacy_migrated') as store:
+        yield load, store
+
+
 class TestDiscoveryConfigGeneration:
     """Tests for discovery config payload generation (AC1, AC3)."""
 
@@ -177,14 +186,14 @@ class TestDiscoveryPublishing:
         result = await service.publish_discovery_config(mock_camera, mock_config)
 
         assert result is False
-        mock_mqtt.publish.assert_not_called()
+        mock_mqtt.publish_nowait.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_publish_discovery_config_success(self):
         """Publish discovery config successfully (AC1)."""
         mock_mqtt = MagicMock()
         mock_mqtt.is_connected = True
-        mock_mqtt.publish = AsyncMock(return_value=True)
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
 
         service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
 
@@ -203,30 +212,112 @@ class TestDiscoveryPublishing:
         result = await service.publish_discovery_config(mock_camera, mock_config)
 
         assert result is True
-        # Service now publishes 6 sensors per camera: event, status, last_event, events_today, events_week, activity
-        assert mock_mqtt.publish.call_count == 6
-
-        # Verify the event sensor was published (use exact topic match)
-        call_args_list = mock_mqtt.publish.call_args_list
-        event_sensor_calls = [c for c in call_args_list if c.kwargs.get("topic", "") == "homeassistant/sensor/liveobject_camera-123_event/config"]
-        assert len(event_sensor_calls) == 1
+        # One device-based message carries all 6 sensors
+        assert mock_mqtt.publish_nowait.call_count == 1
 
-        call_args = event_sensor_calls[0]
-        assert call_args.kwargs["topic"] == "homeassistant/sensor/liveobject_camera-123_event/config"
+        call_args = mock_mqtt.publish_nowait.call_args
+        assert call_args.kwargs["topic"] == "homeassistant/device/liveobject_camera-123/config"
         assert call_args.kwargs["qos"] == 1
         assert call_args.kwargs["retain"] is True
 
         # Verify payload structure
-        payload = call_args.kwargs["payload"]
-        assert payload["unique_id"] == "liveobject_camera-123_event"
-        assert payload["name"] == "Front Door AI Events"
+        payload = json.loads(call_args.kwargs["payload"])
+        assert payload["device"]["identifiers"] == ["liveobject_camera-123"]
+        assert set(payload["components"]) == {
+            "liveobject_camera-123_event",
+            "liveobject_camera-123_status",
+            "liveobject_camera-123_last_event",
+            "liveobject_camera-123_events_today",
+            "liveobject_camera-123_events_week",
+            "liveobject_camera-123_activity",
+        }
+        event_component = payload["components"]["liveobject_camera-123_event"]
+        assert event_component["name"] == "Front Door AI Events"
+        assert event_component["platform"] == "sensor"
+        assert payload["components"]["liveobject_camera-123_activity"]["platform"] == "binary_sensor"
+
+        # Availability is shared at the root rather than repeated per component
+        assert payload["availability_topic"] == "liveobject/status"
+        assert payload["payload_available"] == "online"
+        assert payload["payload_not_available"] == "offline"
+        assert all("availability_topic" not in c for c in payload["components"].values())
+
+    @pytest.mark.asyncio
+    async def test_first_publish_migrates_legacy_topics(self):
+        """Legacy single-component topics are migrated, then cleared."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        events = []
+        mock_mqtt.publish_nowait = MagicMock(
+            side_effect=lambda **kwargs: events.append(("device", kwargs["topic"])) or MagicMock()
+        )
+        mock_mqtt.publish_many = MagicMock(
+            side_effect=lambda items: events.append(("many", items)) or []
+        )
+
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+
+        mock_camera = MagicMock()
+        mock_camera.id = "camera-legacy"
+        mock_camera.name = "Yard"
+        mock_camera.source_type = "rtsp"
+        mock_camera.type = "rtsp"
+        mock_camera.is_doorbell = False
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        mock_config.topic_prefix = "liveobject"
+        mock_config.discovery_prefix = "homeassistant"
+
+        await service.publish_discovery_config(mock_camera, mock_config)
+
+        assert [kind for kind, _ in events] == ["many", "device", "many"]
+        legacy_event_topic = "homeassistant/sensor/liveobject_camera-legacy_event/config"
+        migrate_items, clear_items = events[0][1], events[2][1]
+        assert len(migrate_items) == 6
+        assert (legacy_event_topic, b'{"migrate_discovery":true}', 1, True) in migrate_items
+        assert (legacy_event_topic, b"", 1, True) in clear_items
+
+        # Once published, a forced republish does not migrate again
+        events.clear()
+        await service.publish_discovery_config(mock_camera, mock_config, force=True)
+        assert [kind for kind, _ in events] == ["device"]
+
+    @pytest.mark.asyncio
+    async def test_migrated_marker_skips_legacy_topics(self, legacy_migration_marker):
+        """Once the migration marker is stored, first publishes skip legacy topics."""
+        load_marker, _ = legacy_migration_marker
+        load_marker.return_value = True
+
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
+
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+
+        mock_camera = MagicMock()
+        mock_camera.id = "camera-migrated"
+        mock_camera.name = "Yard"
+        mock_camera.source_type = "rtsp"
+        mock_camera.type = "rtsp"
+        mock_camera.is_doorbell = False
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        mock_config.topic_prefix = "liveobject"
+        mock_config.discovery_prefix = "homeassistant"
+
+        assert await service.publish_discovery_config(mock_camera, mock_config) is True
+
+        mock_mqtt.publish_many.assert_not_called()
+        mock_mqtt.publish_nowait.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_publish_discovery_config_tracks_camera(self):
         """Published cameras are tracked for later removal."""
         mock_mqtt = MagicMock()
         mock_mqtt.is_connected = True
-        mock_mqtt.publish = AsyncMock(return_value=True)
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
 
         service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
 
@@ -247,6 +338,531 @@ class TestDiscoveryPublishing:
         assert "camera-tracked" in service._published_cameras
 
 
+class TestConfigCache:
+    """Tests for the cached MQTTConfig lookup."""
+
+    @pytest.mark.asyncio
+    async def test_get_config_reuses_cached_config(self):
+        """Repeated lookups within the TTL hit the database once."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        mock_config = MagicMock()
+
+        with patch('app.core.database.SessionLocal') as mock_session:
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            assert await service._get_config() is mock_config
+            assert await service._get_config() is mock_config
+
+        assert mock_session.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_get_config_reloads_after_ttl(self):
+        """An expired cache entry is reloaded from the database."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        stale_config = MagicMock()
+        fresh_config = MagicMock()
+        service._config_cache = (stale_config, 0.0)
+
+        with patch('app.core.database.SessionLocal') as mock_session, \
+                patch('app.services.mqtt_discovery_service.time.monotonic', return_value=1000.0):
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = fresh_config
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            assert await service._get_config() is fresh_config
+
+    def test_invalidate_config_cache_forces_reload(self):
+        """invalidate_config_cache drops the cached config."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        service._config_cache = (MagicMock(), float("inf"))
+
+        service.invalidate_config_cache()
+
+        assert service._config_cache is None
+
+    @pytest.mark.asyncio
+    async def test_missing_config_is_not_cached(self):
+        """A missing config row is re-queried on the next lookup."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+
+        with patch('app.core.database.SessionLocal') as mock_session:
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = None
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            assert await service._get_config() is None
+            assert await service._get_config() is None
+
+        assert mock_session.call_count == 2
+
+
+class TestDiscoveryMessageCache:
+    """Tests for reuse of encoded discovery payloads."""
+
+    def _make_camera(self, name="Front Door"):
+        camera = MagicMock()
+        camera.id = "camera-cache"
+        camera.name = name
+        camera.source_type = "rtsp"
+        camera.type = "rtsp"
+        camera.is_doorbell = False
+        return camera
+
+    def _make_config(self):
+        config = MagicMock()
+        config.topic_prefix = "liveobject"
+        config.discovery_prefix = "homeassistant"
+        return config
+
+    def test_messages_reused_for_unchanged_camera(self):
+        """Encoded payloads are built once per camera fingerprint."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        camera = self._make_camera()
+        config = self._make_config()
+
+        topic, payload, _ = service._get_discovery_message(camera, config)
+        _, second_payload, _ = service._get_discovery_message(camera, config)
+
+        assert payload is second_payload
+        assert topic == "homeassistant/device/liveobject_camera-cache/config"
+        assert json.loads(payload) == service.generate_device_config(camera, topic_prefix="liveobject")
+
+    def test_messages_rebuilt_when_camera_renamed(self):
+        """Changing a payload field invalidates the cached messages."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        config = self._make_config()
+
+        _, _, first_digest = service._get_discovery_message(self._make_camera("Old Name"), config)
+        _, payload, second_digest = service._get_discovery_message(self._make_camera("New Name"), config)
+
+        assert first_digest != second_digest
+        assert json.loads(payload)["device"]["name"] == "New Name"
+
+    @pytest.mark.asyncio
+    async def test_remove_drops_cached_messages(self):
+        """Removing a camera's discovery evicts its cached payloads."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = False
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+        service._get_discovery_message(self._make_camera(), self._make_config())
+
+        await service.remove_discovery_config("camera-cache", self._make_config())
+
+        assert "camera-cache" not in service._message_cache
+        assert "camera-cache" not in service._topic_cache
+
+    def test_discovery_topics_built_once_per_prefix(self):
+        """Topic strings are reused until the discovery prefix changes."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+
+        topics = service._get_discovery_topics("camera-cache", "homeassistant")
+
+        assert service._get_discovery_topics("camera-cache", "homeassistant") is topics
+        assert topics[0] == "homeassistant/device/liveobject_camera-cache/config"
+        assert service._get_legacy_discovery_topics("camera-cache", "homeassistant") == topics[1:]
+        assert service._get_discovery_topics("camera-cache", "custom")[0] == \
+            "custom/device/liveobject_camera-cache/config"
+
+
+class TestUnchangedDiscoverySkip:
+    """Tests for skipping republish of unchanged discovery messages."""
+
+    def _make_service(self):
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
+        return MQTTDiscoveryService(mqtt_service=mock_mqtt), mock_mqtt
+
+    def _make_camera(self, name="Front Door"):
+        camera = MagicMock()
+        camera.id = "camera-skip"
+        camera.name = name
+        camera.source_type = "rtsp"
+        camera.type = "rtsp"
+        camera.is_doorbell = False
+        return camera
+
+    def _make_config(self):
+        config = MagicMock()
+        config.discovery_enabled = True
+        config.topic_prefix = "liveobject"
+        config.discovery_prefix = "homeassistant"
+        return config
+
+    @pytest.mark.asyncio
+    async def test_unchanged_camera_is_not_republished(self):
+        """A second publish with identical messages sends nothing."""
+        service, mock_mqtt = self._make_service()
+
+        assert await service.publish_discovery_config(self._make_camera(), self._make_config()) is True
+        assert await service.publish_discovery_config(self._make_camera(), self._make_config()) is True
+
+        assert mock_mqtt.publish_nowait.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_camera_is_republished(self):
+        """A renamed camera is published again."""
+        service, mock_mqtt = self._make_service()
+
+        await service.publish_discovery_config(self._make_camera("Old"), self._make_config())
+        await service.publish_discovery_config(self._make_camera("New"), self._make_config())
+
+        assert mock_mqtt.publish_nowait.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_force_republishes_unchanged_camera(self):
+        """force=True bypasses the unchanged check."""
+        service, mock_mqtt = self._make_service()
+
+        await service.publish_discovery_config(self._make_camera(), self._make_config())
+        await service.publish_discovery_config(self._make_camera(), self._make_config(), force=True)
+
+        assert mock_mqtt.publish_nowait.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_publish_is_retried(self):
+        """A digest is only recorded when every message was queued."""
+        service, mock_mqtt = self._make_service()
+        mock_mqtt.publish_nowait.return_value = None
+
+        assert await service.publish_discovery_config(self._make_camera(), self._make_config()) is False
+        assert "camera-skip" not in service._published_digests
+
+        mock_mqtt.publish_nowait.return_value = MagicMock()
+        assert await service.publish_discovery_config(self._make_camera(), self._make_config()) is True
+        assert mock_mqtt.publish_nowait.call_count == 2
+
+
+class TestPublishAllDiscoveryConfigs:
+    """Tests for fan-out publishing across all cameras."""
+
+    def _mock_camera(self, camera_id):
+        camera = MagicMock()
+        camera.id = camera_id
+        camera.name = f"Camera {camera_id}"
+        return camera
+
+    @pytest.mark.asyncio
+    async def test_publishes_cameras_concurrently(self):
+        """All cameras are in flight before any publish completes."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        cameras = [self._mock_camera(f"camera-{i}") for i in range(3)]
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_publish(camera, config, force=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return True
+
+        service.publish_discovery_config = slow_publish
+
+        with patch('app.core.database.SessionLocal') as mock_session:
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
+            mock_db.execute.return_value.all.return_value = cameras
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 3
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than DISCOVERY_PUBLISH_CONCURRENCY cameras are in flight."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        cameras = [self._mock_camera(f"camera-{i}") for i in range(5)]
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_publish(camera, config, force=False):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return True
+
+        service.publish_discovery_config = slow_publish
+
+        with patch('app.core.database.SessionLocal') as mock_session, \
+                patch('app.services.mqtt_discovery_service.DISCOVERY_PUBLISH_CONCURRENCY', 2):
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
+            mock_db.execute.return_value.all.return_value = cameras
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 5
+        assert max_in_flight == 2
+
+    @pytest.mark.asyncio
+    async def test_one_camera_failure_does_not_abort_others(self):
+        """Exceptions for one camera are logged and the rest still count."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        cameras = [self._mock_camera("camera-ok"), self._mock_camera("camera-bad")]
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+
+        async def publish(camera, config, force=False):
+            if camera.id == "camera-bad":
+                raise RuntimeError("boom")
+            return True
+
+        service.publish_discovery_config = publish
+
+        with patch('app.core.database.SessionLocal') as mock_session:
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
+            mock_db.execute.return_value.all.return_value = cameras
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 1
+
+    @pytest.mark.asyncio
+    async def test_full_fan_out_stores_migration_marker_once(self, legacy_migration_marker):
+        """A fan-out that publishes every camera stores the marker, and only once."""
+        _, store_marker = legacy_migration_marker
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        service._store_config(mock_config)
+        service._load_enabled_cameras = MagicMock(
+            return_value=[self._mock_camera("camera-1"), self._mock_camera("camera-2")]
+        )
+        service.publish_discovery_config = AsyncMock(return_value=True)
+
+        await service.publish_all_discovery_configs()
+        await service.publish_all_discovery_configs()
+
+        store_marker.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_partial_fan_out_does_not_store_migration_marker(self, legacy_migration_marker):
+        """Cameras that failed to publish may still have legacy topics."""
+        _, store_marker = legacy_migration_marker
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        service._store_config(mock_config)
+        service._load_enabled_cameras = MagicMock(
+            return_value=[self._mock_camera("camera-1"), self._mock_camera("camera-2")]
+        )
+        service.publish_discovery_config = AsyncMock(side_effect=[True, False])
+
+        assert await service.publish_all_discovery_configs() == 1
+
+        store_marker.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_loads_config_and_cameras_in_one_session(self):
+        """A fan-out with no cached config opens a single database session."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        cameras = [self._mock_camera("camera-1")]
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+
+        async def publish(camera, config, force=False):
+            assert config is mock_config
+            return True
+
+        service.publish_discovery_config = publish
+
+        with patch('app.core.database.SessionLocal') as mock_session:
+            mock_db = MagicMock()
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
+            mock_db.execute.return_value.all.return_value = cameras
+            mock_session.return_value.__enter__.return_value = mock_db
+
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 1
+        assert mock_session.call_count == 1
+        assert service._config_cache[0] is mock_config
+
+    @pytest.mark.asyncio
+    async def test_fan_out_logs_one_info_line(self, caplog):
+        """Per-camera publishes log at debug; only the summary is info."""
+        import logging
+
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
+        mock_mqtt.publish_many = MagicMock(return_value=[])
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        mock_config.topic_prefix = "liveobject"
+        mock_config.discovery_prefix = "homeassistant"
+        service._config_cache = (mock_config, float("inf"))
+
+        cameras = [self._mock_camera(f"camera-{i}") for i in range(3)]
+        for camera in cameras:
+            camera.source_type = "rtsp"
+            camera.type = "rtsp"
+            camera.is_doorbell = False
+
+        with patch.object(service, '_load_enabled_cameras', return_value=cameras), \
+                caplog.at_level(logging.INFO, logger="app.services.mqtt_discovery_service"):
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 3
+        info_messages = [
+            record.getMessage() for record in caplog.records
+            if record.name == "app.services.mqtt_discovery_service" and record.levelno == logging.INFO
+        ]
+        assert info_messages == ["Published discovery for 3/3 cameras"]
+
+    @pytest.mark.asyncio
+    async def test_publish_all_removes_cameras_no_longer_enabled(self):
+        """Published cameras missing from the enabled set are removed."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_many = MagicMock(
+            side_effect=lambda items: [MagicMock(rc=0) for _ in items]
+        )
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+        service._published_cameras.update({"camera-kept", "camera-gone"})
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        mock_config.discovery_prefix = "homeassistant"
+        service._config_cache = (mock_config, float("inf"))
+
+        async def publish(camera, config, force=False):
+            return True
+
+        service.publish_discovery_config = publish
+
+        with patch.object(service, '_load_enabled_cameras', return_value=[self._mock_camera("camera-kept")]):
+            result = await service.publish_all_discovery_configs()
+
+        assert result == 1
+        assert service._published_cameras == {"camera-kept"}
+        items = mock_mqtt.publish_many.call_args[0][0]
+        assert {topic for topic, *_ in items} == set(
+            service._get_discovery_topics("camera-gone", "homeassistant")
+        )
+
+    @pytest.mark.asyncio
+    async def test_remove_all_queues_removals_in_one_batch(self):
+        """remove_all_discovery_configs sends every removal via publish_many."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_many = MagicMock(
+            side_effect=lambda items: [MagicMock(rc=0) for _ in items]
+        )
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+        service._published_cameras.update({"camera-1", "camera-2"})
+
+        mock_config = MagicMock()
+        mock_config.discovery_prefix = "homeassistant"
+        service._config_cache = (mock_config, float("inf"))
+
+        result = await service.remove_all_discovery_configs()
+
+        assert result == 2
+        assert service._published_cameras == set()
+        mock_mqtt.publish_many.assert_called_once()
+        items = mock_mqtt.publish_many.call_args[0][0]
+        assert len(items) == 14
+        assert ("homeassistant/device/liveobject_camera-1/config", b"", 1, True) in items
+        assert ("homeassistant/sensor/liveobject_camera-1_event/config", b"", 1, True) in items
+
+    @pytest.mark.asyncio
+    async def test_remove_all_keeps_cameras_with_failed_removals(self):
+        """A camera whose removal was rejected stays tracked for a retry."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+
+        def publish_many(items):
+            return [MagicMock(rc=4 if "camera-bad" in topic else 0) for topic, *_ in items]
+
+        mock_mqtt.publish_many = MagicMock(side_effect=publish_many)
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+        service._published_cameras.update({"camera-ok", "camera-bad"})
+
+        mock_config = MagicMock()
+        mock_config.discovery_prefix = "homeassistant"
+        service._config_cache = (mock_config, float("inf"))
+
+        result = await service.remove_all_discovery_configs()
+
+        assert result == 1
+        assert service._published_cameras == {"camera-bad"}
+
+
+class TestPublishAllLoadsProjectedCameras:
+    """publish_all_discovery_configs reads camera columns via a projected query."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_enabled_cameras_from_database(self):
+        """Only enabled cameras are published, from lightweight rows."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from sqlalchemy.pool import StaticPool
+        from app.core.database import Base
+        from app.models.camera import Camera
+
+        engine = create_engine(
+            "sqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        TestSession = sessionmaker(bind=engine)
+        with TestSession() as db:
+            db.add_all([
+                Camera(id="cam-on", name="Porch", type="rtsp", source_type="protect", is_doorbell=True),
+                Camera(id="cam-off", name="Garage", type="rtsp", is_enabled=False),
+            ])
+            db.commit()
+
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+
+        mock_config = MagicMock()
+        mock_config.discovery_enabled = True
+        mock_config.topic_prefix = "liveobject"
+        mock_config.discovery_prefix = "homeassistant"
+        service._config_cache = (mock_config, float("inf"))
+
+        with patch('app.core.database.SessionLocal', TestSession):
+            result = await service.publish_all_discovery_configs()
+
+        engine.dispose()
+
+        assert result == 1
+        assert service._published_cameras == {"cam-on"}
+        payload = json.loads(mock_mqtt.publish_nowait.call_args.kwargs["payload"])
+        assert payload["components"]["liveobject_cam-on_event"]["name"] == "Porch AI Events"
+        assert payload["device"]["model"] == "AI Classifier - Doorbell"
+
+
 class TestSensorRemoval:
     """Tests for discovery config removal (AC4)."""
 
@@ -292,11 +908,13 @@ class TestSensorRemoval:
         assert result is True
         assert "camera-456" not in service._published_cameras
 
-        # Verify empty payloads published for all 6 sensors
-        assert mock_client.publish.call_count == 6
+        # Verify empty payloads published for the device topic and all 6 legacy sensor topics
+        assert mock_client.publish.call_count == 7
 
-        # Verify the event sensor was removed (use exact topic match)
         call_args_list = mock_client.publish.call_args_list
+        assert call_args_list[0][0][0] == "homeassistant/device/liveobject_camera-456/config"
+
+        # Verify the legacy event sensor was removed (use exact topic match)
         event_calls = [c for c in call_args_list if c[0][0] == "homeassistant/sensor/liveobject_camera-456_event/config"]
         assert len(event_calls) == 1
         call_args = event_calls[0]
@@ -322,9 +940,9 @@ class TestAvailabilitySupport:
         mock_config = MagicMock()
         mock_config.topic_prefix = "liveobject"
 
-        with patch('app.services.mqtt_discovery_service.SessionLocal') as mock_session:
+        with patch('app.core.database.SessionLocal') as mock_session:
             mock_db = MagicMock()
-            mock_db.query.return_value.first.return_value = mock_config
+            mock_db.query.return_value.options.return_value.first.return_value = mock_config
             mock_session.return_value.__enter__.return_value = mock_db
 
             await service._publish_online_status()
@@ -384,6 +1002,39 @@ class TestCameraHooks:
         mock_service.remove_discovery_config.assert_called_once_with("camera-to-disable")
 
 
+class TestDiscoverySettingDebounce:
+    """Tests for coalescing discovery setting changes."""
+
+    @pytest.mark.asyncio
+    async def test_rapid_changes_collapse_into_one_fan_out(self):
+        """Only the last of several quick toggles is applied."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        service.publish_all_discovery_configs = AsyncMock(return_value=1)
+        service.remove_all_discovery_configs = AsyncMock(return_value=1)
+
+        with patch('app.services.mqtt_discovery_service.DISCOVERY_SETTING_DEBOUNCE_SECONDS', 0.01):
+            service.schedule_setting_sync(True)
+            service.schedule_setting_sync(False)
+            task = service.schedule_setting_sync(True)
+            await task
+
+        service.publish_all_discovery_configs.assert_awaited_once()
+        service.remove_all_discovery_configs.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_on_discovery_setting_changed_schedules_sync(self):
+        """The hook invalidates cached config and schedules a debounced sync."""
+        import app.services.mqtt_discovery_service as discovery_module
+
+        mock_service = MagicMock()
+        discovery_module._discovery_service = mock_service
+
+        await on_discovery_setting_changed(False)
+
+        mock_service.invalidate_config_cache.assert_called_once()
+        mock_service.schedule_setting_sync.assert_called_once_with(False)
+
+
 class TestAsyncContextHandling:
     """Tests for async context handling in on_mqtt_connect (P14-1.1 fix)."""
 
@@ -421,7 +1072,7 @@ class TestAsyncContextHandling:
             mock_future.add_done_callback.assert_called_once()
 
     def test_on_mqtt_connect_with_main_loop_not_running(self):
-        """on_mqtt_connect uses temp loop when main loop not running."""
+        """on_mqtt_connect skips publishing when the main loop is not running."""
         mock_mqtt = MagicMock()
         service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
 
@@ -430,64 +1081,93 @@ class TestAsyncContextHandling:
         mock_loop.is_running.return_value = False
         service._main_event_loop = mock_loop
 
-        # Mock the temporary loop creation
-        mock_temp_loop = MagicMock(spec=asyncio.AbstractEventLoop)
-        with patch('asyncio.new_event_loop', return_value=mock_temp_loop):
-            # Mock _publish_discovery_on_connect to be a coroutine
-            async def mock_publish():
-                pass
-            service._publish_discovery_on_connect = mock_publish
-
+        with patch('asyncio.run_coroutine_threadsafe') as mock_threadsafe, \
+                patch('asyncio.new_event_loop') as mock_new_loop:
             service.on_mqtt_connect()
 
-            # Verify temp loop was created, used, and closed
-            mock_temp_loop.run_until_complete.assert_called_once()
-            mock_temp_loop.close.assert_called_once()
+        mock_threadsafe.assert_not_called()
+        mock_new_loop.assert_not_called()
 
     def test_on_mqtt_connect_without_main_loop(self):
-        """on_mqtt_connect uses temp loop when no main loop set."""
+        """on_mqtt_connect never spins up a temporary loop on paho's thread."""
         mock_mqtt = MagicMock()
         service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
 
         # No main loop set (default state)
         assert service._main_event_loop is None
 
-        # Mock the temporary loop creation
-        mock_temp_loop = MagicMock(spec=asyncio.AbstractEventLoop)
-        with patch('asyncio.new_event_loop', return_value=mock_temp_loop):
-            # Mock _publish_discovery_on_connect to be a coroutine
-            async def mock_publish():
-                pass
-            service._publish_discovery_on_connect = mock_publish
-
+        with patch('asyncio.run_coroutine_threadsafe') as mock_threadsafe, \
+                patch('asyncio.new_event_loop') as mock_new_loop:
             service.on_mqtt_connect()
 
-            # Verify temp loop was created, used, and closed
-            mock_temp_loop.run_until_complete.assert_called_once()
-            mock_temp_loop.close.assert_called_once()
+        mock_threadsafe.assert_not_called()
+        mock_new_loop.assert_not_called()
 
-    def test_on_mqtt_connect_temp_loop_handles_exception(self):
-        """on_mqtt_connect handles exceptions in temp loop path."""
-        mock_mqtt = MagicMock()
-        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+    @pytest.mark.asyncio
+    async def test_publish_discovery_on_connect_does_not_sleep(self):
+        """Online status and discovery are published without a settle delay."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        service._publish_online_status = AsyncMock()
+        service.publish_all_discovery_configs = AsyncMock(return_value=1)
+
+        with patch('app.services.mqtt_discovery_service.asyncio.sleep') as mock_sleep, \
+                patch('app.services.mqtt_status_service.publish_all_camera_statuses',
+                      AsyncMock(return_value=1)) as mock_statuses:
+            await service._publish_discovery_on_connect()
+
+        mock_sleep.assert_not_called()
+        service._publish_online_status.assert_awaited_once()
+        service.publish_all_discovery_configs.assert_awaited_once()
+        mock_statuses.assert_awaited_once()
 
-        # No main loop set
-        assert service._main_event_loop is None
+    @pytest.mark.asyncio
+    async def test_publish_discovery_on_connect_tolerates_online_status_failure(self):
+        """A failed online-status publish does not stop discovery or statuses."""
+        service = MQTTDiscoveryService(mqtt_service=MagicMock())
+        service._publish_online_status = AsyncMock(side_effect=RuntimeError("boom"))
+        service.publish_all_discovery_configs = AsyncMock(return_value=1)
 
-        # Mock the temporary loop creation to raise an exception
-        mock_temp_loop = MagicMock(spec=asyncio.AbstractEventLoop)
-        mock_temp_loop.run_until_complete.side_effect = Exception("Test error")
-        with patch('asyncio.new_event_loop', return_value=mock_temp_loop):
-            # Mock _publish_discovery_on_connect to be a coroutine
-            async def mock_publish():
-                pass
-            service._publish_discovery_on_connect = mock_publish
+        with patch('app.services.mqtt_status_service.publish_all_camera_statuses',
+                   AsyncMock(return_value=1)) as mock_statuses:
+            await service._publish_discovery_on_connect()
 
-            # Should not raise - errors are logged
-            service.on_mqtt_connect()
+        service.publish_all_discovery_configs.assert_awaited_once()
+        mock_statuses.assert_awaited_once()
 
-            # Verify loop was still closed even after exception
-            mock_temp_loop.close.assert_called_once()
+    @pytest.mark.asyncio
+    async def test_reconnect_republishes_unchanged_discovery(self):
+        """Each connect republishes discovery, since the broker may have lost it (AC5)."""
+        mock_mqtt = MagicMock()
+        mock_mqtt.is_connected = True
+        mock_mqtt.publish_nowait = MagicMock(return_value=MagicMock())
+        service = MQTTDiscoveryService(mqtt_service=mock_mqtt)
+        service._publish_online_status = AsyncMock()
+
+        camera = MagicMock()
+        camera.id = "camera-reconnect"
+        camera.name = "Porch"
+        camera.source_type = "rtsp"
+        camera.type = "rtsp"
+        camera.is_doorbell = False
+
+        config = MagicMock()
+        config.discovery_enabled = True
+        config.topic_prefix = "liveobject"
+        config.discovery_prefix = "homeassistant"
+        service._store_config(config)
+        service._load_enabled_cameras = MagicMock(return_value=[camera])
+
+        device_topic = "homeassistant/device/liveobject_camera-reconnect/config"
+        with patch('app.services.mqtt_status_service.publish_all_camera_statuses',
+                   AsyncMock(return_value=1)):
+            await service._publish_discovery_on_connect()
+            await service._publish_discovery_on_connect()
+
+        device_publishes = [
+            call for call in mock_mqtt.publish_nowait.call_args_list
+            if call.kwargs["topic"] == device_topic
+        ]
+        assert len(device_publishes) == 2
 
     def test_handle_publish_future_success(self):
         """_handle_publish_future does nothing on success."""
@@ -530,7 +1210,7 @@ class TestInitializeDiscoveryService:
         mock_mqtt = MagicMock()
         mock_mqtt.set_on_connect_callback = MagicMock()
 
-        with patch('app.services.mqtt_discovery_service.get_mqtt_service', return_value=mock_mqtt):
+        with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt):
             from app.services.mqtt_discovery_service import initialize_discovery_service
 
             await initialize_discovery_service()
@@ -553,7 +1233,7 @@ class TestInitializeDiscoveryService:
 
         mock_mqtt = MagicMock()
 
-        with patch('app.services.mqtt_discovery_service.get_mqtt_service', return_value=mock_mqtt):
+        with patch('app.services.mqtt_service.get_mqtt_service', return_value=mock_mqtt):
             from app.services.mqtt_discovery_service import initialize_discovery_service
 
             await initialize_discovery_service()
@@ -14,6 +14,7 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch, AsyncMock, PropertyMock
 import asyncio
 import json
+import uuid
 
 from app.services.mqtt_service import (
     MQTTService,
@@ -473,6 +474,87 @@ class TestMQTTServicePublish:
         parsed = json.loads(published_message)
         assert parsed["event_id"] == "123"
 
+    def test_publish_nowait_returns_message_info(self):
+        """publish_nowait returns paho's MQTTMessageInfo without awaiting."""
+        service = MQTTService()
+        service._connected = True
+        service._config = MQTTConfig(broker_host="test.local", qos=1, retain_messages=True)
+
+        mock_client = MagicMock()
+        mock_result = MagicMock()
+        mock_result.rc = 0
+        mock_client.publish.return_value = mock_result
+        service._client = mock_client
+
+        info = service.publish_nowait("test/topic", {"a": 1}, qos=1, retain=True)
+
+        assert info is mock_result
+        assert service.messages_published == 1
+
+    def test_publish_nowait_encodes_datetime_and_uuid(self):
+        """Payloads with datetime and UUID values are encoded to JSON bytes."""
+        service = MQTTService()
+        service._connected = True
+        service._config = MQTTConfig(broker_host="test.local", qos=1, retain_messages=True)
+
+        mock_client = MagicMock()
+        mock_client.publish.return_value = MagicMock(rc=0)
+        service._client = mock_client
+
+        event_id = uuid.uuid4()
+        timestamp = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        service.publish_nowait("test/topic", {"event_id": event_id, "timestamp": timestamp})
+
+        published_message = mock_client.publish.call_args[0][1]
+        assert isinstance(published_message, bytes)
+        assert json.loads(published_message) == {
+            "event_id": str(event_id),
+            "timestamp": "2025-01-02T03:04:05+00:00",
+        }
+
+    def test_publish_nowait_returns_none_on_failure(self):
+        """publish_nowait returns None when paho rejects the message."""
+        service = MQTTService()
+        service._connected = True
+        service._config = MQTTConfig(broker_host="test.local", qos=1, retain_messages=True)
+
+        mock_client = MagicMock()
+        mock_result = MagicMock()
+        mock_result.rc = 4  # MQTT_ERR_NO_CONN
+        mock_client.publish.return_value = mock_result
+        service._client = mock_client
+
+        assert service.publish_nowait("test/topic", {"a": 1}) is None
+
+
+class TestMQTTServicePublishMany:
+    """Tests for bulk publishing."""
+
+    def test_publish_many_queues_all_items(self):
+        """publish_many publishes every item and counts successes."""
+        service = MQTTService()
+        service._connected = True
+
+        mock_client = MagicMock()
+        mock_client.publish.side_effect = [MagicMock(rc=0), MagicMock(rc=4)]
+        service._client = mock_client
+
+        infos = service.publish_many([
+            ("a/config", b"", 1, True),
+            ("b/config", b"", 1, True),
+        ])
+
+        assert [info.rc for info in infos] == [0, 4]
+        assert mock_client.publish.call_count == 2
+        mock_client.publish.assert_any_call("a/config", b"", qos=1, retain=True)
+        assert service.messages_published == 1
+
+    def test_publish_many_when_not_connected(self):
+        """publish_many returns no infos when disconnected."""
+        service = MQTTService()
+
+        assert service.publish_many([("a/config", b"", 1, True)]) == []
+
 
 class TestReconnectLogic:
     """Tests for auto-reconnect behavior."""
@@ -1100,3 +1182,59 @@ class TestMQTTBirthWillMessages:
             qos=1,
             retain=True
         )
+
+
+class TestConnectionCallbackDbStatus:
+    """Connection callbacks must not write the database on paho's thread."""
+
+    def test_on_connect_updates_db_on_worker_thread(self):
+        """_on_connect hands the status write to the worker thread."""
+        import threading
+
+        service = MQTTService()
+        service._config = MQTTConfig(broker_host="test.local")
+        service._client = MagicMock()
+        written_on = []
+        done = threading.Event()
+
+        def record(connected, error=None):
+            written_on.append((threading.current_thread().name, connected))
+            done.set()
+
+        reason_code = MagicMock()
+        reason_code.value = 0
+        with patch.object(service, "_update_db_status", side_effect=record), \
+                patch.object(service, "publish_birth_message"):
+            service._on_connect(service._client, None, {}, reason_code, None)
+            assert done.wait(timeout=5)
+
+        assert service.is_connected is True
+        thread_name, connected = written_on[0]
+        assert connected is True
+        assert thread_name.startswith("mqtt-db-status")
+        assert thread_name != threading.current_thread().name
+
+    def test_on_disconnect_does_not_block_on_db(self):
+        """_on_disconnect returns while the status write is still pending."""
+        import threading
+
+        service = MQTTService()
+        service._connected = True
+        service._should_reconnect = False
+        release = threading.Event()
+        finished = threading.Event()
+
+        def slow_write(connected, error=None):
+            release.wait(timeout=5)
+            finished.set()
+
+        reason_code = MagicMock()
+        reason_code.value = 7
+        with patch.object(service, "_update_db_status", side_effect=slow_write):
+            service._on_disconnect(MagicMock(), None, MagicMock(), reason_code, None)
+            assert service.is_connected is False
+            assert not finished.is_set()
+            release.set()
+            assert finished.wait(timeout=5)
+
+        service._db_status_executor.shutdown(wait=True)
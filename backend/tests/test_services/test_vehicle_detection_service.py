@@ -309,6 +309,16 @@ class TestVehicleDetectionService:
         assert len(vehicle_bytes_no_pad) > 0
         assert len(vehicle_bytes_pad) > 0
 
+    def test_crop_vehicle_from_decoded_image_matches_bytes_path(self, vehicle_service):
+        """Cropping a pre-decoded image gives the same JPEG as cropping bytes."""
+        from app.services.vehicle_detection_service import BoundingBox
+
+        test_image = create_test_image(width=300, height=300)
+        bbox = BoundingBox(x=50, y=50, width=100, height=100)
+        decoded = vehicle_service.decode_image(test_image)
+
+        assert vehicle_service.crop_vehicle_from_image(decoded, bbox) == vehicle_service.crop_vehicle(test_image, bbox)
+
 
 class TestVehicleDetectionServiceSingleton:
     """Tests for singleton pattern."""
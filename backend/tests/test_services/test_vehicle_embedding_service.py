@@ -7,8 +7,8 @@ Tests vehicle embedding service functionality including:
 - Retrieving vehicle embeddings
 - Deleting vehicle embeddings (privacy)
 """
+import asyncio
 import io
-import json
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -16,6 +16,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import numpy as np
 from PIL import Image
 
+from app.models.vehicle_embedding import (
+    VehicleEmbedding,
+    dequantize_embedding,
+    pack_bounding_box,
+    quantize_embedding,
+    unpack_bounding_box,
+)
+
 
 def create_test_image(width: int = 300, height: int = 300) -> bytes:
     """Create a test image as bytes."""
@@ -36,14 +44,14 @@ class TestVehicleEmbeddingService:
         from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
 
         mock = MagicMock()
-        mock.detect_vehicles = AsyncMock(return_value=[
+        mock.detect_vehicles_in_image = AsyncMock(return_value=[
             VehicleDetection(
                 bbox=BoundingBox(x=50, y=50, width=100, height=80),
                 confidence=0.95,
                 vehicle_type="car"
             )
         ])
-        mock.crop_vehicle = MagicMock(return_value=create_test_image(224, 224))
+        mock.crop_vehicle_array = MagicMock(return_value=np.zeros((224, 224, 3), dtype=np.uint8))
         return mock
 
     @pytest.fixture
@@ -51,6 +59,9 @@ class TestVehicleEmbeddingService:
         """Create a mock EmbeddingService."""
         mock = MagicMock()
         mock.generate_embedding = AsyncMock(return_value=[0.1] * 512)
+        mock.generate_embeddings_from_arrays = AsyncMock(
+            side_effect=lambda images: [[0.1] * 512 for _ in images]
+        )
         return mock
 
     @pytest.fixture
@@ -92,11 +103,12 @@ class TestVehicleEmbeddingService:
 
         # Create mock DB session
         mock_db = MagicMock()
-        mock_embedding = MagicMock()
-        mock_embedding.id = "test-embedding-id"
-        mock_db.add = MagicMock()
-        mock_db.commit = MagicMock()
-        mock_db.refresh = MagicMock(side_effect=lambda x: setattr(x, 'id', 'test-embedding-id'))
+
+        def assign_ids():
+            for embedding in mock_db.add_all.call_args[0][0]:
+                embedding.id = "test-embedding-id"
+
+        mock_db.flush = MagicMock(side_effect=assign_ids)
 
         test_image = create_test_image()
 
@@ -106,14 +118,15 @@ class TestVehicleEmbeddingService:
             thumbnail_bytes=test_image
         )
 
-        assert len(result) == 1
-        mock_db.add.assert_called_once()
+        assert result == ["test-embedding-id"]
+        mock_db.add_all.assert_called_once()
         mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_process_event_vehicles_no_vehicles_found(self, vehicle_service, mock_vehicle_detector):
         """Test processing when no vehicles are detected."""
-        mock_vehicle_detector.detect_vehicles = AsyncMock(return_value=[])
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[])
 
         mock_db = MagicMock()
         test_image = create_test_image()
@@ -132,7 +145,7 @@ class TestVehicleEmbeddingService:
         """Test processing with multiple vehicles."""
         from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
 
-        mock_vehicle_detector.detect_vehicles = AsyncMock(return_value=[
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[
             VehicleDetection(
                 bbox=BoundingBox(x=10, y=10, width=50, height=40),
                 confidence=0.95,
@@ -146,7 +159,6 @@ class TestVehicleEmbeddingService:
         ])
 
         mock_db = MagicMock()
-        mock_db.refresh = MagicMock(side_effect=lambda x: setattr(x, 'id', f'id-{id(x)}'))
         test_image = create_test_image()
 
         result = await vehicle_service.process_event_vehicles(
@@ -156,8 +168,242 @@ class TestVehicleEmbeddingService:
         )
 
         assert len(result) == 2
-        assert mock_db.add.call_count == 2
-        assert mock_db.commit.call_count == 2
+        mock_db.add_all.assert_called_once()
+        assert len(mock_db.add_all.call_args[0][0]) == 2
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_decodes_thumbnail_once(self, vehicle_service, mock_vehicle_detector):
+        """Detection and every crop share a single decoded thumbnail."""
+        from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
+
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[
+            VehicleDetection(bbox=BoundingBox(x=10, y=10, width=50, height=40), confidence=0.95, vehicle_type="car"),
+            VehicleDetection(bbox=BoundingBox(x=100, y=100, width=60, height=50), confidence=0.88, vehicle_type="truck"),
+        ])
+        thumbnail = create_test_image()
+
+        await vehicle_service.process_event_vehicles(
+            db=MagicMock(),
+            event_id="test-event-id",
+            thumbnail_bytes=thumbnail
+        )
+
+        mock_vehicle_detector.decode_image.assert_called_once_with(thumbnail)
+        decoded = mock_vehicle_detector.decode_image.return_value
+        assert mock_vehicle_detector.detect_vehicles_in_image.call_args.args[0] is decoded
+        assert all(
+            call.args[0] is decoded
+            for call in mock_vehicle_detector.crop_vehicle_array.call_args_list
+        )
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_skips_failed_crops(self, vehicle_service, mock_vehicle_detector):
+        """A vehicle whose crop fails is skipped; the rest are stored."""
+        from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
+
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[
+            VehicleDetection(bbox=BoundingBox(x=10, y=10, width=50, height=40), confidence=0.95, vehicle_type="car"),
+            VehicleDetection(bbox=BoundingBox(x=100, y=100, width=60, height=50), confidence=0.88, vehicle_type="truck"),
+        ])
+        def crop(image, bbox):
+            if bbox.x == 10:
+                raise RuntimeError("crop failed")
+            return np.zeros((224, 224, 3), dtype=np.uint8)
+
+        mock_vehicle_detector.crop_vehicle_array = MagicMock(side_effect=crop)
+
+        mock_db = MagicMock()
+
+        result = await vehicle_service.process_event_vehicles(
+            db=mock_db,
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert len(result) == 1
+        stored = mock_db.add_all.call_args[0][0]
+        assert [embedding.vehicle_type for embedding in stored] == ["truck"]
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_embeds_crops_in_one_batch(
+        self, vehicle_service, mock_vehicle_detector, mock_embedding_service
+    ):
+        """All vehicle crops go to the embedding service in a single call."""
+        from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
+
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[
+            VehicleDetection(bbox=BoundingBox(x=i, y=i, width=40, height=40), confidence=0.9, vehicle_type="car")
+            for i in range(5)
+        ])
+        mock_vehicle_detector.crop_vehicle_array = MagicMock(
+            side_effect=lambda image, bbox: np.full((224, 224, 3), bbox.x, dtype=np.uint8)
+        )
+
+        result = await vehicle_service.process_event_vehicles(
+            db=MagicMock(),
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert len(result) == 5
+        mock_embedding_service.generate_embeddings_from_arrays.assert_awaited_once()
+        assert len(mock_embedding_service.generate_embeddings_from_arrays.call_args[0][0]) == 5
+        mock_embedding_service.generate_embedding.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_commits_off_event_loop(self, vehicle_service):
+        """The insert and commit run in a worker thread, not on the loop."""
+        import threading
+
+        commit_threads = []
+        mock_db = MagicMock()
+        mock_db.commit.side_effect = lambda: commit_threads.append(threading.current_thread())
+
+        result = await vehicle_service.process_event_vehicles(
+            db=mock_db,
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert len(result) == 1
+        assert commit_threads and commit_threads[0] is not threading.current_thread()
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_caps_vehicles_per_event(
+        self, vehicle_service, mock_vehicle_detector
+    ):
+        """Only the highest-confidence vehicles are cropped and embedded."""
+        from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
+
+        vehicle_service._max_vehicles_per_event = 2
+        mock_vehicle_detector.detect_vehicles_in_image = AsyncMock(return_value=[
+            VehicleDetection(bbox=BoundingBox(x=i, y=i, width=40, height=40), confidence=confidence, vehicle_type="car")
+            for i, confidence in enumerate([0.6, 0.9, 0.7, 0.95])
+        ])
+        mock_vehicle_detector.crop_vehicle_array = MagicMock(
+            side_effect=lambda image, bbox: np.full((224, 224, 3), bbox.x, dtype=np.uint8)
+        )
+        mock_db = MagicMock()
+
+        result = await vehicle_service.process_event_vehicles(
+            db=mock_db,
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert len(result) == 2
+        assert mock_vehicle_detector.crop_vehicle_array.call_count == 2
+        stored = mock_db.add_all.call_args[0][0]
+        assert [embedding.confidence for embedding in stored] == [0.95, 0.9]
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_passes_rgb_arrays(
+        self, vehicle_service, mock_vehicle_detector, mock_embedding_service
+    ):
+        """BGR crops are handed to the embedding service as RGB pixels."""
+        bgr_crop = np.zeros((224, 224, 3), dtype=np.uint8)
+        bgr_crop[:, :] = [255, 0, 0]  # Blue in BGR
+        mock_vehicle_detector.crop_vehicle_array = MagicMock(return_value=bgr_crop)
+
+        await vehicle_service.process_event_vehicles(
+            db=MagicMock(),
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        (rgb_crop,) = mock_embedding_service.generate_embeddings_from_arrays.call_args[0][0]
+        assert rgb_crop[0, 0].tolist() == [0, 0, 255]
+
+    @pytest.mark.asyncio
+    async def test_identical_crops_reuse_cached_embedding(
+        self, vehicle_service, mock_embedding_service
+    ):
+        """A crop seen before, in this event or an earlier one, skips CLIP."""
+        first = await vehicle_service.process_event_vehicles(
+            db=MagicMock(), event_id="event-1", thumbnail_bytes=create_test_image()
+        )
+        second = await vehicle_service.process_event_vehicles(
+            db=MagicMock(), event_id="event-2", thumbnail_bytes=create_test_image()
+        )
+
+        assert len(first) == len(second) == 1
+        mock_embedding_service.generate_embeddings_from_arrays.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_embedding_cache_is_bounded(self, vehicle_service, mock_embedding_service):
+        """The least recently used crops are evicted past EMBEDDING_CACHE_SIZE."""
+        vehicle_service.EMBEDDING_CACHE_SIZE = 2
+        crops = [np.full((4, 4, 3), value, dtype=np.uint8) for value in range(3)]
+
+        await vehicle_service._embed_crops(crops)
+        assert len(vehicle_service._embedding_cache) == 2
+
+        await vehicle_service._embed_crops(crops[:1])
+        assert len(mock_embedding_service.generate_embeddings_from_arrays.call_args[0][0]) == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_evicted_during_embedding_is_still_returned(
+        self, vehicle_service, mock_embedding_service
+    ):
+        """A hit evicted by an overlapping call while CLIP runs is not lost."""
+        vehicle_service.EMBEDDING_CACHE_SIZE = 2
+        crops = [np.full((4, 4, 3), value, dtype=np.uint8) for value in range(5)]
+        await vehicle_service._embed_crops(crops[:2])
+
+        release_first = asyncio.Event()
+        calls = 0
+
+        async def embed(images):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await release_first.wait()
+            return [[0.1] * 512 for _ in images]
+
+        mock_embedding_service.generate_embeddings_from_arrays = AsyncMock(side_effect=embed)
+
+        # First call hits crop 0 and waits on CLIP for crop 2; the second call
+        # fills the cache with crops 3 and 4, evicting crop 0
+        first = asyncio.create_task(vehicle_service._embed_crops([crops[0], crops[2]]))
+        await asyncio.sleep(0)
+        await vehicle_service._embed_crops(crops[3:])
+        release_first.set()
+
+        assert len(await first) == 2
+        assert len(vehicle_service._embedding_cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_embedding_failure_stores_nothing(
+        self, vehicle_service, mock_embedding_service
+    ):
+        """A failed batch embedding call is logged and nothing is stored."""
+        mock_embedding_service.generate_embeddings_from_arrays = AsyncMock(side_effect=RuntimeError("CLIP failed"))
+        mock_db = MagicMock()
+
+        result = await vehicle_service.process_event_vehicles(
+            db=mock_db,
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert result == []
+        mock_db.add_all.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_event_vehicles_store_failure_rolls_back(self, vehicle_service):
+        """A failed batch insert rolls back and reports no stored embeddings."""
+        mock_db = MagicMock()
+        mock_db.commit = MagicMock(side_effect=RuntimeError("database is locked"))
+
+        result = await vehicle_service.process_event_vehicles(
+            db=mock_db,
+            event_id="test-event-id",
+            thumbnail_bytes=create_test_image()
+        )
+
+        assert result == []
+        mock_db.rollback.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_get_vehicle_embeddings(self, vehicle_service):
@@ -167,7 +413,7 @@ class TestVehicleEmbeddingService:
         mock_embedding.id = "emb-1"
         mock_embedding.event_id = "event-1"
         mock_embedding.entity_id = None
-        mock_embedding.bounding_box = '{"x": 10, "y": 20, "width": 100, "height": 80}'
+        mock_embedding.bounding_box = pack_bounding_box({"x": 10, "y": 20, "width": 100, "height": 80})
         mock_embedding.confidence = 0.95
         mock_embedding.vehicle_type = "car"
         mock_embedding.model_version = "clip-ViT-B-32-vehicle-v1"
@@ -184,12 +430,18 @@ class TestVehicleEmbeddingService:
         assert result[0]["id"] == "emb-1"
         assert result[0]["confidence"] == 0.95
         assert result[0]["vehicle_type"] == "car"
+        assert result[0]["bounding_box"] == {"x": 10, "y": 20, "width": 100, "height": 80}
+        selected = mock_db.query.call_args.args
+        assert all(
+            column is not VehicleEmbedding and column is not VehicleEmbedding.embedding
+            for column in selected
+        )
 
     @pytest.mark.asyncio
     async def test_get_vehicle_embedding_vector(self, vehicle_service):
         """Test retrieving embedding vector."""
         mock_embedding = MagicMock()
-        mock_embedding.embedding = json.dumps([0.1] * 512)
+        mock_embedding.embedding, mock_embedding.embedding_scale = quantize_embedding([0.1] * 512)
 
         mock_db = MagicMock()
         mock_db.query.return_value.filter.return_value.first.return_value = mock_embedding
@@ -200,6 +452,7 @@ class TestVehicleEmbeddingService:
 
         assert result is not None
         assert len(result) == 512
+        assert result[0] == pytest.approx(0.1)
 
     @pytest.mark.asyncio
     async def test_get_vehicle_embedding_vector_not_found(self, vehicle_service):
@@ -255,6 +508,87 @@ class TestVehicleEmbeddingService:
 
         assert result == 150
 
+    @pytest.mark.asyncio
+    async def test_get_total_vehicle_count_uses_postgres_estimate(self, vehicle_service):
+        """On PostgreSQL the total comes from pg_class.reltuples."""
+        mock_db = MagicMock()
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        mock_db.execute.return_value.scalar.return_value = 12000
+
+        result = await vehicle_service.get_total_vehicle_count(mock_db)
+
+        assert result == 12000
+        assert "reltuples" in str(mock_db.execute.call_args.args[0])
+        mock_db.query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_total_vehicle_count_unanalyzed_postgres_counts_exactly(self, vehicle_service):
+        """A table with no statistics yet falls back to COUNT(*)."""
+        mock_db = MagicMock()
+        mock_db.get_bind.return_value.dialect.name = "postgresql"
+        mock_db.execute.return_value.scalar.return_value = -1
+        mock_db.query.return_value.count.return_value = 3
+
+        result = await vehicle_service.get_total_vehicle_count(mock_db)
+
+        assert result == 3
+
+
+class TestVehicleEmbeddingEncoding:
+    """Tests for the packed binary embedding and bounding box columns."""
+
+    def test_embedding_quantization_preserves_cosine_similarity(self):
+        """int8 embeddings are 512 bytes and keep cosine similarity intact."""
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(512).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+
+        data, scale = quantize_embedding(vector.tolist())
+        restored = np.asarray(dequantize_embedding(data, scale))
+
+        assert len(data) == 512
+        cosine = float(vector @ restored / (np.linalg.norm(vector) * np.linalg.norm(restored)))
+        assert cosine > 0.999
+
+    def test_zero_embedding_quantizes_without_error(self):
+        """An all-zero vector gets a usable scale instead of dividing by zero."""
+        data, scale = quantize_embedding([0.0] * 512)
+
+        assert scale > 0
+        assert dequantize_embedding(data, scale) == [0.0] * 512
+
+    def test_bounding_box_round_trip(self):
+        """Bounding boxes pack to 16 bytes and unpack to the same dict."""
+        bbox = {"x": 10, "y": 20, "width": 100, "height": 80}
+
+        packed = pack_bounding_box(bbox)
+
+        assert len(packed) == 16
+        assert unpack_bounding_box(packed) == bbox
+
+    @pytest.mark.asyncio
+    async def test_stored_rows_use_packed_columns(self):
+        """process_event_vehicles stores packed bytes that read back intact."""
+        from app.services.vehicle_detection_service import BoundingBox, VehicleDetection
+        from app.services.vehicle_embedding_service import VehicleEmbeddingService
+
+        detector = MagicMock()
+        detector.detect_vehicles_in_image = AsyncMock(return_value=[
+            VehicleDetection(bbox=BoundingBox(x=5, y=6, width=70, height=80), confidence=0.9, vehicle_type="car")
+        ])
+        detector.crop_vehicle_array = MagicMock(return_value=np.zeros((224, 224, 3), dtype=np.uint8))
+        embedder = MagicMock()
+        embedder.generate_embeddings_from_arrays = AsyncMock(return_value=[[0.25] * 512])
+        service = VehicleEmbeddingService(vehicle_detector=detector, embedding_service=embedder)
+        mock_db = MagicMock()
+
+        await service.process_event_vehicles(mock_db, "event-1", create_test_image())
+
+        stored = mock_db.add_all.call_args[0][0][0]
+        assert isinstance(stored.embedding, bytes)
+        assert dequantize_embedding(stored.embedding, stored.embedding_scale) == pytest.approx([0.25] * 512)
+        assert unpack_bounding_box(stored.bounding_box) == {"x": 5, "y": 6, "width": 70, "height": 80}
+
 
 class TestVehicleEmbeddingServiceSingleton:
     """Tests for singleton pattern."""
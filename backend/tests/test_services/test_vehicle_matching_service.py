@@ -14,6 +14,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 
+from app.models.vehicle_embedding import pack_bounding_box, quantize_embedding
+
 
 class TestVehicleMatchingService:
     """Tests for VehicleMatchingService class."""
@@ -139,8 +141,8 @@ class TestVehicleMatchingService:
         mock_embedding = MagicMock()
         mock_embedding.id = "emb-1"
         mock_embedding.event_id = "event-1"
-        mock_embedding.embedding = json.dumps([0.1] * 512)
-        mock_embedding.bounding_box = json.dumps({"x": 10, "y": 20, "width": 100, "height": 80})
+        mock_embedding.embedding, mock_embedding.embedding_scale = quantize_embedding([0.1] * 512)
+        mock_embedding.bounding_box = pack_bounding_box({"x": 10, "y": 20, "width": 100, "height": 80})
         mock_embedding.vehicle_type = "car"
         mock_embedding.event = MagicMock()
         mock_embedding.event.timestamp = datetime.now(timezone.utc)
@@ -169,8 +171,8 @@ class TestVehicleMatchingService:
         mock_embedding = MagicMock()
         mock_embedding.id = "emb-1"
         mock_embedding.event_id = "event-1"
-        mock_embedding.embedding = json.dumps([0.1] * 512)
-        mock_embedding.bounding_box = json.dumps({"x": 10, "y": 20, "width": 100, "height": 80})
+        mock_embedding.embedding, mock_embedding.embedding_scale = quantize_embedding([0.1] * 512)
+        mock_embedding.bounding_box = pack_bounding_box({"x": 10, "y": 20, "width": 100, "height": 80})
         mock_embedding.vehicle_type = "car"
         mock_embedding.event = None
 
@@ -18,6 +18,7 @@ from app.services.voice_query_service import (
     ParsedQuery,
     QueryResult,
     get_voice_query_service,
+    TIME_HANDLERS,
 )
 
 
@@ -119,6 +120,31 @@ class TestTimeExpressionParsing:
         result = service._parse_time_expression("what's at the front door")
         assert result.description == "the last hour"
 
+    def test_parse_past_n_minutes(self, service):
+        """'past N minutes' shares the last-N-minutes handling."""
+        result = service._parse_time_expression("anything in the past 45 minutes")
+        assert "45 minutes" in result.description
+
+    def test_parse_just_now(self, service):
+        """Parse 'just now' to the last 15 minutes."""
+        result = service._parse_time_expression("who was there just now")
+        assert result.description == "the last 15 minutes"
+
+    def test_parse_earliest_expression_wins(self, service):
+        """With two time expressions, the one earlier in the query is used."""
+        result = service._parse_time_expression("yesterday or in the last 2 hours")
+        assert result.description == "yesterday"
+
+    def test_parse_is_case_insensitive(self, service):
+        """Precompiled patterns still match regardless of case."""
+        result = service._parse_time_expression("Activity In The Past 2 Hours")
+        assert "2 hours" in result.description
+
+
+    def test_every_time_pattern_has_handler(self):
+        """Each time expression type dispatches to a handler."""
+        pattern_types = {time_type for time_type, _ in VoiceQueryService.TIME_PATTERNS}
+        assert pattern_types == set(TIME_HANDLERS)
 
 class TestCameraNameMatching:
     """Tests for camera name matching (AC3)"""
@@ -189,6 +215,26 @@ class TestCameraNameMatching:
         )
         assert camera_id == "cam-1"
 
+    def test_partial_match_prefers_earliest_camera(self, service):
+        """When several cameras share a query word, list order decides."""
+        cameras = [
+            MockCamera(id="cam-1", name="Porch Light"),
+            MockCamera(id="cam-2", name="Shed Light"),
+        ]
+        camera_id, _ = service._match_camera_name("is the light on", cameras)
+        assert camera_id == "cam-1"
+
+    def test_camera_index_built_once_per_camera_list(self, service, cameras):
+        """Repeated matches against the same cameras reuse the index."""
+        VoiceQueryService._build_camera_index.cache_clear()
+
+        service._match_camera_name("anything at the back yard", cameras)
+        service._match_camera_name("anyone in the driveway", cameras)
+
+        info = VoiceQueryService._build_camera_index.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
 
 class TestResponseGeneration:
     """Tests for response generation (AC4)"""
@@ -286,6 +332,27 @@ class TestFullQueryFlow:
         assert parsed.time_range.description == "the last hour"
         assert parsed.camera_filter == "cam-2"
 
+    def test_repeated_query_is_memoized(self, service, cameras):
+        """A repeated phrase reuses the cached parse but a fresh time window."""
+        VoiceQueryService._parse_cached.cache_clear()
+
+        first = service.parse_query("What happened at the front door in the last 2 hours?", cameras)
+        second = service.parse_query("What happened at the front door in the last 2 hours?", cameras)
+
+        assert VoiceQueryService._parse_cached.cache_info().hits == 1
+        assert second.camera_filter == first.camera_filter == "cam-1"
+        assert second.time_range.description == "the last 2 hours"
+        assert second.time_range.end >= first.time_range.end
+
+    def test_camera_changes_bypass_cached_parse(self, service, cameras):
+        """Renamed cameras produce a new signature, not a stale match."""
+        service.parse_query("what's at the front door?", cameras)
+        renamed = [MockCamera(id="cam-3", name="Front Door Camera")]
+
+        parsed = service.parse_query("what's at the front door?", renamed)
+
+        assert parsed.camera_filter == "cam-3"
+
     def test_generate_full_response(self, service):
         """Generate complete response from parsed query and result."""
         parsed = ParsedQuery(
@@ -309,6 +376,113 @@ class TestFullQueryFlow:
         assert "today" in response
 
 
+class TestExecuteQuery:
+    """Tests for executing parsed queries against the database"""
+
+    @pytest.fixture
+    def service(self):
+        return VoiceQueryService()
+
+    @pytest.fixture
+    def seeded_session(self, db_session):
+        """Two cameras with events inside and outside the last hour."""
+        from app.models.camera import Camera
+        from app.models.event import Event
+
+        now = datetime.now(timezone.utc)
+        db_session.add_all([
+            Camera(id="cam-1", name="Front Door", type="rtsp"),
+            Camera(id="cam-2", name="Back Yard", type="rtsp"),
+        ])
+        db_session.add_all([
+            Event(id="ev-1", camera_id="cam-1", timestamp=now - timedelta(minutes=5),
+                  description="Person at door", confidence=90, objects_detected='["person", "unknown"]'),
+            Event(id="ev-2", camera_id="cam-1", timestamp=now - timedelta(minutes=10),
+                  description="Person and car", confidence=90, objects_detected='["Person", "vehicle"]'),
+            Event(id="ev-3", camera_id="cam-2", timestamp=now - timedelta(minutes=20),
+                  description="Package left", confidence=90, objects_detected='["package", "motion"]'),
+            Event(id="ev-old", camera_id="cam-2", timestamp=now - timedelta(days=2),
+                  description="Old event", confidence=90, objects_detected='["person"]'),
+        ])
+        db_session.commit()
+        return db_session
+
+    def _last_hour_query(self, camera_filter=None):
+        now = datetime.now(timezone.utc)
+        return ParsedQuery(
+            original_query="what happened",
+            time_range=TimeRange(start=now - timedelta(hours=1), end=now, description="the last hour"),
+            camera_filter=camera_filter,
+        )
+
+    def test_aggregates_events_in_range(self, service, seeded_session):
+        """Counts, camera names and objects cover only events in range."""
+        result = service.execute_query(seeded_session, self._last_hour_query())
+
+        assert result.count == 3
+        assert result.events == []
+        assert sorted(result.cameras_involved) == ["Back Yard", "Front Door"]
+        assert result.objects_detected == {"person": 2, "vehicle": 1, "package": 1}
+
+    def test_camera_filter(self, service, seeded_session):
+        """A camera filter restricts events and cameras to that camera."""
+        result = service.execute_query(seeded_session, self._last_hour_query("cam-2"))
+
+        assert result.count == 1
+        assert [event.id for event in result.events] == ["ev-3"]
+        assert result.cameras_involved == ["Back Yard"]
+        assert result.objects_detected == {"package": 1}
+
+    def test_specific_event_query_loads_events(self, service, seeded_session):
+        """Queries that describe each event load them most recent first."""
+        parsed = self._last_hour_query()
+        parsed.query_type = "specific_event"
+
+        result = service.execute_query(seeded_session, parsed)
+
+        assert result.count == 3
+        assert [event.id for event in result.events] == ["ev-1", "ev-2", "ev-3"]
+
+    def test_activity_query_runs_only_aggregate_queries(self, service, seeded_session):
+        """Counts, camera names and objects take one query each."""
+        from sqlalchemy import event as sa_event
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            # Ignore the SAVEPOINT the test session opens around its work
+            if statement.startswith("SELECT"):
+                statements.append(statement)
+
+        engine = seeded_session.get_bind()
+        sa_event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            service.execute_query(seeded_session, self._last_hour_query())
+        finally:
+            sa_event.remove(engine, "before_cursor_execute", count_statement)
+
+        assert len(statements) == 3
+        assert not any("events.description" in statement for statement in statements)
+
+
+    def test_postgres_counts_objects_in_sql(self, service):
+        """On PostgreSQL, objects are aggregated by the database."""
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = "postgresql"
+        db.query.return_value.filter.return_value.group_by.return_value.all.return_value = [("cam-1", 4)]
+        db.query.return_value.filter.return_value.all.return_value = [("cam-1", "Front Door")]
+        db.execute.return_value.all.return_value = [("person", 3), ("vehicle", 1)]
+
+        result = service.execute_query(db, self._last_hour_query("cam-1"))
+
+        assert result.count == 4
+        assert result.cameras_involved == ["Front Door"]
+        assert result.objects_detected == {"person": 3, "vehicle": 1}
+        statement, params = db.execute.call_args.args
+        assert "jsonb_array_elements_text" in str(statement)
+        assert "events.camera_id = :camera_id" in str(statement)
+        assert params["camera_id"] == "cam-1"
+
 class TestServiceSingleton:
     """Test service singleton pattern"""
 